@@ -0,0 +1,16 @@
+# analytics/__init__.py
+"""
+Page summaries computed without Qt: each function takes a Dataset and a
+FilterSpec and returns the chart series and statistics its page renders.
+"""
+from analytics.preop import PreopSummary, summarize_preop
+from analytics.operative import OperativeSummary, summarize_operative
+from analytics.discharge import DischargeSummary, summarize_discharge
+from analytics.followup import FollowupSummary, summarize_followup
+
+__all__ = [
+    "PreopSummary", "summarize_preop",
+    "OperativeSummary", "summarize_operative",
+    "DischargeSummary", "summarize_discharge",
+    "FollowupSummary", "summarize_followup",
+]
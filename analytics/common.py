@@ -0,0 +1,33 @@
+# analytics/common.py
+import pandas as pd
+
+
+def nonzero(counts):
+    """`counts`, or None when there is nothing to draw."""
+    if counts is None or counts.empty:
+        return None
+    return counts
+
+
+def value_counts(agg, col):
+    """Non-zero counts of a category, most frequent first; empty if unknown."""
+    return agg.value_counts(col) if col in agg else pd.Series(dtype=int)
+
+
+def score_counts(agg, cols):
+    """Score distributions of `cols` side by side, only scores someone gave."""
+    counts = pd.DataFrame({col: agg.counts(col) for col in cols})
+    counts = counts.fillna(0).astype(int)
+    return counts[counts.sum(axis=1) > 0]
+
+
+def repair_counts(agg, col):
+    """How many patients had 1, 2, ... previous repairs."""
+    if col not in agg:
+        return pd.Series(dtype=int)
+    counts = agg.counts(col)
+    return counts[(counts.index > 0) & (counts > 0)]
+
+
+def percent(part, total):
+    return f"{part / total * 100:.1f}%"
@@ -0,0 +1,66 @@
+# analytics/discharge.py
+from typing import List, NamedTuple, Optional
+
+import pandas as pd
+
+from analytics.common import percent
+from filters import FilterSpec
+from tracing import traced
+
+COMPLICATION_LABELS = {
+    'Comp_Bleeding': 'Bleeding',
+    'Comp_SSI': 'SSI',
+    'Comp_Mesh_Infection': 'Mesh Infection',
+    'Comp_Hematoma': 'Hematoma',
+    'Comp_Prolonged_Ileus': 'Prolonged Ileus',
+    'Comp_Urinary_Retention': 'Urinary Retention',
+    'Comp_General': 'General'
+}
+
+
+class DischargeSummary(NamedTuple):
+    """What the Discharge page shows."""
+    n: int
+    occurrences: Optional[pd.Series]  # False/True counts; None without the column
+    complication_types: pd.Series     # non-zero counts by complication label
+    missing_columns: List[str]        # complication type columns not in the data
+    stats: dict
+
+
+@traced
+def summarize_discharge(dataset, spec=FilterSpec()):
+    agg = dataset.aggregate(spec)
+
+    occurrences = None
+    if 'Intra_Complications' in agg:
+        occurrences = agg.value_counts('Intra_Complications')
+
+    cols = list(COMPLICATION_LABELS)
+    missing = [c for c in cols if c not in agg]
+    types = pd.Series(dtype=int)
+    if not missing:
+        types = agg.flag_sums(cols)
+        types = types[types > 0].rename(index=COMPLICATION_LABELS)
+
+    return DischargeSummary(agg.n, occurrences, types, missing,
+                            discharge_stats(agg))
+
+
+def discharge_stats(agg):
+    n_total = agg.n
+    n_true = 0
+    if 'Intra_Complications' in agg:
+        n_true = int(agg.counts('Intra_Complications')[True])
+
+    stats = {
+        'Total patients': n_total,
+        'With complications': n_true,
+        'Without complications': n_total - n_true,
+        '% with complications': percent(n_true, n_total) if n_total > 0 else "N/A"
+    }
+
+    if 'Gender' in agg:
+        gender_counts = agg.counts('Gender')
+        stats['Male %'] = percent(gender_counts.get('male', 0), n_total) if n_total > 0 else "N/A"
+        stats['Female %'] = percent(gender_counts.get('female', 0), n_total) if n_total > 0 else "N/A"
+    return stats
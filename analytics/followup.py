@@ -0,0 +1,59 @@
+# analytics/followup.py
+from typing import List, NamedTuple, Optional
+
+import pandas as pd
+
+from analytics.common import percent
+from filters import FilterSpec
+from tracing import traced
+
+COMPLICATION_LABELS = {
+    'FU_Seroma': 'Seroma',
+    'FU_Hematoma': 'Hematoma',
+    'FU_Pain': 'Pain',
+    'FU_SSI': 'SSI',
+    'FU_Mesh_Infection': 'Mesh Infection',
+    'FU_Other': 'Other'
+}
+
+
+class FollowupSummary(NamedTuple):
+    """What the Follow-up page shows."""
+    n: int
+    occurrences: Optional[pd.Series]  # False/True counts; None without the column
+    complication_types: pd.Series     # non-zero counts by complication label
+    missing_columns: List[str]        # complication type columns not in the data
+    stats: dict
+
+
+@traced
+def summarize_followup(dataset, spec=FilterSpec()):
+    agg = dataset.aggregate(spec)
+
+    occurrences = None
+    if 'Followup_Complications' in agg:
+        occurrences = agg.value_counts('Followup_Complications')
+
+    cols = list(COMPLICATION_LABELS)
+    missing = [col for col in cols if col not in agg]
+    types = pd.Series(dtype=int)
+    if not missing:
+        types = agg.flag_sums(cols).rename(index=COMPLICATION_LABELS)
+        types = types[types > 0]
+
+    return FollowupSummary(agg.n, occurrences, types, missing,
+                           followup_stats(agg))
+
+
+def followup_stats(agg):
+    n_total = agg.n
+    n_comp = 0
+    if 'Followup_Complications' in agg:
+        n_comp = int(agg.counts('Followup_Complications')[True])
+
+    return {
+        'Total patients': n_total,
+        'With complications': n_comp,
+        'Without complications': n_total - n_comp if n_total >= n_comp else "N/A",
+        '% with complications': percent(n_comp, n_total) if n_total > 0 else "N/A"
+    }
@@ -0,0 +1,115 @@
+# analytics/operative.py
+from typing import NamedTuple, Optional
+
+import pandas as pd
+
+from analytics.common import nonzero, percent, repair_counts, value_counts
+from filters import FilterSpec
+from tracing import traced
+
+GHR_TYPES = ["Lateral", "Medial", "Femoral", "Obturator"]
+
+
+class OperativeSummary(NamedTuple):
+    """
+    What the Operative page shows. Charts of other operation types than
+    the selected one stay None, as does any chart without data.
+    """
+    n: int
+    indications: Optional[pd.Series]
+    ghr_sides: Optional[pd.Series]          # Right / Left / Bilateral
+    ghr_repairs_right: Optional[pd.Series]  # patients by number of repairs > 0
+    ghr_repairs_left: Optional[pd.Series]
+    ghr_types_right: Optional[pd.Series]    # ticked count by GHR_TYPES
+    ghr_types_left: Optional[pd.Series]
+    phr_stoma: Optional[pd.Series]
+    phr_repairs: Optional[pd.Series]
+    pvhr_subtypes: Optional[pd.Series]
+    ivhr_repairs: Optional[pd.Series]
+    stats: dict
+
+
+def _ghr_types(agg, side):
+    cols = [f"GHR_Type_{side}_{kind}" for kind in GHR_TYPES]
+    if not all(col in agg for col in cols):
+        return None
+    counts = agg.flag_sums(cols)
+    counts.index = GHR_TYPES
+    return nonzero(counts[counts > 0])
+
+
+@traced
+def summarize_operative(dataset, spec=FilterSpec(), op_type=None):
+    """
+    Rows are selected by `spec` alone; `op_type` only chooses which
+    type-specific charts and statistics are computed.
+    """
+    agg = dataset.aggregate(spec)
+    charts = dict.fromkeys(OperativeSummary._fields[1:-1])
+    charts["indications"] = nonzero(value_counts(agg, "Indication"))
+
+    if op_type == "GHR":
+        if "GHR_Side" in agg:
+            sides = agg.counts("GHR_Side")
+            charts["ghr_sides"] = sides if sides.sum() else None
+        charts["ghr_repairs_right"] = nonzero(repair_counts(agg, "GHR_Prev_Repairs_Right"))
+        charts["ghr_repairs_left"] = nonzero(repair_counts(agg, "GHR_Prev_Repairs_Left"))
+        charts["ghr_types_right"] = _ghr_types(agg, "Right")
+        charts["ghr_types_left"] = _ghr_types(agg, "Left")
+    elif op_type == "PHR":
+        charts["phr_stoma"] = nonzero(value_counts(agg, "PHR_Stoma_Type"))
+        charts["phr_repairs"] = nonzero(repair_counts(agg, "PHR_Prev_Repairs"))
+    elif op_type == "PVHR":
+        charts["pvhr_subtypes"] = nonzero(value_counts(agg, "PVHR_Subtype"))
+    elif op_type == "IVHR":
+        charts["ivhr_repairs"] = nonzero(repair_counts(agg, "IVHR_Prev_Repairs"))
+
+    return OperativeSummary(n=agg.n, stats=operative_stats(agg, op_type), **charts)
+
+
+def operative_stats(agg, op_type):
+    genders = value_counts(agg, "Gender")
+    stats = {
+        "Total ops": agg.n,
+        "Males": genders.get("male", 0),
+        "Females": genders.get("female", 0)
+    }
+
+    total = stats["Total ops"]
+    if total:
+        stats["Male %"] = percent(stats['Males'], total)
+        stats["Female %"] = percent(stats['Females'], total)
+
+    def avg_repairs(col):
+        return f"{agg.mean(col):.1f}" if col in agg and agg.observed(col) else "N/A"
+
+    if op_type == "GHR":
+        sides = ["GHR_Side_Right", "GHR_Side_Left"]
+        if "GHR_Side" in agg:
+            ticked = agg.flag_sums(sides)
+            bilat = agg.counts("GHR_Side")["Bilateral"]
+        else:
+            ticked, bilat = dict.fromkeys(sides, 0), 0
+        stats.update({
+            "Right %":     percent(ticked['GHR_Side_Right'], total) if total else "0.0%",
+            "Left %":      percent(ticked['GHR_Side_Left'], total) if total else "0.0%",
+            "Bilateral %": percent(bilat, total) if total else "0.0%",
+            "Avg Repairs R": f"{agg.mean('GHR_Prev_Repairs_Right'):.1f}" if 'GHR_Prev_Repairs_Right' in agg else "N/A",
+            "Avg Repairs L": f"{agg.mean('GHR_Prev_Repairs_Left'):.1f}" if 'GHR_Prev_Repairs_Left' in agg else "N/A"
+        })
+
+    elif op_type == "PHR":
+        stats["Avg Repairs"] = avg_repairs("PHR_Prev_Repairs")
+        stoma = value_counts(agg, "PHR_Stoma_Type")
+        if not stoma.empty:
+            stats["Common Stoma"] = stoma.idxmax()
+
+    elif op_type == "PVHR":
+        subtypes = value_counts(agg, "PVHR_Subtype")
+        if not subtypes.empty:
+            stats["Common Subtype"] = subtypes.idxmax()
+
+    elif op_type == "IVHR":
+        stats["Avg Repairs"] = avg_repairs("IVHR_Prev_Repairs")
+
+    return stats
@@ -0,0 +1,109 @@
+# analytics/preop.py
+from typing import NamedTuple, Optional
+
+import pandas as pd
+
+from analytics.common import nonzero, score_counts
+from filters import FilterSpec
+from tracing import traced
+
+COMORBIDITY_COLUMNS = [
+    "No_Comorbidities", "Diabetes", "COPD",
+    "Hepatic_Disease", "Renal_Disease",
+    "Aortic_Aneurysm", "Smoker"
+]
+PAIN_COLUMNS = ["Pain_rest", "Pain_activity", "Pain_last_week"]
+RESTRICTION_COLUMNS = ["Restrict_inside", "Restrict_outside",
+                       "Restrict_sports", "Restrict_heavy"]
+ESTHETIC_COLUMNS = ["Esthetic_abdomen", "Esthetic_hernia"]
+# counted in "Mean Comorbidities"
+MEAN_COMORBIDITY_COLUMNS = ['Diabetes', 'COPD', 'Renal_Disease', 'Smoker']
+
+
+class PreopSummary(NamedTuple):
+    """What the Preoperative page shows; None means "No Data" for that chart."""
+    n: int
+    gender: Optional[pd.Series]         # counts by capitalized sex
+    age: Optional[pd.Series]            # counts by age bucket, clinical order
+    bmi: pd.Series                      # BMI of every patient, missing dropped
+    comorbidities: Optional[pd.Series]  # ticked count by comorbidity title
+    pain: Optional[pd.DataFrame]        # score x PAIN_COLUMNS counts
+    restrictions: Optional[pd.DataFrame]
+    esthetic: Optional[pd.DataFrame]
+    stats: dict
+
+
+@traced
+def summarize_preop(dataset, spec=FilterSpec()):
+    agg = dataset.aggregate(spec)
+
+    # BMI is continuous (histogram bins, median, scatter), so it is the one
+    # column still read from the filtered rows
+    if "BMI" in dataset.frame.columns:
+        bmi = dataset.frame["BMI"].take(dataset.rows(spec)).dropna()
+    else:
+        bmi = pd.Series(dtype=float)
+
+    gender = age = comorbidities = None
+    if "Gender" in agg and agg.observed("Gender"):
+        gender = agg.value_counts("Gender")
+        gender.index = gender.index.str.capitalize()
+    if "Age" in agg and agg.observed("Age"):
+        age = agg.counts("Age")
+
+    valid_cols = [col for col in COMORBIDITY_COLUMNS if col in agg]
+    if valid_cols:
+        com_sums = agg.flag_sums(valid_cols)
+        if com_sums.sum():
+            com_sums.index = [lbl.replace("_", " ").title() for lbl in com_sums.index]
+            comorbidities = com_sums
+
+    def scores(cols):
+        if not all(col in agg for col in cols):
+            return None
+        return nonzero(score_counts(agg, cols))
+
+    return PreopSummary(
+        n=agg.n,
+        gender=gender,
+        age=age,
+        bmi=bmi,
+        comorbidities=comorbidities,
+        pain=scores(PAIN_COLUMNS),
+        restrictions=scores(RESTRICTION_COLUMNS),
+        esthetic=scores(ESTHETIC_COLUMNS),
+        stats=preop_stats(agg, bmi),
+    )
+
+
+def preop_stats(agg, bmi):
+    has_gender = "Gender" in agg
+    genders = agg.counts("Gender") if has_gender else pd.Series(dtype=int)
+    answered = genders.sum()
+
+    def share(sex):
+        return f"{genders.get(sex, 0) / answered * 100 if answered else 0:.1f}%"
+
+    def mean_score(col):
+        return f"{agg.mean(col):.1f}" if col in agg and agg.observed(col) else "N/A"
+
+    return {
+        "Total patients": agg.n,
+        "Males": genders.get("male", 0) if has_gender else "N/A",
+        "Females": genders.get("female", 0) if has_gender else "N/A",
+        "Male %": share("male") if has_gender else "N/A",
+        "Female %": share("female") if has_gender else "N/A",
+        "Mean BMI": f"{bmi.mean():.1f}" if not bmi.empty else "N/A",
+        "Median BMI": f"{bmi.median():.1f}" if not bmi.empty else "N/A",
+        "BMI Std Dev": f"{bmi.std():.1f}" if not bmi.empty else "N/A",
+        "Min BMI": f"{bmi.min():.1f}" if not bmi.empty else "N/A",
+        "Max BMI": f"{bmi.max():.1f}" if not bmi.empty else "N/A",
+        "Mean Pain (rest)": mean_score("Pain_rest"),
+        "Mean Pain (activity)": mean_score("Pain_activity"),
+        "Mean Pain (last week)": mean_score("Pain_last_week"),
+        "Mean Comorbidities": (
+            f"{agg.flag_sums(MEAN_COMORBIDITY_COLUMNS).sum() / agg.n:.2f}"
+            if agg.n and all(col in agg for col in MEAN_COMORBIDITY_COLUMNS)
+            else "N/A"
+        )
+    }
@@ -0,0 +1,192 @@
+# chart_cache.py
+import hashlib
+import os
+import warnings
+from collections import OrderedDict
+
+from PyQt5 import QtCore
+from PyQt5.QtCore import QSize
+from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtWidgets import QLabel, QSizePolicy
+
+# bump when chart styling changes, so stale images on disk are not reused
+CHART_CACHE_VERSION = 1
+DEFAULT_MAX_BYTES = 64 << 20
+
+
+def chart_cache_dir(path):
+    """Disk tier stored next to the workbook (ExportedData.xlsx.charts)."""
+    return os.path.abspath(path) + ".charts"
+
+
+class ChartCache:
+    """
+    Rendered charts keyed by (dataset fingerprint, chart id, filter).
+
+    Level one is an LRU of QImages bounded by `max_bytes`; level two, when
+    a `directory` is given and the dataset has a fingerprint, is one PNG
+    per key on disk. Images found on disk are promoted to memory.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, directory=None,
+                 fingerprint=None):
+        self.max_bytes = max_bytes
+        self.fingerprint = fingerprint
+        self.directory = directory if fingerprint else None
+        self._images = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def for_dataset(cls, dataset, disk=True, max_bytes=DEFAULT_MAX_BYTES):
+        fingerprint = dataset.fingerprint
+        directory = chart_cache_dir(dataset.path) if disk and fingerprint else None
+        return cls(max_bytes, directory, fingerprint)
+
+    def _key(self, chart_id, filters):
+        return (self.fingerprint, chart_id, tuple(filters))
+
+    def _file(self, key):
+        text = repr((CHART_CACHE_VERSION,) + key)
+        return os.path.join(self.directory,
+                            hashlib.sha1(text.encode("utf-8")).hexdigest() + ".png")
+
+    def get(self, chart_id, filters):
+        """The cached QImage, or None."""
+        key = self._key(chart_id, filters)
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+            self.hits += 1
+            return image
+        if self.directory is not None:
+            file = self._file(key)
+            if os.path.isfile(file):
+                image = QImage(file)
+                if not image.isNull():
+                    self.disk_hits += 1
+                    self._remember(key, image)
+                    return image
+        self.misses += 1
+        return None
+
+    def put(self, chart_id, filters, image):
+        key = self._key(chart_id, filters)
+        self._remember(key, image)
+        if self.directory is None:
+            return
+        file = self._file(key)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = file + ".tmp"
+            if image.save(tmp, "PNG"):
+                os.replace(tmp, file)
+        except OSError as exc:
+            warnings.warn(f"Could not write chart cache {file}: {exc}")
+
+    def _remember(self, key, image):
+        old = self._images.pop(key, None)
+        if old is not None:
+            self.bytes -= old.sizeInBytes()
+        size = image.sizeInBytes()
+        if size > self.max_bytes:
+            return
+        self._images[key] = image
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, old = self._images.popitem(last=False)
+            self.bytes -= old.sizeInBytes()
+
+    def __contains__(self, item):
+        """Whether (chart_id, filters) is in memory or on disk; loads nothing."""
+        chart_id, filters = item
+        key = self._key(chart_id, filters)
+        if key in self._images:
+            return True
+        return self.directory is not None and os.path.isfile(self._file(key))
+
+    def __len__(self):
+        return len(self._images)
+
+    def clear(self):
+        self._images.clear()
+        self.bytes = 0
+
+
+class ChartImage(QLabel):
+    """
+    A cached chart shown as a static image, scaled to the label like the
+    canvas it stands in for. `figure` builds the real matplotlib figure on
+    demand, so "Download" still exports it at full resolution.
+    """
+
+    def __init__(self, image, make_figure, min_h=100, parent=None):
+        super().__init__(parent)
+        self._original = QPixmap.fromImage(image)
+        self.setPixmap(self._original)
+        self.setAlignment(QtCore.Qt.AlignCenter)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.setMinimumHeight(min_h)
+        self._make_figure = make_figure
+
+    def sizeHint(self):
+        return self._original.size() / self._original.devicePixelRatio()
+
+    def minimumSizeHint(self):
+        # the shown pixmap must not keep the label from shrinking
+        return QSize(0, self.minimumHeight())
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        ratio = self._original.devicePixelRatio()
+        size = self.contentsRect().size() * ratio
+        if size.isEmpty():
+            return
+        pixmap = self._original.scaled(size, QtCore.Qt.KeepAspectRatio,
+                                       QtCore.Qt.SmoothTransformation)
+        pixmap.setDevicePixelRatio(ratio)
+        self.setPixmap(pixmap)
+
+    @property
+    def figure(self):
+        return self._make_figure()
+
+
+def canvas_image(canvas):
+    """Copy of what the Agg canvas last drew."""
+    buf = canvas.buffer_rgba()
+    height, width = buf.shape[:2]
+    image = QImage(bytes(buf), width, height, width * 4,
+                   QImage.Format_RGBA8888).copy()
+    image.setDevicePixelRatio(canvas.device_pixel_ratio)
+    return image
+
+
+def _store_drawn(event):
+    canvas = event.canvas
+    target = getattr(canvas, "_cache_target", None)
+    if target is None:
+        return
+    canvas._cache_target = None
+    cache, chart_id, filters = target
+    cache.put(chart_id, filters, canvas_image(canvas))
+
+
+def cached_chart(cache, chart_id, filters, make_canvas, make_figure):
+    """
+    Widget for one chart: a ChartImage when (chart_id, filters) is cached,
+    otherwise `make_canvas()`, whose next draw is stored in the cache.
+    """
+    if cache is None:
+        return make_canvas()
+    image = cache.get(chart_id, filters)
+    if image is not None:
+        return ChartImage(image, make_figure)
+
+    canvas = make_canvas()
+    canvas._cache_target = (cache, chart_id, filters)
+    if not hasattr(canvas, "_cache_cid"):
+        canvas._cache_cid = canvas.mpl_connect("draw_event", _store_drawn)
+    return canvas
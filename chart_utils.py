@@ -1,8 +1,18 @@
 # chart_utils.py
+import weakref
+import numpy as np
+import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
+from matplotlib.patches import Patch
+from matplotlib.ticker import MaxNLocator
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from PyQt5.QtWidgets import QSizePolicy
+from PyQt5 import QtCore
+from PyQt5.QtCore import QPointF, QRectF, QSize, QThread
+from PyQt5.QtGui import QColor, QFont, QFontMetricsF, QPainter, QPen
+from PyQt5.QtWidgets import QApplication, QSizePolicy, QWidget
+from chart_cache import cached_chart
+from tracing import span, traced
 
 plt.style.use('seaborn-v0_8-whitegrid')
 plt.rcParams.update({
@@ -17,92 +27,573 @@ plt.rcParams.update({
     'figure.autolayout': True
 })
 
-def make_bar_chart(data, title, xlabel, ylabel,
-                   figsize=(6, 4), dpi=100, min_h=100):
-    fig = Figure(figsize=figsize, dpi=dpi, facecolor='white')
-    ax = fig.add_subplot(111, facecolor='white')
+_live_figures = weakref.WeakSet()
 
-    data.plot(kind="bar", ax=ax, color="#415A77", edgecolor="#0D1B2A")
-    ax.set_title(title, color="#0D1B2A")
-    ax.set_xlabel(xlabel, color="#0D1B2A", labelpad=16)
-    ax.set_ylabel(ylabel, color="#0D1B2A")
 
-    ax.tick_params(axis='x', rotation=0)
+def new_figure(**kwargs):
+    """
+    A Figure made with the OO API only. pyplot's figure manager would keep
+    every figure alive until plt.close(); these go away with their last
+    reference. Figures are tracked weakly so leaks show up in
+    live_figure_count().
+    """
+    fig = Figure(**kwargs)
+    _live_figures.add(fig)
+    return fig
 
-    ax.spines['left'].set_color("#0D1B2A")
-    ax.spines['left'].set_linewidth(1.2)
-    ax.spines['bottom'].set_color("#0D1B2A")
-    ax.yaxis.set_ticks_position("left")
-    ax.xaxis.set_ticks_position("bottom")
 
-    max_h = data.max() or 0
-    ax.set_ylim(0, max_h * 1.4)
-    for rect in ax.patches:
-        h = rect.get_height()
-        ax.text(
-            rect.get_x()+rect.get_width()/2,
-            h + max_h*0.02,
-            f"{int(h)}", ha="center", va="bottom",
-            color="#0D1B2A"
-        )
+def live_figure_count():
+    return len(_live_figures)
 
-    ax.grid(axis="y", color="#888888", alpha=0.3)
-    fig.tight_layout()
-    
+
+@traced
+def figure_canvas(fig, min_h=100):
+    """Qt widget showing `fig`; must be called on the GUI thread."""
     canvas = FigureCanvas(fig)
     canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
     canvas.setMinimumHeight(min_h)
     return canvas
 
 
-def make_histogram(data, bins, title, xlabel, ylabel,
-                   figsize=(6, 4), dpi=100, min_h=100):
-    fig = Figure(figsize=figsize, dpi=dpi, facecolor='none')
-    ax = fig.add_subplot(111, facecolor='none')
+def rotate_xticklabels(fig, rotation=45):
+    ax = fig.axes[0]
+    for label in ax.get_xticklabels():
+        label.set_rotation(rotation)
+        label.set_ha("right")
+    with span("tight_layout"):
+        fig.tight_layout()
 
-    counts, edges, patches = ax.hist(
-        data.dropna(), bins=bins,
-        color="#415A77",
-        edgecolor="#0D1B2A"
-    )
 
-    ax.set_title(title)
-    ax.set_xlabel(xlabel, labelpad=12)
-    ax.set_ylabel(ylabel)
+def _style_axes(ax, title, xlabel, ylabel, labelpad, **text):
+    ax.set_title(title, **text)
+    ax.set_xlabel(xlabel, labelpad=labelpad, **text)
+    ax.set_ylabel(ylabel, **text)
 
+    ax.spines['left'].set_color("#0D1B2A")
     ax.spines['left'].set_linewidth(1.2)
-    ax.spines['left'].set_color('#0D1B2A')
-    ax.yaxis.set_ticks_position('left')
+    ax.yaxis.set_ticks_position("left")
 
-    ax.set_xticks(edges)
-    ax.set_xticklabels([f"{int(e)}" for e in edges], rotation=45)
 
-    max_h = counts.max()
-    ax.set_ylim(0, max_h * 1.4)
+class Chart:
+    """
+    A chart that keeps its Figure, and its canvas once shown, for the
+    lifetime of a page. `update()` changes the artists in place and asks
+    for a single draw_idle(); layout only reruns when the tick labels
+    change. Without a canvas it is plain matplotlib OO API, so charts
+    can also be built on a worker thread.
+    """
+
+    def __init__(self, figsize=(6, 4), dpi=100, min_h=100, facecolor='white'):
+        self.figure = new_figure(figsize=figsize, dpi=dpi, facecolor=facecolor)
+        self.ax = self.figure.add_subplot(111, facecolor=facecolor)
+        self.min_h = min_h
+        self.canvas = None
+        self._layout_key = None
+
+    def widget(self):
+        """The chart's canvas, created on first use (GUI thread only)."""
+        if self.canvas is None:
+            self.canvas = figure_canvas(self.figure, self.min_h)
+        return self.canvas
+
+    def detach(self):
+        """Take the canvas out of its parent before that parent is torn down."""
+        if self.canvas is not None:
+            self.canvas.setParent(None)
+
+    def _relayout(self, key):
+        if key != self._layout_key:
+            self._layout_key = key
+            with span("tight_layout"):
+                self.figure.tight_layout()
+
+    def draw(self):
+        if self.canvas is not None:
+            self.canvas.draw_idle()
+
+
+class BarChart(Chart):
+    """Single-series count bars with a value label on each bar."""
+
+    def __init__(self, title, xlabel, ylabel, figsize=(6, 4), dpi=100,
+                 min_h=100, rotate_labels=False):
+        super().__init__(figsize, dpi, min_h)
+        self.rotate_labels = rotate_labels
+        ax = self.ax
+        _style_axes(ax, title, xlabel, ylabel, 16, color="#0D1B2A")
+        ax.spines['bottom'].set_color("#0D1B2A")
+        ax.xaxis.set_ticks_position("bottom")
+        ax.grid(axis="y", color="#888888", alpha=0.3)
+        self.bars = None
+        self.texts = []
+        self.categories = None
+
+    @traced
+    def update(self, data):
+        ax = self.ax
+        heights = np.asarray(data.to_numpy(), dtype=float)
+        n = len(heights)
+
+        if self.bars is not None and len(self.bars) == n:
+            for rect, h in zip(self.bars, heights):
+                rect.set_height(h)
+        else:
+            if self.bars is not None:
+                self.bars.remove()
+            self.bars = ax.bar(np.arange(n), heights, width=0.5,
+                               color="#415A77", edgecolor="#0D1B2A")
 
-    for rect, cnt in zip(patches, counts):
-        ax.text(
-            rect.get_x() + rect.get_width()/2,
-            cnt + max_h * 0.02,
-            f"{int(cnt)}",
-            ha='center', va='bottom'
+        while len(self.texts) < n:
+            self.texts.append(ax.text(0, 0, "", ha="center", va="bottom",
+                                      color="#0D1B2A"))
+        while len(self.texts) > n:
+            self.texts.pop().remove()
+
+        max_h = data.max() or 0
+        ax.set_ylim(0, max_h * 1.4)
+        for text, rect, h in zip(self.texts, self.bars, heights):
+            text.set_position((rect.get_x() + rect.get_width() / 2, h + max_h * 0.02))
+            text.set_text(f"{int(h)}")
+
+        categories = [str(key) for key in data.index]
+        if categories != self.categories:
+            self.categories = categories
+            ax.set_xlim(-0.5, n - 0.5)
+            ax.set_xticks(np.arange(n))
+            ax.set_xticklabels(categories, rotation=0)
+            if self.rotate_labels:
+                for label in ax.get_xticklabels():
+                    label.set_rotation(45)
+                    label.set_ha("right")
+
+        # y tick labels get wider with the counts
+        self._relayout((tuple(categories), len(f"{max_h * 1.4:.0f}")))
+        self.draw()
+        return self
+
+
+class HistogramChart(Chart):
+    """Histogram with optional count labels; bins may change per update."""
+
+    def __init__(self, title, xlabel, ylabel, figsize=(6, 4), dpi=100,
+                 min_h=100, value_labels=True):
+        super().__init__(figsize, dpi, min_h, facecolor='none')
+        self.value_labels = value_labels
+        _style_axes(self.ax, title, xlabel, ylabel, 12)
+        self.ax.grid(axis='y')
+        self.patches = None
+        self.texts = []
+
+    @traced
+    def update(self, data, bins, xticks=None, xlim=None):
+        ax = self.ax
+        if self.patches is not None:
+            self.patches.remove()
+        for text in self.texts:
+            text.remove()
+        self.texts = []
+
+        counts, edges, self.patches = ax.hist(
+            data.dropna(), bins=bins,
+            color="#415A77",
+            edgecolor="#0D1B2A"
         )
 
-    ax.grid(axis='y')
-    ax.tick_params(axis='x', rotation=0)
-    fig.tight_layout()
+        ax.set_xticks(edges)
+        ax.set_xticklabels([f"{int(e)}" for e in edges], rotation=45)
+        if xticks is not None:
+            ax.set_xticks(xticks)
+        if xlim is not None:
+            ax.set_xlim(*xlim)
 
-    canvas = FigureCanvas(fig)
-    canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-    canvas.setMinimumHeight(min_h)
-    return canvas
+        max_h = counts.max()
+        ax.set_ylim(0, max_h * 1.4)
+
+        if self.value_labels:
+            self.texts = [
+                ax.text(
+                    rect.get_x() + rect.get_width()/2,
+                    cnt + max_h * 0.02,
+                    f"{int(cnt)}",
+                    ha='center', va='bottom'
+                )
+                for rect, cnt in zip(self.patches, counts)
+            ]
+
+        ax.tick_params(axis='x', rotation=0)
+        self._relayout((tuple(edges), len(f"{max_h * 1.4:.0f}")))
+        self.draw()
+        return self
+
+
+class NativeBarChart:
+    """
+    The BarChart look painted by a plain QWidget: an update is one
+    repaint, with no Agg raster or tight_layout. `figure` builds the
+    matplotlib chart of the same data, for PNG export.
+    """
+
+    def __init__(self, title, xlabel, ylabel, figsize=(6, 4), dpi=100,
+                 min_h=100, rotate_labels=False):
+        self.title = title
+        self.xlabel = xlabel
+        self.ylabel = ylabel
+        self.figsize = figsize
+        self.dpi = dpi
+        self.min_h = min_h
+        self.rotate_labels = rotate_labels
+        self.data = None
+        self.categories = []
+        self.heights = np.empty(0)
+        self.canvas = None
+
+    @traced
+    def update(self, data):
+        self.data = data
+        self.categories = [str(key) for key in data.index]
+        self.heights = np.asarray(data.to_numpy(), dtype=float)
+        if self.canvas is not None:
+            self.canvas.update()
+        return self
+
+    def widget(self):
+        if self.canvas is None:
+            self.canvas = BarWidget(self)
+        return self.canvas
+
+    def detach(self):
+        if self.canvas is not None:
+            self.canvas.setParent(None)
+
+    @property
+    def figure(self):
+        return bar_chart_figure(self.data, self.title, self.xlabel, self.ylabel,
+                                self.figsize, self.dpi, self.rotate_labels)
+
+
+class BarWidget(QWidget):
+    """Paints a NativeBarChart; `figure` makes "Download graph" work as for a canvas."""
+
+    PAD = 6
+
+    def __init__(self, chart, parent=None):
+        super().__init__(parent)
+        self.chart = chart
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.setMinimumHeight(chart.min_h)
+
+    def sizeHint(self):
+        width, height = self.chart.figsize
+        return QSize(int(width * self.chart.dpi), int(height * self.chart.dpi))
+
+    @property
+    def figure(self):
+        return self.chart.figure
+
+    @traced
+    def paintEvent(self, event):
+        chart = self.chart
+        heights = chart.heights
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        painter.fillRect(self.rect(), QtCore.Qt.white)
+
+        pad = self.PAD
+        dark = QColor("#0D1B2A")
+        title_font = QFont("Arial")
+        title_font.setPointSizeF(14)
+        text_font = QFont("Arial")
+        text_font.setPointSizeF(12)
+        title_fm = QFontMetricsF(title_font)
+        fm = QFontMetricsF(text_font)
+
+        max_h = heights.max() if len(heights) else 0
+        top_y = max_h * 1.4 or 1.0
+        ticks = [t for t in MaxNLocator(nbins=5).tick_values(0, top_y)
+                 if 0 <= t <= top_y]
+        tick_labels = [f"{t:g}" for t in ticks]
+
+        # margins around the plot area
+        top = pad + (title_fm.height() + pad if chart.title else 0)
+        left = pad + (fm.height() + pad if chart.ylabel else 0)
+        left += max((fm.horizontalAdvance(t) for t in tick_labels), default=0) + pad
+        if chart.rotate_labels:
+            widest = max((fm.horizontalAdvance(c) for c in chart.categories), default=0)
+            xticks_h = (widest + fm.height()) * 0.7071
+        else:
+            xticks_h = fm.height()
+        bottom = pad + xticks_h + pad + (fm.height() + pad if chart.xlabel else 0)
+        plot = QRectF(left, top, self.width() - left - pad, self.height() - top - bottom)
+        if plot.width() <= 0 or plot.height() <= 0:
+            return
+
+        def y_of(value):
+            return plot.bottom() - value / top_y * plot.height()
+
+        painter.setPen(dark)
+        if chart.title:
+            painter.setFont(title_font)
+            painter.drawText(QRectF(plot.left(), pad, plot.width(), title_fm.height()),
+                             QtCore.Qt.AlignCenter, chart.title)
+
+        painter.setFont(text_font)
+        grid = QColor("#888888")
+        grid.setAlphaF(0.3)
+        for tick, label in zip(ticks, tick_labels):
+            y = y_of(tick)
+            painter.setPen(QPen(grid, 1))
+            painter.drawLine(QPointF(plot.left(), y), QPointF(plot.right(), y))
+            painter.setPen(dark)
+            painter.drawText(QRectF(0, y - fm.height() / 2, plot.left() - pad, fm.height()),
+                             QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter, label)
+
+        n = len(heights)
+        slot = plot.width() / n if n else 0
+        painter.setPen(QPen(dark, 1))
+        painter.setBrush(QColor("#415A77"))
+        for i, h in enumerate(heights):
+            x = plot.left() + (i + 0.25) * slot
+            painter.drawRect(QRectF(x, y_of(h), slot / 2, plot.bottom() - y_of(h)))
+
+        painter.setBrush(QtCore.Qt.NoBrush)
+        for i, (h, category) in enumerate(zip(heights, chart.categories)):
+            center = plot.left() + (i + 0.5) * slot
+            base = y_of(h + max_h * 0.02)
+            painter.drawText(QRectF(center - slot / 2, base - fm.height(), slot, fm.height()),
+                             QtCore.Qt.AlignHCenter | QtCore.Qt.AlignBottom, f"{int(h)}")
+            if chart.rotate_labels:
+                painter.save()
+                painter.translate(center, plot.bottom() + pad)
+                painter.rotate(-45)
+                width = fm.horizontalAdvance(category)
+                painter.drawText(QRectF(-width, 0, width, fm.height()),
+                                 QtCore.Qt.AlignRight | QtCore.Qt.AlignTop, category)
+                painter.restore()
+            else:
+                painter.drawText(QRectF(center - slot / 2, plot.bottom() + pad, slot, fm.height()),
+                                 QtCore.Qt.AlignHCenter | QtCore.Qt.AlignTop, category)
+
+        painter.drawRect(plot)
+        painter.setPen(QPen(dark, 1.2))
+        painter.drawLine(plot.topLeft(), plot.bottomLeft())
+
+        if chart.xlabel:
+            painter.drawText(QRectF(plot.left(), self.height() - pad - fm.height(),
+                                    plot.width(), fm.height()),
+                             QtCore.Qt.AlignCenter, chart.xlabel)
+        if chart.ylabel:
+            painter.save()
+            painter.translate(pad, plot.center().y())
+            painter.rotate(-90)
+            painter.drawText(QRectF(-plot.height() / 2, 0, plot.height(), fm.height()),
+                             QtCore.Qt.AlignCenter, chart.ylabel)
+            painter.restore()
+
+
+def native_charts_available():
+    """QWidgets can only be made on the GUI thread of a running app."""
+    app = QApplication.instance()
+    return app is not None and QThread.currentThread() is app.thread()
+
+
+def count_chart(title, xlabel, ylabel, figsize=(6, 4), dpi=100, min_h=100,
+                rotate_labels=False, backend="auto"):
+    """
+    Persistent single-series count chart. `backend="auto"` paints it
+    natively when a widget can be made here, else (worker thread, batch
+    export) it is a matplotlib BarChart; "native"/"matplotlib" force one.
+    """
+    if backend == "auto":
+        backend = "native" if native_charts_available() else "matplotlib"
+    cls = NativeBarChart if backend == "native" else BarChart
+    return cls(title, xlabel, ylabel, figsize, dpi, min_h, rotate_labels)
+
+
+class FigureManager:
+    """
+    Owns the figures and canvases of one page.
+
+    Charts from `chart()` live as long as the page and are only detached
+    when its sections are torn down. Canvases from `canvas()` show a figure
+    built for one render; `release()` schedules them for deletion together
+    with the sections. With a ChartCache, `cached()` shows charts rendered
+    before for the same filter as images.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache
+        self.charts = {}
+        self.canvases = []
+
+    def chart(self, key, factory):
+        chart = self.charts.get(key)
+        if chart is None:
+            chart = self.charts[key] = factory()
+        return chart
+
+    def canvas(self, fig):
+        canvas = FigureCanvas(fig)
+        self.canvases.append(canvas)
+        return canvas
+
+    def cached(self, chart_id, filters, make_canvas, make_figure):
+        return cached_chart(self.cache, chart_id, filters, make_canvas, make_figure)
+
+    def is_cached(self, chart_id, filters):
+        return self.cache is not None and (chart_id, filters) in self.cache
+
+    def release(self):
+        for chart in self.charts.values():
+            chart.detach()
+        for canvas in self.canvases:
+            canvas.setParent(None)
+            canvas.deleteLater()
+        self.canvases = []
+
+    @property
+    def live_canvases(self):
+        persistent = sum(chart.canvas is not None for chart in self.charts.values())
+        return persistent + len(self.canvases)
+
+
+@traced
+def bar_chart_figure(data, title, xlabel, ylabel, figsize=(6, 4), dpi=100,
+                     rotate_labels=False):
+    chart = BarChart(title, xlabel, ylabel, figsize, dpi, rotate_labels=rotate_labels)
+    return chart.update(data).figure
+
+
+class LazyFigures(dict):
+    """
+    The figures of one page render, built on first access by
+    `builders[key](summary)` and kept for as long as the render lives.
+    """
+
+    def __init__(self, builders, summary):
+        super().__init__()
+        self.builders = builders
+        self.summary = summary
+
+    def __missing__(self, key):
+        fig = self[key] = self.builders[key](self.summary)
+        return fig
+
+    def prebuild(self, keys):
+        """Build `keys` now, e.g. on the render pool for expanded sections."""
+        for key in keys:
+            self[key]
+        return self
+
+
+@traced
+def make_bar_chart(data, title, xlabel, ylabel,
+                   figsize=(6, 4), dpi=100, min_h=100, backend="auto"):
+    chart = count_chart(title, xlabel, ylabel, figsize, dpi, min_h, backend=backend)
+    return chart.update(data).widget()
+
+
+@traced
+def histogram_figure(data, bins, title, xlabel, ylabel, figsize=(6, 4), dpi=100):
+    return HistogramChart(title, xlabel, ylabel, figsize, dpi).update(data, bins).figure
+
+
+@traced
+def make_histogram(data, bins, title, xlabel, ylabel,
+                   figsize=(6, 4), dpi=100, min_h=100):
+    chart = HistogramChart(title, xlabel, ylabel, figsize, dpi, min_h)
+    return chart.update(data, bins).widget()
+
+
+GROUP_COLORS = ["#E63946", "#457B9D", "#2A9D8F", "#F4A261"]
+
+
+@traced
+def score_count_matrix(scores):
+    """
+    Score x column counts of a frame of integer score columns, from one
+    np.bincount over (column, score) codes. Missing answers are skipped and
+    only scores someone gave are kept.
+    """
+    # column-major, so every column is one contiguous run of codes
+    values = scores.to_numpy(dtype=float).T
+    n_cols = len(values)
+    if not n_cols or np.isnan(values).all():
+        return pd.DataFrame(columns=scores.columns, dtype=int)
+    low = int(np.nanmin(values))
+    width = int(np.nanmax(values)) - low + 1
+    # one bucket per (column, score) plus one per column for missing
+    # answers; fmin() turns NaN into that last bucket
+    start = np.arange(n_cols)[:, None] * (width + 1)
+    codes = values + (start - low)
+    np.fmin(codes, start + width, out=codes)
+    counts = np.bincount(codes.astype(np.intp).ravel(),
+                         minlength=n_cols * (width + 1))
+    counts = counts.reshape(n_cols, width + 1)[:, :width].T
+    matrix = pd.DataFrame(counts, index=np.arange(low, low + width),
+                          columns=scores.columns)
+    return matrix[counts.sum(axis=1) > 0]
+
+
+@traced
+def grouped_bar_figure(counts, title, xlabel, ylabel, labels=None,
+                       colors=GROUP_COLORS, width=None, label_size=9,
+                       figsize=(8, 5), dpi=100):
+    """
+    One bar per column of `counts` (score x series) at every score, as a
+    single bar container labelled by a single bar_label() call.
+    """
+    scores = list(counts.index)
+    n_series = counts.shape[1]
+    labels = list(counts.columns) if labels is None else labels
+    width = 0.8 / n_series if width is None else width
+
+    fig = new_figure(figsize=figsize, dpi=dpi, facecolor='white')
+    ax = fig.add_subplot(111, facecolor='white')
+
+    # series-major, so series are drawn one after the other as with one
+    # ax.bar() per series
+    offsets = (np.arange(n_series) - (n_series - 1) / 2) * width
+    x = (offsets[:, None] + np.arange(len(scores))).ravel()
+    heights = counts.to_numpy(dtype=float).T.ravel()
+    series_colors = np.repeat(colors[:n_series], len(scores))
+    bars = ax.bar(x, heights, width, color=series_colors, edgecolor="#0D1B2A")
+
+    max_h = heights.max() if len(heights) else 0
+    ax.bar_label(bars, labels=[f"{int(h)}" for h in heights],
+                 padding=4, color="#0D1B2A", fontsize=label_size)
+
+    _style_axes(ax, title, xlabel, ylabel, 16, color="#0D1B2A")
+    ax.set_xticks(np.arange(len(scores)))
+    ax.set_xticklabels(scores, rotation=0)
+    ax.legend(handles=[Patch(facecolor=color, edgecolor="#0D1B2A", label=label)
+                       for color, label in zip(colors, labels)])
+    ax.spines['bottom'].set_color("#0D1B2A")
+    ax.xaxis.set_ticks_position("bottom")
+    ax.grid(axis="y", color="#888888", alpha=0.3)
+    ax.set_ylim(0, max_h * 1.4)
+    with span("tight_layout"):
+        fig.tight_layout()
+    return fig
+
+
+@traced
+def make_grouped_bar_chart(scores, title, xlabel, ylabel, labels=None,
+                           min_h=100, **kwargs):
+    """Grouped distribution of the raw score columns in `scores`."""
+    fig = grouped_bar_figure(score_count_matrix(scores), title, xlabel, ylabel,
+                             labels, **kwargs)
+    return figure_canvas(fig, min_h)
 
 
+@traced
 def make_bmi_scatter(data, title, xlabel, ylabel):
-    fig, ax = plt.subplots()
+    fig = new_figure()
+    ax = fig.add_subplot(111)
     ax.scatter(range(len(data)), data, color='red')
     ax.set_title(title)
     ax.set_xlabel(xlabel)
     ax.set_ylabel(ylabel)
-    fig.tight_layout()
+    with span("tight_layout"):
+        fig.tight_layout()
     return FigureCanvas(fig)
@@ -0,0 +1,149 @@
+# cube.py
+import numpy as np
+import pandas as pd
+
+import schema
+
+# Integer-valued columns whose distribution the pages chart.
+COUNT_COLUMNS = ['GHR_Prev_Repairs_Right', 'GHR_Prev_Repairs_Left',
+                 'PHR_Prev_Repairs', 'IVHR_Prev_Repairs']
+
+GHR_SIDES = ['Right', 'Left', 'Bilateral']
+
+
+def _bincount(cells, n_cells, codes, k):
+    """(n_cells, k) table of how often each code occurs in each cell."""
+    valid = codes >= 0
+    flat = np.bincount(cells[valid] * k + codes[valid], minlength=n_cells * k)
+    return flat.reshape(n_cells, k).astype(np.int32)
+
+
+def _category_codes(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), list(series.cat.categories)
+    # nullable booleans
+    values = series.astype('Int8').to_numpy(dtype=np.int64, na_value=-1)
+    return values, [False, True]
+
+
+def _ghr_side_codes(frame):
+    right = frame['GHR_Side_Right'].to_numpy()
+    left = frame['GHR_Side_Left'].to_numpy()
+    codes = np.full(len(frame), -1, dtype=np.int64)
+    codes[right] = 0
+    codes[left] = 1
+    codes[right & left] = 2
+    return codes
+
+
+class MetricsCube:
+    """
+    Counts behind every page chart, precomputed for each cell of a
+    PartitionIndex (operation type x year x sex x age bucket).
+
+    - categories (and nullable booleans): value counts per cell
+    - scores and repair counts: integer distributions plus sum/count
+    - flags: number of ticked rows per cell
+
+    A filter selects cells; its aggregate is a sum over those cells, so a
+    query costs O(cells x categories) and never reads row data.
+    """
+
+    def __init__(self, frame, index):
+        self.index = index
+        cells = index.cell_ids.astype(np.int64)
+        n_cells = len(index.keys)
+
+        self.sizes = np.bincount(cells, minlength=n_cells).astype(np.int32)
+        self.labels = {}
+        self.tables = {}
+        self.sums = {}
+
+        for spec in schema.COLUMNS:
+            if spec.name not in frame.columns:
+                continue
+            series = frame[spec.name]
+            if spec.dtype in ('category', 'bool'):
+                codes, labels = _category_codes(series)
+                self._add(spec.name, labels,
+                          _bincount(cells, n_cells, codes, len(labels)))
+            elif spec.dtype == 'score' or spec.name in COUNT_COLUMNS:
+                self._add_distribution(spec.name, series, cells, n_cells)
+
+        if {'GHR_Side_Right', 'GHR_Side_Left'} <= set(frame.columns):
+            self._add('GHR_Side', GHR_SIDES, _bincount(
+                cells, n_cells, _ghr_side_codes(frame), len(GHR_SIDES)))
+
+        flags = [spec.name for spec in schema.COLUMNS
+                 if spec.dtype == 'flag' and spec.name in frame.columns]
+        self.flag_names = flags
+        self.flags = np.zeros((n_cells, len(flags)), dtype=np.int32)
+        for i, name in enumerate(flags):
+            self.flags[:, i] = np.bincount(
+                cells, weights=frame[name].to_numpy(dtype=np.float64),
+                minlength=n_cells)
+
+    def _add(self, name, labels, table):
+        self.labels[name] = labels
+        self.tables[name] = table
+
+    def _add_distribution(self, name, series, cells, n_cells):
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = ~np.isnan(values)
+        if valid.any():
+            ints = np.trunc(values[valid]).astype(np.int64)
+            low, high = int(ints.min()), int(ints.max())
+        else:
+            ints, low, high = np.array([], dtype=np.int64), 0, -1
+        codes = np.full(len(values), -1, dtype=np.int64)
+        codes[valid] = ints - low
+        self._add(name, list(range(low, high + 1)),
+                  _bincount(cells, n_cells, codes, high - low + 1))
+
+        total = np.bincount(cells[valid], weights=values[valid], minlength=n_cells)
+        self.sums[name] = total
+
+    def query(self, spec):
+        """Aggregates of the rows matching a FilterSpec."""
+        mask = self.index.cell_mask(spec)
+        return CubeSlice(self, mask)
+
+
+class CubeSlice:
+    """The cube summed over a set of cells."""
+
+    def __init__(self, cube, mask):
+        self._cube = cube
+        self._mask = mask
+        self.n = int(cube.sizes[mask].sum())
+
+    def __contains__(self, name):
+        return name in self._cube.tables or name in self._cube.flag_names
+
+    def counts(self, name):
+        """Counts of every known value of `name`, zeros included."""
+        table = self._cube.tables[name]
+        return pd.Series(table[self._mask].sum(axis=0),
+                         index=self._cube.labels[name])
+
+    def value_counts(self, name):
+        """Non-zero counts, most frequent first, as Series.value_counts()."""
+        counts = self.counts(name).sort_values(ascending=False, kind="stable")
+        return counts[counts > 0]
+
+    def observed(self, name):
+        """Number of rows where `name` is not missing."""
+        return int(self._cube.tables[name][self._mask].sum())
+
+    def mean(self, name):
+        """Mean of a score or repair column, NaN when nothing is observed."""
+        n = self.observed(name)
+        if not n:
+            return np.nan
+        return float(self._cube.sums[name][self._mask].sum()) / n
+
+    def flag_sums(self, names):
+        """Number of ticked rows of each flag column in `names`."""
+        cols = [self._cube.flag_names.index(name) for name in names]
+        return pd.Series(self._cube.flags[self._mask][:, cols].sum(axis=0),
+                         index=list(names))
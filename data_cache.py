@@ -0,0 +1,205 @@
+# data_cache.py
+import hashlib
+import json
+import os
+import shutil
+import warnings
+
+import numpy as np
+import pandas as pd
+
+CACHE_VERSION = 2
+META_FILE = "meta.json"
+
+
+def cache_dir_for(path):
+    """Cache directory stored next to the workbook (ExportedData.xlsx.cache)."""
+    return os.path.abspath(path) + ".cache"
+
+
+def file_fingerprint(path):
+    """Path, size, mtime and SHA-256 of the workbook plus the cache format."""
+    st = os.stat(path)
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return {
+        "path": os.path.abspath(path),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha256": digest.hexdigest(),
+        "cache_version": CACHE_VERSION,
+        "pandas": pd.__version__,
+    }
+
+
+def invalidate_cache(path):
+    """Remove the cache of the given workbook, if any."""
+    cache_dir = cache_dir_for(path)
+    if os.path.isdir(cache_dir):
+        shutil.rmtree(cache_dir)
+
+
+def _read_meta(cache_dir):
+    with open(os.path.join(cache_dir, META_FILE), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _is_fresh(meta, path, extra_key):
+    """Cheap size/mtime check first, content hash only when those match."""
+    key = meta.get("fingerprint", {})
+    st = os.stat(path)
+    if (key.get("path") != os.path.abspath(path)
+            or key.get("size") != st.st_size
+            or key.get("mtime_ns") != st.st_mtime_ns):
+        return False
+    if meta.get("extra_key") != extra_key:
+        return False
+    return key == file_fingerprint(path)
+
+
+def _write_uniques(cache_dir, name, uniques):
+    """
+    Store the uniques of a coded column as JSON: strings, numbers and bools
+    only, so that reading a cache never unpickles anything.
+    """
+    values = [v.item() if isinstance(v, np.generic) else v for v in uniques]
+    for v in values:
+        if not isinstance(v, (str, bool, int, float)):
+            raise TypeError(f"cannot cache a value of type {type(v).__name__}")
+    with open(os.path.join(cache_dir, name + ".uniques.json"), "w",
+              encoding="utf-8") as f:
+        json.dump(values, f, ensure_ascii=False)
+
+
+def _read_uniques(cache_dir, name):
+    with open(os.path.join(cache_dir, name + ".uniques.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_column(cache_dir, i, series):
+    """Store one column as .npy; strings/objects become int32 codes + uniques."""
+    name = f"c{i}"
+    entry = {"file": name, "dtype": str(series.dtype)}
+    values = series.to_numpy()
+
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        entry["kind"] = "categorical"
+        entry["ordered"] = bool(series.cat.ordered)
+        np.save(os.path.join(cache_dir, name + ".npy"),
+                series.cat.codes.to_numpy())
+        _write_uniques(cache_dir, name, series.cat.categories)
+    elif series.dtype.kind in "biuf":
+        entry["kind"] = "numeric"
+        np.save(os.path.join(cache_dir, name + ".npy"), values)
+    elif series.dtype.kind == "M":
+        entry["kind"] = "datetime"
+        np.save(os.path.join(cache_dir, name + ".npy"),
+                values.astype("datetime64[ns]").view("int64"))
+    else:
+        entry["kind"] = "coded"
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        np.save(os.path.join(cache_dir, name + ".npy"),
+                codes.astype(np.int32))
+        _write_uniques(cache_dir, name, uniques)
+    return entry
+
+
+def write_cache(path, df, extra_key=None):
+    """Write `df` to the cache of `path`; the old cache is replaced atomically."""
+    cache_dir = cache_dir_for(path)
+    tmp_dir = cache_dir + ".tmp"
+    if os.path.isdir(tmp_dir):
+        shutil.rmtree(tmp_dir)
+    os.makedirs(tmp_dir)
+
+    columns = []
+    try:
+        for i, col in enumerate(df.columns):
+            entry = _write_column(tmp_dir, i, df[col])
+            entry["name"] = col
+            columns.append(entry)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    meta = {
+        "fingerprint": file_fingerprint(path),
+        "extra_key": extra_key,
+        "n_rows": len(df),
+        "columns": columns,
+    }
+    with open(os.path.join(tmp_dir, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+    invalidate_cache(path)
+    os.replace(tmp_dir, cache_dir)
+
+
+def _read_column(cache_dir, entry, n_rows):
+    file = os.path.join(cache_dir, entry["file"] + ".npy")
+    values = np.load(file, mmap_mode="r", allow_pickle=False)
+    if len(values) != n_rows:
+        raise ValueError(f"column {entry['name']!r} has {len(values)} rows, "
+                         f"expected {n_rows}")
+
+    if entry["kind"] == "numeric":
+        return pd.Series(values, dtype=entry["dtype"], copy=False)
+    if entry["kind"] == "datetime":
+        return pd.Series(np.asarray(values).view("datetime64[ns]"),
+                         dtype=entry["dtype"])
+
+    uniques = _read_uniques(cache_dir, entry["file"])
+    codes = np.asarray(values)
+    if entry["kind"] == "categorical":
+        return pd.Series(pd.Categorical.from_codes(
+            codes, categories=uniques, ordered=entry["ordered"]))
+
+    uniques = np.array(uniques, dtype=object)
+    out = np.full(n_rows, np.nan, dtype=object)
+    valid = codes >= 0
+    out[valid] = uniques[codes[valid]]
+    return pd.Series(out, dtype=entry["dtype"])
+
+
+def read_cache(path, extra_key=None):
+    """
+    Return the cached frame of `path`, or None when the cache is missing,
+    stale or unreadable. Numeric columns are memory-mapped.
+    """
+    cache_dir = cache_dir_for(path)
+    if not os.path.isfile(os.path.join(cache_dir, META_FILE)):
+        return None
+    try:
+        meta = _read_meta(cache_dir)
+        if not _is_fresh(meta, path, extra_key):
+            return None
+        n_rows = meta["n_rows"]
+        data = {
+            entry["name"]: _read_column(cache_dir, entry, n_rows)
+            for entry in meta["columns"]
+        }
+        return pd.DataFrame(data, copy=False)
+    except Exception as exc:
+        warnings.warn(f"Ignoring corrupt data cache {cache_dir}: {exc}")
+        return None
+
+
+def load_cached(path, parse, rebuild=False, extra_key=None):
+    """
+    Return the frame of the workbook at `path`, from the cache when it is
+    fresh, otherwise by calling `parse(path)` and refreshing the cache.
+    `rebuild=True` always parses the workbook again.
+    """
+    if not rebuild:
+        df = read_cache(path, extra_key)
+        if df is not None:
+            return df
+
+    df = parse(path)
+    try:
+        write_cache(path, df, extra_key)
+    except (OSError, TypeError) as exc:
+        warnings.warn(f"Could not write data cache for {path}: {exc}")
+    return df
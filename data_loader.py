@@ -1,7 +1,18 @@
 # data_loader.py
 import os
-import pandas as pd
 import sys
+import threading
+import warnings
+import numpy as np
+import pandas as pd
+from functools import partial
+from data_cache import file_fingerprint, load_cached
+import schema
+import xlsx_stream
+from cube import MetricsCube
+from filters import ANY, FilterSpec, equals_mask, parse_year_selection
+from partition_index import PartitionIndex
+from tracing import span, traced
 
 if getattr(sys, 'frozen', False):
     base_path = sys._MEIPASS
@@ -11,155 +22,254 @@ else:
 excel_path = os.path.join(base_path, "ExportedData.xlsx")
 style_path = os.path.join(base_path, "resources", "style.qss")
 
-df_all = pd.read_excel(excel_path)
 
-if 'Date of Operation' in df_all.columns:
-    df_all['Date of Operation'] = pd.to_datetime(
-        df_all['Date of Operation'], errors='coerce')
-    df_all['Year'] = df_all['Date of Operation'].dt.year
-else:
-    df_all['Year'] = None
+ENGINES = ("pandas", "stream")
 
 
-def load_preop_data():
+@traced
+def parse_workbook(path, engine="pandas", progress=None):
     """
-    Načte a přejmenuje sloupce pro Preoperative stránku,
-    převede potřebné sloupce na numerické hodnoty a spočítá agregáty.
+    Parse only the registered columns of the Excel export and derive
+    `Year` from `Date of Operation`.
+
+    engine="pandas" uses read_excel; engine="stream" iterates the sheet
+    in read_only mode chunk by chunk (xlsx_stream) with bounded memory
+    and calls `progress(rows, total_rows, rows_per_second)`. A .csv with
+    the export's headers (e.g. from synthetic.py) is read with read_csv.
     """
-    df = df_all.copy()
-    df = df.rename(columns={
-        'Gender of the patient': 'Gender',
-        'Age of patient at day of operation': 'Age',
-        'BMI': 'BMI',
-        'Please specify the patient\'s comorbidities::No Comorbidities': 'No_Comorbidities',
-        'Please specify the patient\'s comorbidities::Diabetes mellitus': 'Diabetes',
-        'Please specify the patient\'s comorbidities::COPD': 'COPD',
-        'Please specify the patient\'s comorbidities::Hepatic disease': 'Hepatic_Disease',
-        'Please specify the patient\'s comorbidities::Renal disease': 'Renal_Disease',
-        'Please specify the patient\'s comorbidities::Abdominal aortic aneurysm': 'Aortic_Aneurysm',
-        'Please specify the patient\'s comorbidities::Smoker': 'Smoker',
-        'Pain at the site of the hernia\nIn rest (laying down)': 'Pain_rest',
-        'Pain at the site of the hernia\nDuring activities (walking, biking, sports)': 'Pain_activity',
-        'Pain at the site of the hernia\nPain felt during the last week': 'Pain_last_week',
-        'Restrictions of activities\nDaily activities (inside the house)': 'Restrict_inside',
-        'Restrictions of activities\nOutside the house (walking, biking; driving)': 'Restrict_outside',
-        'Restrictions of activities\nDuring sports': 'Restrict_sports',
-        'Restrictions of activities\nDuring heavy labour': 'Restrict_heavy',
-        'Esthetical discomfort\nThe shape of your abdomen': 'Esthetic_abdomen',
-        'Esthetical discomfort\nThe hernia itself': 'Esthetic_hernia',
-    })
-    df['BMI'] = pd.to_numeric(df['BMI'], errors='coerce')
-
-    restrict_cols = ['Restrict_inside', 'Restrict_outside',
-                     'Restrict_sports', 'Restrict_heavy']
-    df[restrict_cols] = (
-        df[restrict_cols]
-        .apply(pd.to_numeric, errors='coerce')
-        .fillna(0)
-        .astype(int)
-    )
-    pain_cols = ['Pain_rest', 'Pain_activity', 'Pain_last_week']
-    df[pain_cols] = (
-        df[pain_cols]
-        .apply(pd.to_numeric, errors='coerce')
-        .fillna(0)
-        .astype(int)
-    )
-    aesth_cols = ['Esthetic_abdomen', 'Esthetic_hernia']
-    df[aesth_cols] = (
-        df[aesth_cols]
-        .apply(pd.to_numeric, errors='coerce')
-        .fillna(0)
-        .astype(int)
-    )
-
-    df['Preop_Restrict_Score'] = df[restrict_cols].sum(axis=1)
-    df['Preop_Pain_Score'] = df[pain_cols].sum(axis=1)
-    df['Esthetic_Discomfort_Score'] = df[aesth_cols].sum(axis=1)
-
-    for col in ['No_Comorbidities', 'Diabetes', 'COPD', 'Hepatic_Disease', 'Renal_Disease', 'Aortic_Aneurysm', 'Smoker']:
-        df[col] = df[col].fillna(0).astype(int)
+    if path.lower().endswith(".csv"):
+        df = pd.read_csv(path, usecols=lambda col: col in schema.BY_RAW)
+    elif engine == "stream":
+        df = xlsx_stream.read_columns(path, schema.raw_headers(),
+                                      progress=progress)
+    elif engine == "pandas":
+        df = pd.read_excel(path, usecols=lambda col: col in schema.BY_RAW)
+    else:
+        raise ValueError(f"unknown engine {engine!r}, expected one of {ENGINES}")
+    df = df[[raw for raw in schema.raw_headers() if raw in df.columns]]
+
+    missing = schema.missing_headers(df.columns)
+    if missing:
+        warnings.warn(
+            f"{os.path.basename(path)} is missing {len(missing)} registered "
+            f"column(s): {', '.join(repr(m) for m in missing)}")
+    return normalize_workbook(df)
 
+
+@traced
+def normalize_workbook(df):
+    """Convert `Date of Operation` to datetimes and derive `Year` from it."""
+    if 'Year' in df.columns:
+        return df
+    if 'Date of Operation' in df.columns:
+        dates = pd.to_datetime(df['Date of Operation'], errors='coerce')
+        df = df.assign(**{'Date of Operation': dates})
+        df = pd.concat([df, dates.dt.year.rename('Year')], axis=1)
+    else:
+        df = df.assign(Year=None)
     return df
 
 
-def load_oper_data():
-    df = df_all.copy()
-    df = df.rename(columns={
-        'Gender of the patient': 'Gender',
-        'Age of patient at day of operation': 'Age',
-        'Please choose the indication for the abdominal wall repair': 'Operation_Type',
-        'Indication for the surgery?': 'Indication',
-        'Side of the groin hernia? Bilateral?::Right': 'GHR_Side_Right',
-        'Side of the groin hernia? Bilateral?::Left': 'GHR_Side_Left',
-        'Number of previous repairs - right side': 'GHR_Prev_Repairs_Right',
-        'Number of previous repairs - left side': 'GHR_Prev_Repairs_Left',
-        'Type of the groin hernia - right side::Lateral (indirect)': 'GHR_Type_Right_Lateral',
-        'Type of the groin hernia - right side::Medial (direct)': 'GHR_Type_Right_Medial',
-        'Type of the groin hernia - right side::Femoral': 'GHR_Type_Right_Femoral',
-        'Type of the groin hernia - right side::Obturator': 'GHR_Type_Right_Obturator',
-        'Type of the groin hernia - left side::Lateral (indirect)': 'GHR_Type_Left_Lateral',
-        'Type of the groin hernia - left side::Medial (direct)': 'GHR_Type_Left_Medial',
-        'Type of the groin hernia - left side::Femoral': 'GHR_Type_Left_Femoral',
-        'Type of the groin hernia - left side::Obturator': 'GHR_Type_Left_Obturator',
-        'Type of stoma': 'PHR_Stoma_Type',
-        'Number of previous parastomal hernia repairs': 'PHR_Prev_Repairs',
-        'Please specify type of primary ventral hernia': 'PVHR_Subtype',
-        'Number of previous hernia repairs': 'IVHR_Prev_Repairs',
-    })
-
-    op_map = {
-        'Groin Hernia Repair':        'GHR',
-        'Parastomal Hernia Repair':    'PHR',
-        'Primary Ventral Hernia Repair': 'PVHR',
-        'Incisional Ventral Hernia Repair': 'IVHR'
-    }
-    df['Operation_Type'] = df['Operation_Type'].map(op_map)
+@traced
+def read_workbook(path=excel_path, rebuild=False, engine="pandas",
+                  progress=None):
+    """
+    Return the normalized workbook frame, served from the columnar cache
+    next to the workbook when it matches the file, otherwise parsed again.
+    """
+    parse = partial(parse_workbook, engine=engine, progress=progress)
+    return load_cached(path, parse, rebuild=rebuild,
+                       extra_key=schema.schema_key())
+
+
+SCORE_COLUMNS = {
+    'Preop_Restrict_Score': ['Restrict_inside', 'Restrict_outside',
+                             'Restrict_sports', 'Restrict_heavy'],
+    'Preop_Pain_Score': ['Pain_rest', 'Pain_activity', 'Pain_last_week'],
+    'Esthetic_Discomfort_Score': ['Esthetic_abdomen', 'Esthetic_hernia'],
+}
+
+DERIVED_COLUMNS = {
+    'shared': ['Year'],
+    'preop': list(SCORE_COLUMNS),
+}
+
+
+@traced
+def build_canonical(raw):
+    """
+    Rename all registered columns, apply their dtype/fill rules (compact
+    categoricals, bool flags, Int8 scores) and add the derived
+    preoperative scores.
+    """
+    data = {}
+    for spec in schema.COLUMNS:
+        if spec.raw in raw.columns:
+            data[spec.name] = schema.coerce_column(raw[spec.raw], spec)
+    data['Year'] = raw['Year']
+    df = pd.DataFrame(data)
+
+    for score, cols in SCORE_COLUMNS.items():
+        if all(col in df.columns for col in cols):
+            df[score] = df[cols].sum(axis=1, min_count=1).astype('Int8')
     return df
 
 
+@traced
+def filter_positions(df, year=None, gender="All", age_group="All"):
+    """
+    Row positions of `df` matching the year selection ("2021" or
+    "2021-2025"), sex and age bucket. Unparsable years and missing columns
+    leave that filter out.
+    """
+    mask = np.ones(len(df), dtype=bool)
+
+    years = parse_year_selection(year)
+    if 'Year' in df.columns and years is not ANY:
+        mask &= df['Year'].isin(years).to_numpy()
+
+    if gender.lower() in ("male", "female") and 'Gender' in df.columns:
+        mask &= equals_mask(df['Gender'], gender.lower())
+
+    if age_group != "All" and 'Age' in df.columns:
+        mask &= equals_mask(df['Age'], age_group)
+
+    return np.flatnonzero(mask)
+
+
+class Dataset:
+    """
+    The canonical registry frame shared by all pages. Nothing is read
+    until `frame` (or `view`) is first used, so importing this module is
+    free. Pages receive column-projected views instead of their own copies.
+    """
+
+    def __init__(self, path=excel_path, raw=None, engine="pandas"):
+        self.path = path
+        self.engine = engine
+        self._raw = raw
+        self._frame = None
+        self._index = None
+        self._cube = None
+        self._fingerprint = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, raw):
+        """Dataset over an in-memory frame with the Excel export's headers."""
+        return cls(path=None, raw=raw)
+
+    @property
+    def loaded(self):
+        return self._frame is not None
+
+    @property
+    def frame(self):
+        if self._frame is None:
+            self.load()
+        return self._frame
+
+    def read_raw(self, rebuild=False, progress=None):
+        """Workbook frame with the export's headers (cache or Excel)."""
+        if self._raw is not None:
+            return normalize_workbook(self._raw)
+
+        def rows_read(rows, total, rate):
+            if progress:
+                progress(f"Reading workbook... {rows:,} / {total:,} rows "
+                         f"({rate:,.0f} rows/s)")
+
+        return read_workbook(self.path, rebuild=rebuild, engine=self.engine,
+                             progress=rows_read)
+
+    @traced
+    def load(self, rebuild=False, progress=None):
+        """
+        Read and normalize the data now; safe to call from a worker thread.
+        `progress(stage)` is called with a short text before each stage.
+        """
+        progress = progress or (lambda stage: None)
+        with self._lock:
+            if self._frame is None or rebuild:
+                progress("Reading workbook...")
+                raw = self.read_raw(rebuild, progress)
+                progress("Normalizing columns...")
+                frame = build_canonical(raw)
+                progress("Building indexes...")
+                with span("PartitionIndex"):
+                    self._index = PartitionIndex(frame)
+                with span("MetricsCube"):
+                    self._cube = MetricsCube(frame, self._index)
+                self._frame = frame
+        return self._frame
+
+    @property
+    def index(self):
+        if self._index is None:
+            self.load()
+        return self._index
+
+    @traced
+    def rows(self, *args, **kwargs):
+        """
+        Row positions of the frame (and of every view) matching a FilterSpec
+        or its fields (op_type, year, gender, age_group).
+        """
+        return self.index.rows(FilterSpec.of(*args, **kwargs))
+
+    @property
+    def cube(self):
+        if self._cube is None:
+            self.load()
+        return self._cube
+
+    @traced
+    def aggregate(self, *args, **kwargs):
+        """Precomputed counts of the rows matching a filter (a CubeSlice)."""
+        return self.cube.query(FilterSpec.of(*args, **kwargs))
+
+    @property
+    def fingerprint(self):
+        """
+        Content hash of the workbook and the column schema, for caches of
+        derived output; None for in-memory datasets.
+        """
+        if self.path is None:
+            return None
+        if self._fingerprint is None:
+            sha = file_fingerprint(self.path)["sha256"]
+            self._fingerprint = f"{sha[:16]}-{schema.schema_key()}"
+        return self._fingerprint
+
+    def page_columns(self, page):
+        names = [spec.name for spec in schema.page_columns(page)]
+        names += DERIVED_COLUMNS['shared'] + DERIVED_COLUMNS.get(page, [])
+        return [name for name in names if name in self.frame.columns]
+
+    @traced
+    def view(self, page):
+        """Columns of one page; with copy-on-write no data is copied."""
+        return self.frame[self.page_columns(page)]
+
+
+dataset = Dataset()
+
+
+def load_preop_data():
+    """
+    Vrátí sloupce pro Preoperative stránku včetně předpočítaných skóre
+    (bolest, omezení, estetický diskomfort).
+    """
+    return dataset.view('preop')
+
+
+def load_oper_data():
+    return dataset.view('oper')
+
+
 def load_discharge_data():
-    df = df_all.copy()
-    df = df.rename(columns={
-        'Gender of the patient': 'Gender',
-        'Age of patient at day of operation': 'Age',
-        'Please choose the indication for the abdominal wall repair': 'Operation_Type',
-        'Where there intrahospital  complications ?': 'Intra_Complications',
-        'Please enter the type of intrahospital complications::Bleeding complications': 'Comp_Bleeding',
-        'Please enter the type of intrahospital complications::Surgical site infection (SSI)': 'Comp_SSI',
-        'Please enter the type of intrahospital complications::Mesh infection': 'Comp_Mesh_Infection',
-        'Please enter the type of intrahospital complications::Hematoma': 'Comp_Hematoma',
-        'Please enter the type of intrahospital complications::Prolonged ileus or obstruction': 'Comp_Prolonged_Ileus',
-        'Please enter the type of intrahospital complications::Urinary retention': 'Comp_Urinary_Retention',
-        'Please enter the type of intrahospital complications::General complications': 'Comp_General',
-    })
-    for col in ['Comp_Bleeding', 'Comp_SSI', 'Comp_Mesh_Infection', 'Comp_Hematoma', 'Comp_Prolonged_Ileus', 'Comp_Urinary_Retention', 'Comp_General']:
-        df[col] = df[col].fillna(0).astype(int)
-
-    op_map = {
-        'Groin Hernia Repair':        'GHR',
-        'Parastomal Hernia Repair':    'PHR',
-        'Primary Ventral Hernia Repair': 'PVHR',
-        'Incisional Ventral Hernia Repair': 'IVHR'
-    }
-    df['Operation_Type'] = df_all['Please choose the indication for the abdominal wall repair']\
-        .map(op_map)
-    return df
+    return dataset.view('discharge')
 
 
 def load_followup_data():
-    df = df_all.copy()
-    df = df.rename(columns={
-        'Gender of the patient': 'Gender',
-        'Age of patient at day of operation': 'Age',
-        'Where there  complications at Follow Up ?': 'Followup_Complications',
-        'Please enter the type of complications at Follow Up::Seroma': 'FU_Seroma',
-        'Please enter the type of complications at Follow Up::Hematoma': 'FU_Hematoma',
-        'Please enter the type of complications at Follow Up::Pain': 'FU_Pain',
-        'Please enter the type of complications at Follow Up::Surgical site infection (SSI)': 'FU_SSI',
-        'Please enter the type of complications at Follow Up::Mesh infection': 'FU_Mesh_Infection',
-        'Please enter the type of complications at Follow Up::Other': 'FU_Other',
-    })
-    for col in ['FU_Seroma', 'FU_Hematoma', 'FU_Pain', 'FU_SSI', 'FU_Mesh_Infection', 'FU_Other']:
-        df[col] = df[col].fillna(0).astype(int)
-    return df
+    return dataset.view('followup')
@@ -0,0 +1,153 @@
+# filters.py
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from schema import AGE_GROUPS
+
+DIMENSIONS = ('Operation_Type', 'Year', 'Gender', 'Age')
+ANY = None
+
+# choices offered by the year page and the pages' filter combos
+YEAR_OPTIONS = ["2021-2025", "2021", "2022", "2023", "2024", "2025"]
+GENDER_OPTIONS = ["All", "Male", "Female"]
+AGE_OPTIONS = ["All"] + AGE_GROUPS
+
+
+def parse_year_selection(year):
+    """
+    "2021-2025" -> (2021, ..., 2025), "2023" -> (2023,). None or an
+    unparsable value means no year filter and returns ANY.
+    """
+    if year is None:
+        return ANY
+    try:
+        if isinstance(year, str) and '-' in year:
+            start, end = map(int, year.split('-'))
+            return tuple(range(start, end + 1))
+        return (int(year),)
+    except (TypeError, ValueError):
+        return ANY
+
+
+def equals_mask(series, value):
+    """`series == value` as a numpy mask; categoricals compare integer codes."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        if value not in categories:
+            return np.zeros(len(series), dtype=bool)
+        return series.cat.codes.to_numpy() == categories.get_loc(value)
+    return (series == value).to_numpy(dtype=bool, na_value=False)
+
+
+class FilterSpec(NamedTuple):
+    """The filter shared by all data pages; "All"/None leaves a dimension open."""
+    op_type: Optional[str] = None
+    year: Optional[str] = None
+    gender: str = "All"
+    age_group: str = "All"
+
+    @classmethod
+    def of(cls, *args, **kwargs):
+        """A FilterSpec passed as the only argument, or one built from the fields."""
+        if len(args) == 1 and not kwargs and isinstance(args[0], cls):
+            return args[0]
+        return cls(*args, **kwargs)
+
+    def allowed(self):
+        """Allowed values per dimension (a tuple), ANY for open dimensions."""
+        gender = self.gender.lower() if self.gender else ""
+        return {
+            'Operation_Type': ANY if self.op_type in (None, "All") else (self.op_type,),
+            'Year': parse_year_selection(self.year),
+            'Gender': (gender,) if gender in ("male", "female") else ANY,
+            'Age': ANY if self.age_group in (None, "All") else (self.age_group,),
+        }
+
+    def active_columns(self):
+        """Filter columns the user restricted (Year is always applied)."""
+        return [col for col, active in (
+            ("Year", True),
+            ("Gender", self.gender.lower() in ("male", "female")),
+            ("Age", self.age_group != "All"),
+        ) if active]
+
+    def unavailable_columns(self, columns):
+        """Active filter columns missing from `columns`; those filters are skipped."""
+        return [col for col in self.active_columns() if col not in columns]
+
+
+class LRUCache(OrderedDict):
+    """Small least-recently-used mapping."""
+
+    def __init__(self, maxsize=128):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        self.move_to_end(key)
+        return self[key]
+
+    def put(self, key, value):
+        self[key] = value
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+        return value
+
+
+class FilterEngine:
+    """
+    Boolean masks over the rows of `frame` for a FilterSpec.
+
+    One mask is kept per dimension value (e.g. Year == 2023, Age == "55 - 64")
+    and built on first use; a filter is the AND of its dimensions' masks, and
+    composed masks are kept in an LRU keyed by the normalized filter. Changing
+    one combo therefore reuses the masks of the other dimensions.
+    """
+
+    def __init__(self, frame, maxsize=128):
+        self.n_rows = len(frame)
+        self.dimensions = [d for d in DIMENSIONS if d in frame.columns]
+        self._columns = {d: frame[d] for d in self.dimensions}
+        self._values = {}
+        self._composed = LRUCache(maxsize)
+        self.scans = 0
+
+    def key(self, spec):
+        allowed = spec.allowed()
+        return tuple(allowed[d] for d in self.dimensions)
+
+    def value_mask(self, dimension, value):
+        mask = self._values.get((dimension, value))
+        if mask is None:
+            self.scans += 1
+            mask = equals_mask(self._columns[dimension], value)
+            mask.setflags(write=False)
+            self._values[(dimension, value)] = mask
+        return mask
+
+    def mask(self, spec):
+        """Read-only mask of the rows matching `spec`."""
+        key = self.key(spec)
+        mask = self._composed.get(key)
+        if mask is not None:
+            return mask
+
+        mask = np.ones(self.n_rows, dtype=bool)
+        for dimension, allowed in zip(self.dimensions, key):
+            if allowed is ANY:
+                continue
+            selected = np.zeros(self.n_rows, dtype=bool)
+            for value in allowed:
+                selected |= self.value_mask(dimension, value)
+            mask &= selected
+        mask.setflags(write=False)
+        return self._composed.put(key, mask)
+
+    def positions(self, spec):
+        return np.flatnonzero(self.mask(spec))
@@ -1,10 +1,22 @@
 # main.py
 import sys
 import os
+import argparse
+import startup
+# before the heavy imports, so that --profile-startup times them too
+startup.begin(sys.argv[1:])
+from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import QTimer
+startup.phase("import data_loader (pandas)")
+import data_loader
+startup.phase("import chart_utils (matplotlib)")
+import chart_utils  # noqa: F401  (matplotlib and the plot style)
+startup.phase("import pages")
 from pages.main_window import MainWindow
 from splash_screen import SplashScreen
+from workers import DatasetLoader
+from chart_cache import ChartCache
+import tracing
 
 if getattr(sys, 'frozen', False):
     base_path = sys._MEIPASS
@@ -15,14 +27,36 @@ excel_path = os.path.join(base_path, "ExportedData.xlsx")
 style_path = os.path.join(base_path, "resources", "style.qss")
 
 
-def start_main_window():
-    window = MainWindow()
+def start_main_window(dataset):
+    global window
+    splash.set_stage("Building pages...")
+    QApplication.processEvents()
+    startup.phase("MainWindow")
+    try:
+        window = MainWindow(dataset, ChartCache.for_dataset(dataset))
+    except Exception as exc:
+        splash.show_error(f"{type(exc).__name__}: {exc}")
+        return
+    startup.phase("show, first paint")
+    if startup.enabled():
+        startup.finish_on_first_paint(window, then=QApplication.quit)
     window.show()
     splash.finish(window)
 
 
 def main():
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description="Hernia registry viewer")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="write a Chrome trace of the hot paths to FILE on exit "
+                             f"(same as {tracing.ENV_VAR}=FILE)")
+    startup.add_arguments(parser)
+    args, qt_args = parser.parse_known_args()
+    if args.trace:
+        tracing.start(args.trace)
+
+    startup.phase("QApplication")
+    app = QApplication(sys.argv[:1] + qt_args)
+    startup.phase("stylesheet")
 
     base = os.path.dirname(os.path.abspath(__file__))
     qss = os.path.join(base, style_path)
@@ -30,10 +64,23 @@ def main():
         app.setStyleSheet(f.read())
 
     global splash
+    startup.phase("splash")
     splash = SplashScreen()
     splash.show()
 
-    QTimer.singleShot(2000, start_main_window)
+    startup.phase("start loader")
+    loader = DatasetLoader(data_loader.dataset)
+    if startup.enabled():
+        # stamped on the loader thread as it gets there, not when the GUI does
+        loader.progress.connect(
+            lambda stage: startup.phase("load: " + stage.split("...")[0]),
+            Qt.DirectConnection)
+        loader.loaded.connect(lambda _: startup.phase("hand over to GUI"),
+                              Qt.DirectConnection)
+    loader.progress.connect(splash.set_stage)
+    loader.failed.connect(splash.show_error)
+    loader.loaded.connect(start_main_window)
+    loader.start()
 
     sys.exit(app.exec_())
 
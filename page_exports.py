@@ -0,0 +1,37 @@
+# page_exports.py
+from typing import Callable, NamedTuple
+
+from analytics import (
+    summarize_discharge,
+    summarize_followup,
+    summarize_operative,
+    summarize_preop
+)
+from pages import discharge_page, followup_page, operative_page, preop_page
+
+
+class PageExport(NamedTuple):
+    """How a data page's charts are produced without its widgets."""
+    title: str              # the data page's category name
+    summarize: Callable     # (dataset, spec, op_type) -> summary
+    figures: Callable       # (summary, op_type) -> (key, Figure) pairs
+    by_op_type: bool        # False: the page looks the same for every op type
+
+
+def _operative(dataset, spec, op_type):
+    return summarize_operative(dataset, spec, op_type=op_type)
+
+
+PAGES = {
+    "preop": PageExport("Preoperative data",
+                        lambda ds, spec, _: summarize_preop(ds, spec),
+                        preop_page.export_figures, False),
+    "operative": PageExport("Operative data", _operative,
+                            operative_page.export_figures, True),
+    "discharge": PageExport("Discharge data",
+                            lambda ds, spec, _: summarize_discharge(ds, spec),
+                            discharge_page.export_figures, False),
+    "followup": PageExport("Follow Up data",
+                           lambda ds, spec, _: summarize_followup(ds, spec),
+                           followup_page.export_figures, False),
+}
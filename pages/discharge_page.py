@@ -1,13 +1,17 @@
 # pages/discharge_page.py
+from functools import partial
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QScrollArea,
     QHBoxLayout, QComboBox
 )
 from PyQt5 import QtCore
 from ui_helpers import CollapsibleSection
-from chart_utils import make_bar_chart
+from chart_utils import FigureManager, bar_chart_figure, count_chart
 from table_utils import make_stats_table
-from ui_helpers import add_download_button
+from ui_helpers import BusyOverlay, add_download_button, add_filter_notes
+from workers import FilterScheduler, PageRenderer
+from filters import AGE_OPTIONS, GENDER_OPTIONS, FilterSpec
+from analytics import summarize_discharge
 
 
 class DischargePage(QWidget):
@@ -17,7 +21,11 @@ class DischargePage(QWidget):
         self.df = df
         self.selected_age_group = "All"
         self.selected_gender = "All"
+        self.expanded = set()
+        self.charts = FigureManager()
         self._build_ui()
+        self.renderer = PageRenderer(self, BusyOverlay(self))
+        self.scheduler = FilterScheduler(self.filter_key, self._refresh, parent=self)
 
     def _build_ui(self):
         root = QVBoxLayout(self)
@@ -43,7 +51,7 @@ class DischargePage(QWidget):
         filters_layout.addWidget(gender_label)
 
         self.gender_combo = QComboBox()
-        self.gender_combo.addItems(["All", "Male", "Female"])
+        self.gender_combo.addItems(GENDER_OPTIONS)
         self.gender_combo.currentTextChanged.connect(self._filter_gender)
         filters_layout.addWidget(self.gender_combo)
 
@@ -52,10 +60,7 @@ class DischargePage(QWidget):
         filters_layout.addWidget(age_label)
 
         self.age_combo = QComboBox()
-        self.age_combo.addItems([
-            "All", "<  25", "25 - 34", "35 - 44", "45 - 54",
-            "55 - 64", "65 - 74", ">  75"
-        ])
+        self.age_combo.addItems(AGE_OPTIONS)
         self.age_combo.currentTextChanged.connect(self._filter_age)
         filters_layout.addWidget(self.age_combo)
 
@@ -106,98 +111,77 @@ class DischargePage(QWidget):
 
     def _filter_gender(self, gender_text):
         self.selected_gender = gender_text
-        self.update_view()
+        self.scheduler.schedule()
 
     def _filter_age(self, age_group):
         self.selected_age_group = age_group
-        self.update_view()
+        self.scheduler.schedule()
+
+    def filter_key(self):
+        return (self.main.current_op_type, self.main.selected_year,
+                self.selected_gender, self.selected_age_group)
 
     def update_view(self):
+        self.scheduler.request()
+
+    def _refresh(self):
         if self.df is None or self.df.empty:
+            self._clear()
             lbl = QLabel("Error: data unavailable")
             lbl.setAlignment(QtCore.Qt.AlignCenter)
             self.vlay.addWidget(lbl)
             return
-        df = self.df.copy()
-
         ty = self.main.current_op_type or "All types"
         yr = self.main.selected_year or "All years"
 
-        if 'Year' in df.columns:
-            if isinstance(yr, str) and '-' in yr:
-                try:
-                    start, end = map(int, yr.split('-'))
-                    df = df[df['Year'].between(start, end)]
-                except:
-                    pass
-            else:
-                try:
-                    year = int(yr)
-                    df = df[df['Year'] == year]
-                except ValueError:
-                    pass
-        else:
-            warn_lbl = QLabel("Note: The ‘Year’ column is not available")
-            warn_lbl.setAlignment(QtCore.Qt.AlignCenter)
-            self.vlay.addWidget(warn_lbl)
-
-        if self.selected_gender.lower() in ["male", "female"]:
-            if 'Gender' in df.columns:
-                df = df[df['Gender'] == self.selected_gender.lower()]
-            else:
-                lbl = QLabel("Note: The ‘Gender’ column is missing")
-                lbl.setAlignment(QtCore.Qt.AlignCenter)
-                self.vlay.addWidget(lbl)
-
-        if self.selected_age_group != "All":
-            if "Age" in df.columns:
-                df = df[df["Age"] == self.selected_age_group]
-            else:
-                warn_lbl = QLabel("Note: The ‘Age’ column is not available.")
-                warn_lbl.setAlignment(QtCore.Qt.AlignCenter)
-                self.vlay.addWidget(warn_lbl)
-
-        self.header.setText(
-            f"Operation: {ty}   |   Year: {yr}   |   N = {len(df)}"
-        )
+        spec = FilterSpec(year=yr, gender=self.selected_gender,
+                          age_group=self.selected_age_group)
+        self.renderer.request(
+            partial(summarize_discharge, self.main.dataset, spec),
+            partial(self._render, spec, ty, yr),
+            self._show_error)
 
+    def _clear(self):
+        self.charts.release()
         for i in reversed(range(self.vlay.count())):
             w = self.vlay.itemAt(i).widget()
             if w:
                 w.setParent(None)
+                w.deleteLater()
+
+    def _show_error(self, message):
+        # let the same filter try again
+        self.scheduler.invalidate()
+        self._clear()
+        lbl = QLabel(f"Error: {message}")
+        lbl.setAlignment(QtCore.Qt.AlignCenter)
+        self.vlay.addWidget(lbl)
+
+    def _render(self, spec, ty, yr, summary):
+        self._clear()
+        add_filter_notes(self.vlay, spec, self.df.columns)
 
-        if df.empty:
+        self.header.setText(
+            f"Operation: {ty}   |   Year: {yr}   |   N = {summary.n}"
+        )
+
+        if summary.n == 0:
             empty_lbl = QLabel("No discharge data for selected filters.")
             empty_lbl.setAlignment(QtCore.Qt.AlignCenter)
             self.vlay.addWidget(empty_lbl)
             return
 
-        if 'Intra_Complications' not in df.columns:
+        if summary.occurrences is None:
             err_lbl = QLabel(
                 "Error: column ‘Intra_Complications’ is not available.")
             err_lbl.setAlignment(QtCore.Qt.AlignCenter)
             self.vlay.addWidget(err_lbl)
             return
-        occ_counts = df['Intra_Complications'].value_counts()
-        sec1 = CollapsibleSection('Occurrence of Intrahospital Complications')
-        if occ_counts.empty:
-            msg = QLabel('No data for selected filters.')
-            msg.setAlignment(QtCore.Qt.AlignCenter)
-            sec1.add_widget(msg)
-        else:
-            chart1 = make_bar_chart(
-                occ_counts,
-                'Intrahospital Complications', '', 'Count'
-            )
-            sec1.add_widget(add_download_button(chart1, "Download Bar Chart"))
-        self.vlay.addWidget(sec1)
-
-        cols = [
-            'Comp_Bleeding', 'Comp_SSI', 'Comp_Mesh_Infection',
-            'Comp_Hematoma', 'Comp_Prolonged_Ileus',
-            'Comp_Urinary_Retention', 'Comp_General'
-        ]
-        missing_cols = [c for c in cols if c not in df.columns]
+        self._section('Occurrence of Intrahospital Complications', partial(
+            self._chart, 'occurrences', summary.occurrences,
+            'No data for selected filters.'))
+
+        missing_cols = summary.missing_columns
         if missing_cols:
             err_lbl = QLabel(
                 f"Error: missing columns: {', '.join(missing_cols)}.")
@@ -205,57 +189,46 @@ class DischargePage(QWidget):
             self.vlay.addWidget(err_lbl)
             return
 
-        counts = df[cols].sum().fillna(0).astype(int)
-        counts = counts[counts > 0]
-        label_map = {
-            'Comp_Bleeding': 'Bleeding',
-            'Comp_SSI': 'SSI',
-            'Comp_Mesh_Infection': 'Mesh Infection',
-            'Comp_Hematoma': 'Hematoma',
-            'Comp_Prolonged_Ileus': 'Prolonged Ileus',
-            'Comp_Urinary_Retention': 'Urinary Retention',
-            'Comp_General': 'General'
-        }
-        counts = counts.rename(index=label_map)
-
-        sec2 = CollapsibleSection('Type of Intrahospital Complications')
-        if counts.empty:
-            msg2 = QLabel('No complication types for selected filters.')
-            msg2.setAlignment(QtCore.Qt.AlignCenter)
-            sec2.add_widget(msg2)
-        else:
-            chart2 = make_bar_chart(
-                counts,
-                title='Complication Types', xlabel='', ylabel='Count'
-            )
-            fg, ax = chart2.figure, chart2.figure.axes[0]
-            for lbl in ax.get_xticklabels():
-                lbl.set_rotation(45)
-                lbl.set_ha('right')
-            chart2.figure.tight_layout()
-            sec2.add_widget(add_download_button(chart2, "Download Bar Chart"))
-        self.vlay.addWidget(sec2)
-
-        n_total = len(df)
-        has = df['Intra_Complications'].dropna().astype(bool)
-        n_true = has.sum()
-
-        stats = {
-            'Total patients': n_total,
-            'With complications': int(n_true),
-            'Without complications': n_total - int(n_true),
-            '% with complications': f"{n_true/n_total*100:.1f}%" if n_total > 0 else "N/A"
-        }
-
-        if 'Gender' in df.columns:
-            gender_counts = df['Gender'].value_counts()
-            stats['Male %'] = f"{gender_counts.get('male', 0)/n_total*100:.1f}%" if n_total > 0 else "N/A"
-            stats['Female %'] = f"{gender_counts.get('female', 0)/n_total*100:.1f}%" if n_total > 0 else "N/A"
-
-        sec3 = CollapsibleSection('Summary Statistics')
-        wrapper = QWidget()
-        wrapper_lay = QVBoxLayout(wrapper)
-        wrapper_lay.setContentsMargins(0, 10, 0, 0)
-        wrapper_lay.addWidget(make_stats_table(stats))
-        sec3.add_widget(wrapper)
-        self.vlay.addWidget(sec3)
+        self._section('Type of Intrahospital Complications', partial(
+            self._chart, 'complication_types', summary.complication_types,
+            'No complication types for selected filters.'))
+
+        def stats_table():
+            wrapper = QWidget()
+            wrapper_lay = QVBoxLayout(wrapper)
+            wrapper_lay.setContentsMargins(0, 10, 0, 0)
+            wrapper_lay.addWidget(make_stats_table(summary.stats))
+            return wrapper
+        self._section('Summary Statistics', stats_table)
+
+    def _section(self, title, factory):
+        self.vlay.addWidget(CollapsibleSection(
+            title, factory=factory, expanded=self.expanded))
+
+    def _chart(self, key, data, empty_text):
+        if data.empty:
+            msg = QLabel(empty_text)
+            msg.setAlignment(QtCore.Qt.AlignCenter)
+            return msg
+        chart = self.charts.chart(key, lambda: count_chart(**BAR_CHARTS[key]))
+        return add_download_button(chart.update(data).widget(), "Download Bar Chart")
+
+
+# count charts kept by the page and updated in place
+BAR_CHARTS = {
+    'occurrences': dict(title='Intrahospital Complications', xlabel='', ylabel='Count'),
+    'complication_types': dict(title='Complication Types', xlabel='', ylabel='Count',
+                               rotate_labels=True),
+}
+
+
+def export_figures(summary, op_type=None):
+    """(key, Figure) for every chart the page shows for `summary`, without widgets."""
+    if not summary.n or summary.occurrences is None:
+        return
+    for key in BAR_CHARTS:
+        if key == 'complication_types' and summary.missing_columns:
+            return
+        data = getattr(summary, key)
+        if not data.empty:
+            yield key, bar_chart_figure(data, **BAR_CHARTS[key])
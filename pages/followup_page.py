@@ -1,13 +1,17 @@
 # pages/followup_page.py
+from functools import partial
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QScrollArea,
     QHBoxLayout, QComboBox
 )
 from PyQt5 import QtCore
 from ui_helpers import CollapsibleSection
-from chart_utils import make_bar_chart
+from chart_utils import FigureManager, bar_chart_figure, count_chart
 from table_utils import make_stats_table
-from ui_helpers import add_download_button
+from ui_helpers import BusyOverlay, add_download_button, add_filter_notes
+from workers import FilterScheduler, PageRenderer
+from filters import AGE_OPTIONS, GENDER_OPTIONS, FilterSpec
+from analytics import summarize_followup
 
 
 class FollowupPage(QWidget):
@@ -17,7 +21,11 @@ class FollowupPage(QWidget):
         self.df = df
         self.selected_age_group = "All"
         self.selected_gender = "All"
+        self.expanded = set()
+        self.charts = FigureManager()
         self._build_ui()
+        self.renderer = PageRenderer(self, BusyOverlay(self))
+        self.scheduler = FilterScheduler(self.filter_key, self._refresh, parent=self)
 
     def _build_ui(self):
         root = QVBoxLayout(self)
@@ -43,7 +51,7 @@ class FollowupPage(QWidget):
         filters_layout.addWidget(gender_label)
 
         self.gender_combo = QComboBox()
-        self.gender_combo.addItems(["All", "Male", "Female"])
+        self.gender_combo.addItems(GENDER_OPTIONS)
         self.gender_combo.currentTextChanged.connect(self._filter_gender)
         filters_layout.addWidget(self.gender_combo)
 
@@ -52,10 +60,7 @@ class FollowupPage(QWidget):
         filters_layout.addWidget(age_label)
 
         self.age_combo = QComboBox()
-        self.age_combo.addItems([
-            "All", "<  25", "25 - 34", "35 - 44", "45 - 54",
-            "55 - 64", "65 - 74", ">  75"
-        ])
+        self.age_combo.addItems(AGE_OPTIONS)
         self.age_combo.currentTextChanged.connect(self._filter_age)
         filters_layout.addWidget(self.age_combo)
 
@@ -106,154 +111,123 @@ class FollowupPage(QWidget):
 
     def _filter_gender(self, gender_text):
         self.selected_gender = gender_text
-        self.update_view()
+        self.scheduler.schedule()
 
     def _filter_age(self, age_group):
         self.selected_age_group = age_group
-        self.update_view()
+        self.scheduler.schedule()
+
+    def filter_key(self):
+        return (self.main.current_op_type, self.main.selected_year,
+                self.selected_gender, self.selected_age_group)
 
     def update_view(self):
+        self.scheduler.request()
+
+    def _refresh(self):
         if self.df is None or self.df.empty:
+            self._clear()
             lbl = QLabel("Error: data unavailable.")
             lbl.setAlignment(QtCore.Qt.AlignCenter)
             self.vlay.addWidget(lbl)
             return
-        df = self.df.copy()
-
         ty = self.main.current_op_type or "All types"
         yr = self.main.selected_year or "All years"
 
-        if 'Year' in df.columns:
-            if isinstance(yr, str) and '-' in yr:
-                try:
-                    start, end = map(int, yr.split('-'))
-                    df = df[df['Year'].between(start, end)]
-                except:
-                    pass
-            else:
-                try:
-                    year = int(yr)
-                    df = df[df['Year'] == year]
-                except ValueError:
-                    pass
-        else:
-            warn_lbl = QLabel("Note: The ‘Year’ column is not available")
-            warn_lbl.setAlignment(QtCore.Qt.AlignCenter)
-            self.vlay.addWidget(warn_lbl)
-
-        if self.selected_gender.lower() in ["male", "female"]:
-            if 'Gender' in df.columns:
-                df = df[df['Gender'] == self.selected_gender.lower()]
-            else:
-                warn_lbl = QLabel("Note: The ‘Gender’ column is not available")
-                warn_lbl.setAlignment(QtCore.Qt.AlignCenter)
-                self.vlay.addWidget(warn_lbl)
-
-        if self.selected_age_group != "All":
-            if "Age" in df.columns:
-                df = df[df["Age"] == self.selected_age_group]
-            else:
-                warn_lbl = QLabel("Note: The ‘Age’ column is not available")
-                warn_lbl.setAlignment(QtCore.Qt.AlignCenter)
-                self.vlay.addWidget(warn_lbl)
-
-        self.header.setText(
-            f"Operation: {ty}   |   Year: {yr}   |   N = {len(df)}"
-        )
+        spec = FilterSpec(year=yr, gender=self.selected_gender,
+                          age_group=self.selected_age_group)
+        self.renderer.request(
+            partial(summarize_followup, self.main.dataset, spec),
+            partial(self._render, spec, ty, yr),
+            self._show_error)
 
+    def _clear(self):
+        self.charts.release()
         for i in reversed(range(self.vlay.count())):
             w = self.vlay.itemAt(i).widget()
             if w:
                 w.setParent(None)
+                w.deleteLater()
+
+    def _show_error(self, message):
+        # let the same filter try again
+        self.scheduler.invalidate()
+        self._clear()
+        lbl = QLabel(f"Error: {message}")
+        lbl.setAlignment(QtCore.Qt.AlignCenter)
+        self.vlay.addWidget(lbl)
 
-        if df.empty:
+    def _render(self, spec, ty, yr, summary):
+        self._clear()
+        add_filter_notes(self.vlay, spec, self.df.columns)
+
+        self.header.setText(
+            f"Operation: {ty}   |   Year: {yr}   |   N = {summary.n}"
+        )
+
+        if summary.n == 0:
             empty_lbl = QLabel("No data for the selected filter")
             empty_lbl.setAlignment(QtCore.Qt.AlignCenter)
             self.vlay.addWidget(empty_lbl)
             return
 
-        if 'Followup_Complications' not in df.columns:
+        if summary.occurrences is None:
             err_lbl = QLabel("Error: column 'Followup_Complications' is missing.")
             err_lbl.setAlignment(QtCore.Qt.AlignCenter)
             self.vlay.addWidget(err_lbl)
             return
 
-        occ_counts = df['Followup_Complications'].value_counts()
-        sec1 = CollapsibleSection("Occurrence of Complications")
-        chart1 = make_bar_chart(
-            occ_counts,
-            "Complications at Follow-up",
-            "",
-            "Count"
-        )
-        sec1.add_widget(add_download_button(chart1, "Download Bar Chart"))
-        self.vlay.addWidget(sec1)
-
-        cols = [
-            'FU_Seroma', 'FU_Hematoma', 'FU_Pain',
-            'FU_SSI', 'FU_Mesh_Infection', 'FU_Other'
-        ]
-        missing_cols = [col for col in cols if col not in df.columns]
+        self._section("Occurrence of Complications", partial(
+            self._chart, "occurrences", summary.occurrences,
+            "No data for the selected filter"))
+
+        missing_cols = summary.missing_columns
         if missing_cols:
             warn_lbl = QLabel(f"Chyba: Chybí sloupce: {', '.join(missing_cols)}.")
             warn_lbl.setAlignment(QtCore.Qt.AlignCenter)
             self.vlay.addWidget(warn_lbl)
             return
 
-        counts = df[cols].sum().fillna(0).astype(int)
-        label_map = {
-            'FU_Seroma': 'Seroma',
-            'FU_Hematoma': 'Hematoma',
-            'FU_Pain': 'Pain',
-            'FU_SSI': 'SSI',
-            'FU_Mesh_Infection': 'Mesh Infection',
-            'FU_Other': 'Other'
-        }
-        counts = counts.rename(index=label_map)
-        counts = counts[counts > 0]
-
-        sec2 = CollapsibleSection("Type of Complications")
-        if counts.empty:
-            empty_lbl = QLabel("No complications for selected filters.")
-            empty_lbl.setAlignment(QtCore.Qt.AlignCenter)
-            sec2.add_widget(empty_lbl)
-        else:
-            chart2 = make_bar_chart(
-            counts,
-            title="Complication Types",
-            xlabel="Type",
-            ylabel="Count"
-            )
-            fig = chart2.figure
-            ax = fig.axes[0]
-            for label in ax.get_xticklabels():
-                label.set_rotation(45)
-                label.set_ha('right')
-
-            fig.tight_layout()
-            sec2.add_widget(add_download_button(chart2, "Download Bar Chart"))
-
-        self.vlay.addWidget(sec2)
-
-        n_total = len(df)
-        n_comp = 0
-
-        if "Followup_Complications" in df.columns:
-            comp_col = df["Followup_Complications"].dropna()
-            n_comp = int(comp_col.astype(bool).sum())
-
-        stats = {
-            'Total patients': n_total,
-            'With complications': n_comp,
-            'Without complications': n_total - n_comp if n_total >= n_comp else "N/A",
-            '% with complications': f"{n_comp/n_total*100:.1f}%" if n_total > 0 else "N/A"
-        }
-
-        sec3 = CollapsibleSection("Summary Statistics")
-        wrapper = QWidget()
-        wrapper_lay = QVBoxLayout(wrapper)
-        wrapper_lay.setContentsMargins(0, 10, 0, 0)
-        wrapper_lay.addWidget(make_stats_table(stats))
-        sec3.add_widget(wrapper)
-        self.vlay.addWidget(sec3)
-
+        self._section("Type of Complications", partial(
+            self._chart, "complication_types", summary.complication_types,
+            "No complications for selected filters."))
+
+        def stats_table():
+            wrapper = QWidget()
+            wrapper_lay = QVBoxLayout(wrapper)
+            wrapper_lay.setContentsMargins(0, 10, 0, 0)
+            wrapper_lay.addWidget(make_stats_table(summary.stats))
+            return wrapper
+        self._section("Summary Statistics", stats_table)
+
+    def _section(self, title, factory):
+        self.vlay.addWidget(CollapsibleSection(
+            title, factory=factory, expanded=self.expanded))
+
+    def _chart(self, key, data, empty_text):
+        if data.empty:
+            msg = QLabel(empty_text)
+            msg.setAlignment(QtCore.Qt.AlignCenter)
+            return msg
+        chart = self.charts.chart(key, lambda: count_chart(**BAR_CHARTS[key]))
+        return add_download_button(chart.update(data).widget(), "Download Bar Chart")
+
+
+# count charts kept by the page and updated in place
+BAR_CHARTS = {
+    "occurrences": dict(title="Complications at Follow-up", xlabel="", ylabel="Count"),
+    "complication_types": dict(title="Complication Types", xlabel="Type", ylabel="Count",
+                               rotate_labels=True),
+}
+
+
+def export_figures(summary, op_type=None):
+    """(key, Figure) for every chart the page shows for `summary`, without widgets."""
+    if not summary.n or summary.occurrences is None:
+        return
+    for key in BAR_CHARTS:
+        if key == "complication_types" and summary.missing_columns:
+            return
+        data = getattr(summary, key)
+        if not data.empty:
+            yield key, bar_chart_figure(data, **BAR_CHARTS[key])
@@ -2,12 +2,13 @@
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QStackedWidget, QSpacerItem, QSizePolicy,
-    QMessageBox, QFrame
-)
-from data_loader import (
-    load_oper_data, load_preop_data,
-    load_discharge_data, load_followup_data
+    QMessageBox, QFrame, QAction, QFileDialog, QProgressDialog
 )
+import data_loader
+import startup
+from chart_cache import ChartCache
+from report import Report, report_figures
+from workers import ReportWriter
 from pages.ops_page import OpsPage
 from pages.year_page import YearPage
 from pages.data_page import DataPage
@@ -18,28 +19,41 @@ from pages.followup_page import FollowupPage
 
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, dataset=None, chart_cache=None):
         super().__init__()
         self.setWindowTitle("Biomedical Data Analyzer")
         self.resize(1000, 800)
 
-        self.oper_df = load_oper_data()
-        self.preop_df = load_preop_data()
-        self.discharge_df = load_discharge_data()
-        self.followup_df = load_followup_data()
+        self.dataset = dataset or data_loader.dataset
+        self.oper_df = self.dataset.view('oper')
+        self.preop_df = self.dataset.view('preop')
+        self.discharge_df = self.dataset.view('discharge')
+        self.followup_df = self.dataset.view('followup')
+        # memory only unless the caller enables the disk tier
+        if chart_cache is None:
+            chart_cache = ChartCache(fingerprint=self.dataset.fingerprint)
+        self.chart_cache = chart_cache
 
         self.current_op_type = None
         self.selected_year = None
 
         self._history = []
 
+        startup.phase("MainWindow: OpsPage")
         self.ops_page = OpsPage(self)
+        startup.phase("MainWindow: YearPage")
         self.year_page = YearPage(self)
+        startup.phase("MainWindow: DataPage")
         self.data_page = DataPage(self)
+        startup.phase("MainWindow: OperativePage")
         self.oper_page = OperativePage(self, self.oper_df)
+        startup.phase("MainWindow: PreopPage")
         self.preop_page = PreopPage(self, self.preop_df)
+        startup.phase("MainWindow: DischargePage")
         self.discharge_page = DischargePage(self, self.discharge_df)
+        startup.phase("MainWindow: FollowupPage")
         self.followup_page = FollowupPage(self, self.followup_df)
+        startup.phase("MainWindow: navigation, menus")
 
         self.nav_frame = QFrame()
         self.nav_frame.setObjectName("navBar")
@@ -84,6 +98,12 @@ class MainWindow(QMainWindow):
         self.stack.setCurrentWidget(self.ops_page)
         self.update_nav_buttons()
 
+        file_menu = self.menuBar().addMenu("File")
+        self.report_action = QAction("Export PDF Report...", self)
+        self.report_action.triggered.connect(self.export_report)
+        file_menu.addAction(self.report_action)
+        self.report_writer = None
+
         self.setStyleSheet("""
             /* Navigation bar background */
             QFrame#navBar {
@@ -128,6 +148,55 @@ class MainWindow(QMainWindow):
         self.btn_year.setVisible(True)
         self.btn_year.setEnabled(bool(self.current_op_type))
 
+    def export_report(self):
+        """PDF report of the selected operation type and year, written in the background."""
+        if not (self.current_op_type and self.selected_year):
+            QMessageBox.warning(
+                self,
+                "Nothing selected",
+                "Please select an operation type and a year first."
+            )
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save Report",
+            f"{self.current_op_type}_{self.selected_year}.pdf",
+            "PDF Files (*.pdf)"
+        )
+        if not path:
+            return
+
+        report = Report(path, report_figures(
+            self.dataset, self.current_op_type, self.selected_year))
+        writer = self.report_writer = ReportWriter(report, self)
+        dialog = QProgressDialog("Writing report...", "Cancel", 0, 0, self)
+        dialog.setWindowTitle("PDF Report")
+        dialog.setMinimumDuration(0)
+        dialog.canceled.connect(writer.cancel)
+        writer.progress.connect(
+            lambda pages, name: dialog.setLabelText(f"Page {pages}: {name}"))
+
+        def done():
+            dialog.reset()
+            self.report_action.setEnabled(True)
+            self.report_writer = None
+            writer.deleteLater()
+
+        def finished(file):
+            done()
+            QMessageBox.information(
+                self, "PDF Report", f"Saved {report.pages} pages to {file}")
+
+        def failed(message):
+            done()
+            QMessageBox.warning(self, "PDF Report", f"Report failed: {message}")
+
+        writer.finished.connect(finished)
+        writer.failed.connect(failed)
+        writer.cancelled.connect(done)
+        self.report_action.setEnabled(False)
+        writer.start()
+
     def go_back(self):
         if self._history:
             prev = self._history.pop()
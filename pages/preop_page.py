@@ -1,28 +1,37 @@
 # pages/preop_page.py
+from functools import partial
 import numpy as np
-import pandas as pd
-from matplotlib.figure import Figure
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QScrollArea,
     QComboBox, QHBoxLayout, QSizePolicy
 )
-import matplotlib.pyplot as plt
 from PyQt5 import QtCore
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from ui_helpers import CollapsibleSection
-from chart_utils import make_bar_chart, make_histogram
+from chart_utils import (
+    FigureManager, HistogramChart, LazyFigures, bar_chart_figure, count_chart,
+    grouped_bar_figure, new_figure
+)
 from table_utils import make_stats_table
-from ui_helpers import add_download_button
+from ui_helpers import BusyOverlay, add_download_button, add_filter_notes
+from workers import FilterScheduler, PageRenderer
+from filters import AGE_OPTIONS, GENDER_OPTIONS, FilterSpec
+from analytics import summarize_preop
+from tracing import span, traced
 
 
 class PreopPage(QWidget):
     def __init__(self, main_win, df):
         super().__init__()
         self.main = main_win
-        self.df_master = df.copy()
+        self.df_master = df
         self.selected_gender = "All"
         self.selected_age_group = "All"
+        self.expanded = set()
+        self.charts = FigureManager(main_win.chart_cache)
+        self.shown_filters = None
         self._build_ui()
+        self.renderer = PageRenderer(self, BusyOverlay(self))
+        self.scheduler = FilterScheduler(self.filter_key, self._refresh, parent=self)
 
     def _build_ui(self):
         root = QVBoxLayout(self)
@@ -48,7 +57,7 @@ class PreopPage(QWidget):
         filters_layout.addWidget(gender_label)
 
         self.gender_combo = QComboBox()
-        self.gender_combo.addItems(["All", "Male", "Female"])
+        self.gender_combo.addItems(GENDER_OPTIONS)
         self.gender_combo.currentTextChanged.connect(self._filter_gender)
         filters_layout.addWidget(self.gender_combo)
 
@@ -57,10 +66,7 @@ class PreopPage(QWidget):
         filters_layout.addWidget(age_label)
 
         self.age_combo = QComboBox()
-        self.age_combo.addItems([
-            "All", "<  25", "25 - 34", "35 - 44", "45 - 54",
-            "55 - 64", "65 - 74", ">  75"
-        ])
+        self.age_combo.addItems(AGE_OPTIONS)
         self.age_combo.currentTextChanged.connect(self._filter_age)
         filters_layout.addWidget(self.age_combo)
 
@@ -111,19 +117,22 @@ class PreopPage(QWidget):
 
     def _filter_gender(self, gender_text):
         self.selected_gender = gender_text
-        self.update_view()
+        self.scheduler.schedule()
 
     def _filter_age(self, age_group):
         self.selected_age_group = age_group
-        self.update_view()
+        self.scheduler.schedule()
+
+    def filter_key(self):
+        return (self.main.current_op_type, self.main.selected_year,
+                self.selected_gender, self.selected_age_group)
 
     def update_view(self):
-        for i in reversed(range(self.vlay.count())):
-            w = self.vlay.itemAt(i).widget()
-            if w:
-                w.setParent(None)
+        self.scheduler.request()
 
+    def _refresh(self):
         if self.df_master is None or self.df_master.empty:
+            self._clear()
             lbl = QLabel("Error: data not available")
             lbl.setAlignment(QtCore.Qt.AlignCenter)
             self.vlay.addWidget(lbl)
@@ -131,431 +140,256 @@ class PreopPage(QWidget):
 
         ty = self.main.current_op_type
         yr_sel = self.main.selected_year
-        df = self.df_master.copy()
-
-        if 'Year' in df.columns:
-            if isinstance(yr_sel, str) and '-' in yr_sel:
-                try:
-                    start, end = map(int, yr_sel.split('-'))
-                    df = df[df['Year'].between(start, end)]
-                except:
-                    pass
-            else:
-                try:
-                    df = df[df['Year'] == int(yr_sel)]
-                except:
-                    pass
-        else:
-            lbl = QLabel("Note: The 'Year' column is not available")
-            lbl.setAlignment(QtCore.Qt.AlignCenter)
-            self.vlay.addWidget(lbl)
-
-        if self.selected_gender.lower() in ["male", "female"]:
-            if 'Gender' in df.columns:
-                df = df[df['Gender'] == self.selected_gender.lower()]
-            else:
-                lbl = QLabel("Note: The 'Gender' column is not available")
-                lbl.setAlignment(QtCore.Qt.AlignCenter)
-                self.vlay.addWidget(lbl)
-
-        if self.selected_age_group != "All":
-            if "Age" in df.columns:
-                df = df[df["Age"] == self.selected_age_group]
-            else:
-                lbl = QLabel("Note: The 'Age' column is not available")
-                lbl.setAlignment(QtCore.Qt.AlignCenter)
-                self.vlay.addWidget(lbl)
+        spec = FilterSpec(year=yr_sel, gender=self.selected_gender,
+                          age_group=self.selected_age_group)
+        # shown as cached images, no figure needed up front
+        cached = frozenset(key for keys in SECTION_FIGURES.values() for key in keys
+                           if self.charts.is_cached(f"preop/{key}", spec))
+        self.renderer.request(
+            partial(build_preop, self.main.dataset, spec,
+                    frozenset(self.expanded), cached),
+            partial(self._render, spec, ty, yr_sel),
+            self._show_error)
+
+    def _clear(self):
+        self.charts.release()
+        for i in reversed(range(self.vlay.count())):
+            w = self.vlay.itemAt(i).widget()
+            if w:
+                w.setParent(None)
+                w.deleteLater()
+
+    def _show_error(self, message):
+        # let the same filter try again
+        self.scheduler.invalidate()
+        self._clear()
+        lbl = QLabel(f"Error: {message}")
+        lbl.setAlignment(QtCore.Qt.AlignCenter)
+        self.vlay.addWidget(lbl)
+
+    def _no_data(self, text):
+        lbl = QLabel(text)
+        lbl.setAlignment(QtCore.Qt.AlignCenter)
+        self.vlay.addWidget(lbl)
+
+    def _render(self, spec, ty, yr_sel, result):
+        summary, figures = result
+        self._clear()
+        # cache key of the charts built for these sections; the summary
+        # does not depend on the operation type, so neither do the charts
+        self.shown_filters = spec
+        add_filter_notes(self.vlay, spec, self.df_master.columns)
 
         self.header.setText(
-            f"Operation: {ty}   |   Year: {yr_sel}   |   N = {len(df)}"
+            f"Operation: {ty}   |   Year: {yr_sel}   |   N = {summary.n}"
         )
 
-        if df.empty:
-            lbl = QLabel("No data for the selected filter")
-            lbl.setAlignment(QtCore.Qt.AlignCenter)
-            self.vlay.addWidget(lbl)
+        if summary.n == 0:
+            self._no_data("No data for the selected filter")
             return
 
-        sec1 = CollapsibleSection("Number of Men and Women")
-        if "Gender" not in df.columns or df["Gender"].dropna().empty:
-            lbl = QLabel("No Data: Gender statistics")
-            lbl.setAlignment(QtCore.Qt.AlignCenter)
-            self.vlay.addWidget(lbl)
-        else:
-            counts_gender = df["Gender"].value_counts()
-            counts_gender.index = counts_gender.index.str.capitalize()
-
-            chart = make_bar_chart(
-                counts_gender,
-                "Statistics of the patients according to gender",
-                "",
-                "Number"
-            )
-            sec1.add_widget(add_download_button(chart, "Download Bar Chart"))
-            self.vlay.addWidget(sec1)
-
-
-        sec2 = CollapsibleSection("Distribution of Patients According to the Age")
-        if "Age" not in df.columns or df["Age"].dropna().empty:
-            lbl = QLabel("No Data: Age Distribution")
-            lbl.setAlignment(QtCore.Qt.AlignCenter)
-            self.vlay.addWidget(lbl)
-        else:
-            raw_counts = df["Age"].value_counts()
+        def bar_chart(key, data):
+            return lambda: add_download_button(
+                self._bar_chart(key, data), "Download Bar Chart")
 
-            middle = [lbl for lbl in raw_counts.index if lbl not in ("<  25", ">  75")]
-            middle_sorted = sorted(middle)
-            ordered = ["<  25"] + middle_sorted + [">  75"]
+        if summary.gender is None:
+            self._no_data("No Data: Gender statistics")
+        else:
+            self._section(SECTION_TITLES["gender"],
+                          bar_chart("gender", summary.gender))
 
-            age_counts = raw_counts.reindex(ordered, fill_value=0)
 
-            chart = make_bar_chart(
-                age_counts,
-                title="Age of patients",
-                xlabel="",
-                ylabel="Number of the patients"
-            )
-            sec2.add_widget(add_download_button(chart, "Download Bar Chart"))
-            self.vlay.addWidget(sec2)
+        if summary.age is None:
+            self._no_data("No Data: Age Distribution")
+        else:
+            self._section(SECTION_TITLES["age"], bar_chart("age", summary.age))
 
 
-        sec3 = CollapsibleSection("Distribution of Patients According to the BMI")
-        if "BMI" not in df.columns or df["BMI"].dropna().empty:
-            lbl = QLabel("No Data: BMI Distribution")
-            lbl.setAlignment(QtCore.Qt.AlignCenter)
-            self.vlay.addWidget(lbl)
+        if summary.bmi.empty:
+            self._no_data("No Data: BMI Distribution")
         else:
-            bmi = df["BMI"].dropna()
-            bmi_min = int(np.floor(bmi.min()))
-            bmi_max = int(np.ceil(bmi.max()))
-            bins = np.arange(bmi_min, bmi_max + 2, 2)
-
-            # Histogram
-            hist_widget = make_histogram(
-                bmi,
-                bins=bins,
-                title="Distribution of the patients according to the BMI",
-                xlabel="BMI",
-                ylabel="Number of the patients"
-            )
-            fig = hist_widget.figure
-            ax = fig.axes[0]
-            ax.set_xticks(np.arange(0, (bmi_max // 10 + 1) * 10 + 1, 10))
-            ax.set_xlim(bins[0], bins[-1])
-            for txt in list(ax.texts):
-                txt.remove()
-            fig.tight_layout()
-            sec3.add_widget(add_download_button(hist_widget, "Download histogram"))
-
-            # Scatter plot
-            fig2, ax2 = plt.subplots()
-            ax2.scatter(range(len(bmi)), bmi, color="red", s=20)
-            ax2.set_title("BMI values of individual patients")
-            ax2.set_xlabel("Patient index")
-            ax2.set_ylabel("BMI")
-            fig2.tight_layout()
-
-            scatter_widget = FigureCanvas(fig2)
-            sec3.add_widget(add_download_button(scatter_widget, "Download histogram"))
-
-            self.vlay.addWidget(sec3)
-
-
-        sec4 = CollapsibleSection("Comorbidities Before the Surgery")
-
-        comorb_cols = [
-            "No_Comorbidities", "Diabetes", "COPD",
-            "Hepatic_Disease", "Renal_Disease",
-            "Aortic_Aneurysm", "Smoker"
-        ]
-
-        valid_cols = [col for col in comorb_cols if col in df.columns]
-
-        if not valid_cols:
-            lbl = QLabel("No Data: Comorbidities")
-            lbl.setAlignment(QtCore.Qt.AlignCenter)
-            self.vlay.addWidget(lbl)
-        else:
-            com_sums = df[valid_cols].sum()
-            if com_sums.sum() == 0:
-                lbl = QLabel("No Data: Comorbidities")
-                lbl.setAlignment(QtCore.Qt.AlignCenter)
-                self.vlay.addWidget(lbl)
-            else:
-                com_sums.index = [lbl.replace("_", " ").title() for lbl in com_sums.index]
-
-                bar_widget = make_bar_chart(
-                    com_sums,
-                    title="Patient's Comorbidities before the surgery",
-                    xlabel="",
-                    ylabel="Number"
-                )
-
-                fig = bar_widget.figure
-                ax = fig.axes[0]
-                for label in ax.get_xticklabels():
-                    label.set_rotation(45)
-                    label.set_ha("right")
-
-                fig.tight_layout()
-
-                sec4.add_widget(bar_widget)
-                sec4.add_widget(add_download_button(bar_widget, "Download Bar Chart"))
-                self.vlay.addWidget(sec4)
-
-
-        sec5 = CollapsibleSection("Pre-operative Pain at the Site of the Hernia")
-        required_pain_cols = ["Pain_rest", "Pain_activity", "Pain_last_week"]
-        valid_pain_cols = [col for col in required_pain_cols if col in df.columns]
-
-        if len(valid_pain_cols) < 3:
-            lbl = QLabel("No Data: Pain Score")
-            lbl.setAlignment(QtCore.Qt.AlignCenter)
-            self.vlay.addWidget(lbl)
-        else:
-            rest_counts = df["Pain_rest"].value_counts().sort_index()
-            act_counts = df["Pain_activity"].value_counts().sort_index()
-            last_counts = df["Pain_last_week"].value_counts().sort_index()
-
-            all_scores = sorted(set(rest_counts.index) | set(act_counts.index) | set(last_counts.index))
-
-            rest = rest_counts.reindex(all_scores, fill_value=0)
-            act = act_counts.reindex(all_scores, fill_value=0)
-            last = last_counts.reindex(all_scores, fill_value=0)
-
-            if rest.sum() == 0 and act.sum() == 0 and last.sum() == 0:
-                lbl = QLabel("No Data: Pain Score")
-                lbl.setAlignment(QtCore.Qt.AlignCenter)
-                self.vlay.addWidget(lbl)
-            else:
-                fig = Figure(figsize=(8, 5), dpi=100, facecolor='white')
-                ax = fig.add_subplot(111, facecolor='white')
-
-                x = np.arange(len(all_scores))
-                width = 0.25
-
-                bars1 = ax.bar(x - width, rest.values, width, label="In Rest", color="#E63946", edgecolor="#0D1B2A")
-                bars2 = ax.bar(x, act.values, width, label="During Activity", color="#457B9D", edgecolor="#0D1B2A")
-                bars3 = ax.bar(x + width, last.values, width, label="Last Week", color="#2A9D8F", edgecolor="#0D1B2A")
-
-                max_h = max(rest.max(), act.max(), last.max()) or 0
-                for bars in (bars1, bars2, bars3):
-                    for rect in bars:
-                        h = rect.get_height()
-                        ax.text(rect.get_x() + rect.get_width() / 2, h + max_h * 0.02, f"{int(h)}",
-                                ha="center", va="bottom", color="#0D1B2A", fontsize=9)
-
-                ax.set_title("Pre-operative Pain At The Site Of The Hernia", color="#0D1B2A")
-                ax.set_xlabel("Intensity of the pain", color="#0D1B2A", labelpad=16)
-                ax.set_ylabel("Number of the patient's", color="#0D1B2A")
-                ax.set_xticks(x)
-                ax.set_xticklabels(all_scores, rotation=0)
-                ax.legend()
-
-                ax.spines['left'].set_color("#0D1B2A")
-                ax.spines['left'].set_linewidth(1.2)
-                ax.spines['bottom'].set_color("#0D1B2A")
-                ax.yaxis.set_ticks_position("left")
-                ax.xaxis.set_ticks_position("bottom")
-                ax.grid(axis="y", color="#888888", alpha=0.3)
-                ax.set_ylim(0, max_h * 1.4)
-
-                fig.tight_layout()
-
-                canvas = FigureCanvas(fig)
-                canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-
-                sec5.add_widget(add_download_button(canvas, "Download Bar Chart"))
-                self.vlay.addWidget(sec5)
-
-
-        sec6 = CollapsibleSection("Pre-operative Restrictions")
-
-        cols = ["Restrict_inside", "Restrict_outside", "Restrict_sports", "Restrict_heavy"]
-        labels = ["Daily Activities", "Outside Activities", "During Sport", "Heavy Labour"]
-        valid_cols = [col for col in cols if col in df.columns]
-
-        if len(valid_cols) < len(cols):
-            lbl = QLabel("No Data: Restrictions Score")
-            lbl.setAlignment(QtCore.Qt.AlignCenter)
-            self.vlay.addWidget(lbl)
-        else:
-            counts = []
-            for col in cols:
-                values = df[col].dropna()
-                if values.empty:
-                    counts.append(pd.Series(dtype=int))
-                else:
-                    ordered_index = sorted(values.unique())
-                    cnt = values.value_counts().sort_index().reindex(ordered_index, fill_value=0)
-                    counts.append(cnt)
-
-            all_scores = sorted({v for cnt in counts for v in cnt.index})
-            if not all_scores or all(sum(cnt.values) == 0 for cnt in counts):
-                lbl = QLabel("No Data: Restrictions Score")
-                lbl.setAlignment(QtCore.Qt.AlignCenter)
-                self.vlay.addWidget(lbl)
-            else:
-                counts = [cnt.reindex(all_scores, fill_value=0) for cnt in counts]
-
-                fig = Figure(figsize=(8, 5), dpi=100, facecolor='white')
-                ax = fig.add_subplot(111, facecolor='white')
-
-                x = np.arange(len(all_scores))
-                width = 0.2
-                colors = ["#E63946", "#457B9D", "#2A9D8F", "#F4A261"]
-                bars = []
-
-                for i, cnt in enumerate(counts):
-                    bars.append(
-                        ax.bar(
-                            x + (i - 1.5) * width,
-                            cnt.values,
-                            width,
-                            label=labels[i],
-                            color=colors[i],
-                            edgecolor="#0D1B2A"
-                        )
-                    )
-
-                max_h = max(c.max() for c in counts) or 0
-                for barset in bars:
-                    for rect in barset:
-                        h = rect.get_height()
-                        ax.text(
-                            rect.get_x() + rect.get_width() / 2,
-                            h + max_h * 0.02,
-                            f"{int(h)}",
-                            ha="center", va="bottom",
-                            color="#0D1B2A",
-                            fontsize=8
-                        )
-
-                ax.set_title("Pre-operative Restrictions of patients", color="#0D1B2A")
-                ax.set_xlabel("Intensity of the restriction", color="#0D1B2A", labelpad=16)
-                ax.set_ylabel("Number of the patient's", color="#0D1B2A")
-                ax.set_xticks(x)
-                ax.set_xticklabels(all_scores, rotation=0)
-                ax.legend()
-
-                ax.spines['left'].set_color("#0D1B2A")
-                ax.spines['left'].set_linewidth(1.2)
-                ax.spines['bottom'].set_color("#0D1B2A")
-                ax.yaxis.set_ticks_position("left")
-                ax.xaxis.set_ticks_position("bottom")
-                ax.grid(axis="y", color="#888888", alpha=0.3)
-                ax.set_ylim(0, max_h * 1.4)
-
-                fig.tight_layout()
-
-                canvas = FigureCanvas(fig)
-                canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-
-                sec6.add_widget(add_download_button(canvas, "Download Bar Chart"))
-                self.vlay.addWidget(sec6)
-
-
-        sec7 = CollapsibleSection("Preoperative Estetical Discomfort")
-        cols = ["Esthetic_abdomen", "Esthetic_hernia"]
-        if not all(col in df.columns for col in cols):
-            lbl = QLabel("No Data: Preoperative estetical discomfort")
-            lbl.setAlignment(QtCore.Qt.AlignCenter)
-            self.vlay.addWidget(lbl)
+            def bmi_charts():
+                hist_widget = self._bmi_histogram(summary.bmi)
+                scatter_widget = self._figure_chart(figures, "bmi_scatter")
+                return [add_download_button(hist_widget, "Download histogram"),
+                        add_download_button(scatter_widget, "Download histogram")]
+            self._section(SECTION_TITLES["bmi"], bmi_charts)
+
+
+        if summary.comorbidities is None:
+            self._no_data("No Data: Comorbidities")
         else:
-            abd_counts = df["Esthetic_abdomen"].dropna().value_counts().sort_index()
-            hern_counts = df["Esthetic_hernia"].dropna().value_counts().sort_index()
-
-            if abd_counts.empty and hern_counts.empty:
-                lbl = QLabel("No Data: Preoperative estetical discomfort")
-                lbl.setAlignment(QtCore.Qt.AlignCenter)
-                self.vlay.addWidget(lbl)
-            else:
-                all_scores = sorted(set(abd_counts.index) | set(hern_counts.index))
-                abd = abd_counts.reindex(all_scores, fill_value=0)
-                hern = hern_counts.reindex(all_scores, fill_value=0)
-
-                fig = Figure(figsize=(8, 5), dpi=100, facecolor='white')
-                ax = fig.add_subplot(111, facecolor='white')
-
-                x = np.arange(len(all_scores))
-                width = 0.35
-
-                bars1 = ax.bar(
-                    x - width/2, abd.values, width,
-                    label="Shape of Abdomen",
-                    color="#E63946", edgecolor="#0D1B2A"
-                )
-                bars2 = ax.bar(
-                    x + width/2, hern.values, width,
-                    label="The Hernia Itself",
-                    color="#457B9D", edgecolor="#0D1B2A"
-                )
-
-                max_h = max(abd.max(), hern.max()) or 0
-                for barset in (bars1, bars2):
-                    for rect in barset:
-                        h = rect.get_height()
-                        ax.text(
-                            rect.get_x() + rect.get_width() / 2,
-                            h + max_h * 0.02,
-                            f"{int(h)}",
-                            ha="center", va="bottom",
-                            color="#0D1B2A",
-                            fontsize=9
-                        )
-
-                ax.set_title("Aesthetic Discomfort Score", color="#0D1B2A")
-                ax.set_xlabel("Discomfort Score", color="#0D1B2A", labelpad=16)
-                ax.set_ylabel("Count", color="#0D1B2A")
-                ax.set_xticks(x)
-                ax.set_xticklabels(all_scores, rotation=0)
-                ax.legend()
-
-                ax.spines['left'].set_color("#0D1B2A")
-                ax.spines['left'].set_linewidth(1.2)
-                ax.spines['bottom'].set_color("#0D1B2A")
-                ax.yaxis.set_ticks_position("left")
-                ax.xaxis.set_ticks_position("bottom")
-                ax.grid(axis="y", color="#888888", alpha=0.3)
-                ax.set_ylim(0, max_h * 1.4)
-
-                fig.tight_layout()
-
-                canvas = FigureCanvas(fig)
-                canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-
-                sec7.add_widget(add_download_button(canvas, "Download Bar Chart"))
-                self.vlay.addWidget(sec7)
-
-
-        if "Age" in df.columns:
-            df['Age_numeric'] = pd.to_numeric(df['Age'], errors='coerce')
-
-        stats = {
-            "Total patients": len(df),
-            "Males": df["Gender"].value_counts().get("male", 0) if "Gender" in df.columns else "N/A",
-            "Females": df["Gender"].value_counts().get("female", 0) if "Gender" in df.columns else "N/A",
-            "Male %": f"{df['Gender'].value_counts(normalize=True).get('male', 0)*100:.1f}%" if "Gender" in df.columns else "N/A",
-            "Female %": f"{df['Gender'].value_counts(normalize=True).get('female', 0)*100:.1f}%" if "Gender" in df.columns else "N/A",
-            "Mean BMI": f"{df['BMI'].mean():.1f}" if "BMI" in df.columns and not df['BMI'].dropna().empty else "N/A",
-            "Median BMI": f"{df['BMI'].median():.1f}" if "BMI" in df.columns and not df['BMI'].dropna().empty else "N/A",
-            "BMI Std Dev": f"{df['BMI'].std():.1f}" if "BMI" in df.columns and not df['BMI'].dropna().empty else "N/A",
-            "Min BMI": f"{df['BMI'].min():.1f}" if "BMI" in df.columns and not df['BMI'].dropna().empty else "N/A",
-            "Max BMI": f"{df['BMI'].max():.1f}" if "BMI" in df.columns and not df['BMI'].dropna().empty else "N/A",
-            "Mean Pain (rest)": f"{df['Pain_rest'].mean():.1f}" if "Pain_rest" in df.columns and not df['Pain_rest'].dropna().empty else "N/A",
-            "Mean Pain (activity)": f"{df['Pain_activity'].mean():.1f}" if "Pain_activity" in df.columns and not df['Pain_activity'].dropna().empty else "N/A",
-            "Mean Pain (last week)": f"{df['Pain_last_week'].mean():.1f}" if "Pain_last_week" in df.columns and not df['Pain_last_week'].dropna().empty else "N/A",
-            "Mean Comorbidities": (
-                f"{df[['Diabetes', 'COPD', 'Renal_Disease', 'Smoker']].sum(axis=1).mean():.2f}"
-                if all(col in df.columns for col in ['Diabetes', 'COPD', 'Renal_Disease', 'Smoker'])
-                else "N/A"
-            )
-        }
-
-        tbl_sec = CollapsibleSection("Basic Statistics")
-        wrapper = QWidget()
-        wrapper_lay = QVBoxLayout(wrapper)
-        wrapper_lay.setContentsMargins(0, 10, 0, 0)
-        wrapper_lay.addWidget(make_stats_table(stats))
-        tbl_sec.add_widget(wrapper)
-        self.vlay.addWidget(tbl_sec)
\ No newline at end of file
+            self._section(SECTION_TITLES["comorbidities"],
+                          bar_chart("comorbidities", summary.comorbidities))
+
+
+        for key, empty in (("pain", "No Data: Pain Score"),
+                           ("restrictions", "No Data: Restrictions Score"),
+                           ("esthetic", "No Data: Preoperative estetical discomfort")):
+            if getattr(summary, key) is None:
+                self._no_data(empty)
+                continue
+            self._section(SECTION_TITLES[key], partial(self._grouped_chart, figures, key))
+
+
+        def stats_table():
+            wrapper = QWidget()
+            wrapper_lay = QVBoxLayout(wrapper)
+            wrapper_lay.setContentsMargins(0, 10, 0, 0)
+            wrapper_lay.addWidget(make_stats_table(summary.stats))
+            return wrapper
+        self._section("Basic Statistics", stats_table)
+
+    def _cached(self, key, make_canvas, make_figure):
+        return self.charts.cached(f"preop/{key}", self.shown_filters,
+                                  make_canvas, make_figure)
+
+    def _bar_chart(self, key, data):
+        chart = self.charts.chart(key, lambda: count_chart(**BAR_CHARTS[key]))
+        return chart.update(data).widget()
+
+    def _bmi_histogram(self, bmi):
+        chart = self.charts.chart(
+            "bmi_histogram", lambda: HistogramChart(**BMI_HISTOGRAM))
+        update = partial(update_bmi_histogram, chart, bmi)
+        return self._cached("bmi_histogram", lambda: update().widget(),
+                            lambda: update().figure)
+
+    def _section(self, title, factory):
+        section = CollapsibleSection(title, factory=factory, expanded=self.expanded)
+        self.vlay.addWidget(section)
+        return section
+
+    def _figure_chart(self, figures, key):
+        return self._cached(key, lambda: self.charts.canvas(figures[key]),
+                            lambda: figures[key])
+
+    def _grouped_chart(self, figures, key):
+        canvas = self._figure_chart(figures, key)
+        canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        return add_download_button(canvas, "Download Bar Chart")
+
+
+SECTION_TITLES = {
+    "gender": "Number of Men and Women",
+    "age": "Distribution of Patients According to the Age",
+    "bmi": "Distribution of Patients According to the BMI",
+    "comorbidities": "Comorbidities Before the Surgery",
+    "pain": "Pre-operative Pain at the Site of the Hernia",
+    "restrictions": "Pre-operative Restrictions",
+    "esthetic": "Preoperative Estetical Discomfort",
+}
+
+# count charts kept by the page and updated in place
+BAR_CHARTS = {
+    "gender": dict(title="Statistics of the patients according to gender",
+                   xlabel="", ylabel="Number"),
+    "age": dict(title="Age of patients", xlabel="",
+                ylabel="Number of the patients"),
+    "comorbidities": dict(title="Patient's Comorbidities before the surgery",
+                          xlabel="", ylabel="Number", rotate_labels=True),
+}
+
+BMI_HISTOGRAM = dict(title="Distribution of the patients according to the BMI",
+                     xlabel="BMI", ylabel="Number of the patients",
+                     value_labels=False)
+
+# score distributions, one series per column of the summary's counts
+GROUPED_CHARTS = {
+    "pain": dict(title="Pre-operative Pain At The Site Of The Hernia",
+                 xlabel="Intensity of the pain", ylabel="Number of the patient's",
+                 labels=["In Rest", "During Activity", "Last Week"], width=0.25),
+    "restrictions": dict(title="Pre-operative Restrictions of patients",
+                         xlabel="Intensity of the restriction",
+                         ylabel="Number of the patient's",
+                         labels=["Daily Activities", "Outside Activities",
+                                 "During Sport", "Heavy Labour"],
+                         width=0.2, label_size=8),
+    "esthetic": dict(title="Aesthetic Discomfort Score", xlabel="Discomfort Score",
+                     ylabel="Count", labels=["Shape of Abdomen", "The Hernia Itself"],
+                     width=0.35),
+}
+
+# figures built per render, by section
+SECTION_FIGURES = {
+    SECTION_TITLES["bmi"]: ["bmi_scatter"],
+    SECTION_TITLES["pain"]: ["pain"],
+    SECTION_TITLES["restrictions"]: ["restrictions"],
+    SECTION_TITLES["esthetic"]: ["esthetic"],
+}
+
+
+def build_preop(dataset, spec, expanded=(), cached=()):
+    """
+    Summary and the page's LazyFigures. Runs on the render pool: figures
+    of the `expanded` sections are built here (OO API only, no widgets),
+    except the `cached` ones, which the page shows from the chart cache;
+    the rest only when their section is first opened.
+    """
+    summary = summarize_preop(dataset, spec)
+    figures = LazyFigures(FIGURE_BUILDERS, summary)
+    if summary.n:
+        figures.prebuild(key for title, keys in SECTION_FIGURES.items()
+                         if title in expanded for key in keys if key not in cached)
+    return summary, figures
+
+
+def bmi_bins(bmi):
+    """2-unit histogram bins over the BMI range and ticks every 10."""
+    bmi_min = int(np.floor(bmi.min()))
+    bmi_max = int(np.ceil(bmi.max()))
+    bins = np.arange(bmi_min, bmi_max + 2, 2)
+    return bins, np.arange(0, (bmi_max // 10 + 1) * 10 + 1, 10)
+
+
+def update_bmi_histogram(chart, bmi):
+    bins, xticks = bmi_bins(bmi)
+    return chart.update(bmi, bins, xticks, xlim=(bins[0], bins[-1]))
+
+
+@traced
+def _bmi_scatter(summary):
+    bmi = summary.bmi
+    if bmi.empty:
+        return None
+    fig = new_figure()
+    ax = fig.add_subplot(111)
+    ax.scatter(range(len(bmi)), bmi, color="red", s=20)
+    ax.set_title("BMI values of individual patients")
+    ax.set_xlabel("Patient index")
+    ax.set_ylabel("BMI")
+    with span("tight_layout"):
+        fig.tight_layout()
+    return fig
+
+
+def _grouped_figure(key, summary):
+    counts = getattr(summary, key)
+    if counts is None:
+        return None
+    return grouped_bar_figure(counts, **GROUPED_CHARTS[key])
+
+
+FIGURE_BUILDERS = {
+    "bmi_scatter": _bmi_scatter,
+    "pain": partial(_grouped_figure, "pain"),
+    "restrictions": partial(_grouped_figure, "restrictions"),
+    "esthetic": partial(_grouped_figure, "esthetic"),
+}
+
+
+def export_figures(summary, op_type=None):
+    """(key, Figure) for every chart the page shows for `summary`, without widgets."""
+    if not summary.n:
+        return
+    for key in ("gender", "age", "comorbidities"):
+        data = getattr(summary, key)
+        if data is not None:
+            yield key, bar_chart_figure(data, **BAR_CHARTS[key])
+    if not summary.bmi.empty:
+        chart = update_bmi_histogram(HistogramChart(**BMI_HISTOGRAM), summary.bmi)
+        yield "bmi_histogram", chart.figure
+    for key, build in FIGURE_BUILDERS.items():
+        fig = build(summary)
+        if fig is not None:
+            yield key, fig
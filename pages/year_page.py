@@ -4,6 +4,7 @@ from PyQt5.QtWidgets import (
     QHBoxLayout
 )
 from PyQt5 import QtCore
+from filters import YEAR_OPTIONS
 
 
 class YearPage(QWidget):
@@ -29,8 +30,7 @@ class YearPage(QWidget):
         self.lbl.setAlignment(QtCore.Qt.AlignCenter)
         content_layout.addWidget(self.lbl)
 
-        years = ["2021-2025", "2021", "2022", "2023", "2024", "2025"]
-        for yr in years:
+        for yr in YEAR_OPTIONS:
             btn = QPushButton(yr)
             btn.setObjectName("yearButton")
             btn.setFixedHeight(50)
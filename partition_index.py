@@ -0,0 +1,83 @@
+# partition_index.py
+import numpy as np
+import pandas as pd
+
+from filters import DIMENSIONS, FilterEngine, FilterSpec, LRUCache
+
+
+def _codes(series):
+    """Integer codes (-1 = missing) and the value of every code."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), list(series.cat.categories)
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    values = [int(v) if isinstance(v, float) and v.is_integer() else v
+              for v in uniques]
+    return codes, values
+
+
+class PartitionIndex:
+    """
+    Row positions of every (operation type, year, sex, age bucket)
+    combination, built once per dataset. A filter selects cells through a
+    FilterEngine and is answered by concatenating their partitions.
+    """
+
+    def __init__(self, frame, maxsize=128):
+        self.n_rows = len(frame)
+        self.dimensions = [d for d in DIMENSIONS if d in frame.columns]
+        self.keys, self.cell_ids, self.partitions = self._build(frame)
+        # the filter engine works on the cells: one row per partition key
+        self.filters = FilterEngine(
+            pd.DataFrame(self.keys, columns=self.dimensions, dtype=object),
+            maxsize)
+        self._rows = LRUCache(maxsize)
+
+    def _build(self, frame):
+        combined = np.zeros(self.n_rows, dtype=np.int64)
+        values = []
+        for dim in self.dimensions:
+            codes, dim_values = _codes(frame[dim])
+            combined = combined * (len(dim_values) + 1) + (codes + 1)
+            values.append(dim_values)
+
+        order = np.argsort(combined, kind='stable')
+        codes, starts, cell_ids = np.unique(
+            combined[order], return_index=True, return_inverse=True)
+        bounds = list(starts[1:]) + [self.n_rows]
+
+        keys = []
+        for code in codes:
+            key = []
+            for dim_values in reversed(values):
+                code, part = divmod(int(code), len(dim_values) + 1)
+                key.append(dim_values[part - 1] if part else None)
+            keys.append(tuple(reversed(key)))
+
+        row_cells = np.empty(self.n_rows, dtype=np.int32)
+        row_cells[order] = cell_ids.ravel()
+        partitions = {
+            key: order[start:end]
+            for key, start, end in zip(keys, starts, bounds)
+        }
+        return keys, row_cells, partitions
+
+    def cell_mask(self, *args, **kwargs):
+        """Boolean mask over `keys` of the cells matching a FilterSpec."""
+        return self.filters.mask(FilterSpec.of(*args, **kwargs))
+
+    def rows(self, *args, **kwargs):
+        """
+        Sorted row positions matching a FilterSpec (or its fields:
+        op_type, year, gender, age_group); "All"/None keeps a dimension open.
+        """
+        spec = FilterSpec.of(*args, **kwargs)
+        key = self.filters.key(spec)
+        cached = self._rows.get(key)
+        if cached is not None:
+            return cached
+
+        mask = self.filters.mask(spec)
+        parts = [self.partitions[self.keys[i]] for i in np.flatnonzero(mask)]
+        result = np.sort(np.concatenate(parts)) if parts else np.array([], dtype=np.intp)
+        result.setflags(write=False)
+        return self._rows.put(key, result)
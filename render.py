@@ -0,0 +1,132 @@
+# render.py
+"""
+Headless export of the data pages' charts for every operation type,
+year, sex and age filter, drawn by the pages' own builders on Agg:
+
+    python -m render --out charts --format svg --workers 4
+
+Files go to <out>/<page>/<op type>/<year>/<sex>_<age>/<chart>.<format>
+and <out>/manifest.json lists every one of them. Pages that ignore the
+operation type (all but the operative one) are rendered once, under "all".
+"""
+import matplotlib
+matplotlib.use("Agg")
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+import data_loader
+from filters import AGE_OPTIONS, GENDER_OPTIONS, YEAR_OPTIONS, FilterSpec
+from page_exports import PAGES
+from schema import OP_TYPE_CODES
+
+OP_TYPES = list(OP_TYPE_CODES.values())
+FORMATS = ("png", "svg")
+
+
+def slug(text):
+    """File-system safe name of a filter value ("<  25" -> "lt-25")."""
+    text = text.replace("<", "lt").replace(">", "gt")
+    return re.sub(r"[^A-Za-z0-9]+", "-", text).strip("-").lower()
+
+
+def jobs(pages=tuple(PAGES), op_types=OP_TYPES, years=YEAR_OPTIONS):
+    """(page, op type, year) work items; one item renders every sex/age pair."""
+    for page in pages:
+        types = op_types if PAGES[page].by_op_type else [None]
+        for op_type, year in product(types, years):
+            yield page, op_type, year
+
+
+_dataset = None
+
+
+def _init_worker(path):
+    global _dataset
+    _dataset = data_loader.Dataset(path)
+
+
+def render_job(page, op_type, year, out, fmt="png", dataset=None):
+    """Write the charts of one work item, return their manifest entries."""
+    dataset = dataset or _dataset
+    export = PAGES[page]
+    entries = []
+    for gender, age in product(GENDER_OPTIONS, AGE_OPTIONS):
+        spec = FilterSpec(year=year, gender=gender, age_group=age)
+        summary = export.summarize(dataset, spec, op_type)
+        folder = os.path.join(page, op_type or "all", slug(year),
+                              f"{slug(gender)}_{slug(age)}")
+        for key, fig in export.figures(summary, op_type):
+            os.makedirs(os.path.join(out, folder), exist_ok=True)
+            file = os.path.join(folder, f"{key}.{fmt}")
+            fig.savefig(os.path.join(out, file), format=fmt)
+            entries.append({
+                "page": page, "op_type": op_type, "year": year,
+                "gender": gender, "age_group": age, "n": summary.n,
+                "chart": key, "file": file.replace(os.sep, "/"),
+            })
+    return entries
+
+
+def render_all(out, fmt="png", workers=None, path=data_loader.excel_path,
+               pages=tuple(PAGES), op_types=OP_TYPES, years=YEAR_OPTIONS):
+    """Render every work item, `workers` processes at a time; returns the manifest."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}, expected one of {FORMATS}")
+    os.makedirs(out, exist_ok=True)
+    items = list(jobs(pages, op_types, years))
+    start = time.perf_counter()
+
+    if workers == 1:
+        dataset = data_loader.Dataset(path)
+        results = [render_job(*item, out, fmt, dataset) for item in items]
+    else:
+        # parse (or load the cached frame) once here, so workers start warm
+        data_loader.Dataset(path).load()
+        with ProcessPoolExecutor(workers, initializer=_init_worker,
+                                 initargs=(path,)) as pool:
+            results = list(pool.map(render_job, *zip(*items),
+                                    [out] * len(items), [fmt] * len(items)))
+
+    manifest = {
+        "dataset": os.path.abspath(path),
+        "fingerprint": data_loader.Dataset(path).fingerprint,
+        "format": fmt,
+        "seconds": round(time.perf_counter() - start, 2),
+        "charts": [entry for entries in results for entry in entries],
+    }
+    with open(os.path.join(out, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, ensure_ascii=False)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m render",
+        description="Render every chart of the data pages for every filter.")
+    parser.add_argument("--out", default="charts", help="output directory")
+    parser.add_argument("--format", default="png", choices=FORMATS)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processes (default: one per CPU, 1 = in-process)")
+    parser.add_argument("--data", default=data_loader.excel_path,
+                        help="registry workbook")
+    parser.add_argument("--pages", nargs="+", default=list(PAGES), choices=list(PAGES))
+    parser.add_argument("--op-types", nargs="+", default=OP_TYPES, choices=OP_TYPES)
+    parser.add_argument("--years", nargs="+", default=YEAR_OPTIONS, choices=YEAR_OPTIONS)
+    args = parser.parse_args(argv)
+
+    manifest = render_all(args.out, args.format, args.workers, args.data,
+                          args.pages, args.op_types, args.years)
+    print(f"{len(manifest['charts'])} charts in {manifest['seconds']} s -> "
+          f"{os.path.join(args.out, 'manifest.json')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
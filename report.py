@@ -0,0 +1,125 @@
+# report.py
+"""
+Multi-page PDF report of one operation type and year: a cover page, then
+every chart and the statistics table of the four data pages.
+
+    python -m report --op-type GHR --year 2023 --out GHR_2023.pdf
+
+Figures are built and written one at a time and cleared right after, so
+memory stays flat however long the report gets.
+"""
+import argparse
+import os
+import sys
+from datetime import date
+
+from matplotlib.backends.backend_pdf import PdfPages
+
+import data_loader
+from chart_utils import new_figure
+from filters import AGE_OPTIONS, GENDER_OPTIONS, YEAR_OPTIONS, FilterSpec
+from page_exports import PAGES
+from schema import OP_TYPE_CODES
+from table_utils import stats_table_figure
+
+
+def cover_figure(op_type, spec, dataset, figsize=(8.27, 11.69)):
+    fig = new_figure(figsize=figsize, facecolor='white')
+    fig.text(0.1, 0.8, "Hernia Registry Report", fontsize=24,
+             color="#0D1B2A", weight="bold")
+    lines = [
+        f"Operation type: {op_type}",
+        f"Year: {spec.year}",
+        f"Sex: {spec.gender}   |   Age: {spec.age_group}",
+        f"Data: {os.path.basename(dataset.path or 'in-memory dataset')}",
+        f"Created: {date.today():%Y-%m-%d}",
+    ]
+    for i, line in enumerate(lines):
+        fig.text(0.1, 0.72 - i * 0.04, line, fontsize=13, color="#333333")
+    return fig
+
+
+def report_figures(dataset, op_type, year, gender="All", age_group="All"):
+    """(name, Figure) pairs of the report, each built only when asked for."""
+    spec = FilterSpec(year=year, gender=gender, age_group=age_group)
+    yield "cover", cover_figure(op_type, spec, dataset)
+    for page, export in PAGES.items():
+        summary = export.summarize(dataset, spec, op_type)
+        for key, fig in export.figures(summary, op_type):
+            yield f"{page}/{key}", fig
+        if summary.n:
+            yield f"{page}/stats", stats_table_figure(
+                summary.stats, f"{export.title}: {op_type}, {year}, N = {summary.n}")
+
+
+class Report:
+    """A PDF written one figure per `step()`; `abort()` drops an unfinished file."""
+
+    def __init__(self, path, figures):
+        self.path = path
+        self.figures = iter(figures)
+        self.pdf = PdfPages(path, metadata={"Title": "Hernia Registry Report"})
+        self.pages = 0
+        self.current = None
+
+    def step(self):
+        """Write the next figure; False (and the file is complete) when none is left."""
+        try:
+            self.current, fig = next(self.figures)
+        except StopIteration:
+            self.close()
+            return False
+        self.pdf.savefig(fig)
+        # the artists go now, the Figure with the generator's reference
+        fig.clear()
+        self.pages += 1
+        return True
+
+    def close(self):
+        if self.pdf is not None:
+            self.pdf.close()
+            self.pdf = None
+
+    def abort(self):
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def write_report(path, dataset, op_type, year, gender="All", age_group="All",
+                 progress=None):
+    """Write the whole report; `progress(pages, name)` after every page."""
+    report = Report(path, report_figures(dataset, op_type, year, gender, age_group))
+    try:
+        while report.step():
+            if progress:
+                progress(report.pages, report.current)
+    except BaseException:
+        report.abort()
+        raise
+    return report.pages
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m report",
+        description="Write the PDF report of one operation type and year.")
+    parser.add_argument("--op-type", required=True, choices=list(OP_TYPE_CODES.values()))
+    parser.add_argument("--year", default=YEAR_OPTIONS[0], choices=YEAR_OPTIONS)
+    parser.add_argument("--gender", default="All", choices=GENDER_OPTIONS)
+    parser.add_argument("--age-group", default="All", choices=AGE_OPTIONS)
+    parser.add_argument("--data", default=data_loader.excel_path,
+                        help="registry workbook")
+    parser.add_argument("--out", help="PDF file (default <op type>_<year>.pdf)")
+    args = parser.parse_args(argv)
+
+    out = args.out or f"{args.op_type}_{args.year}.pdf"
+    pages = write_report(out, data_loader.Dataset(args.data), args.op_type,
+                         args.year, args.gender, args.age_group,
+                         progress=lambda n, name: print(f"{n:4d}  {name}"))
+    print(f"{pages} pages -> {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+# schema.py
+import hashlib
+from typing import NamedTuple, Optional
+
+import pandas as pd
+
+
+# "category" -> ordered pandas Categorical (CATEGORIES gives the order)
+# "flag"     -> bool, missing (fill 0) counts as not ticked
+# "score"    -> nullable Int8 (0-10), pd.NA for unanswered/"X" cells
+# "bool"     -> nullable boolean
+# "float", "date", "str" -> float64, datetime64, left as read
+DTYPES = ("category", "flag", "score", "bool", "float", "date", "str")
+
+AGE_GROUPS = ["<  25", "25 - 34", "35 - 44", "45 - 54",
+              "55 - 64", "65 - 74", ">  75"]
+
+OP_TYPE_CODES = {
+    'Groin Hernia Repair':        'GHR',
+    'Parastomal Hernia Repair':    'PHR',
+    'Primary Ventral Hernia Repair': 'PVHR',
+    'Incisional Ventral Hernia Repair': 'IVHR'
+}
+
+# Known categories in display order; values not listed are appended sorted.
+CATEGORIES = {
+    'Gender': ['male', 'female'],
+    'Age': AGE_GROUPS,
+    'Operation_Type': list(OP_TYPE_CODES.values()),
+    'Indication': ['Elective', 'Emergency'],
+    'PHR_Stoma_Type': ['Colostomy', 'Ilestomy', 'Ileal conduit'],
+    'PVHR_Subtype': ['Umbilical hernia', 'Epigastric hernia',
+                     'Spighelian hernia', 'Lumbar hernia'],
+}
+
+# Raw values mapped before the dtype is applied.
+VALUE_MAPS = {
+    'Operation_Type': OP_TYPE_CODES,
+}
+
+
+class ColumnSpec(NamedTuple):
+    raw: str                 # header in the Excel export
+    name: str                # canonical name used by the pages
+    dtype: str               # see DTYPES
+    fill: Optional[object]   # value for missing cells, None keeps them missing
+    page: str                # "shared", "preop", "oper", "discharge", "followup"
+
+
+def _group(page, dtype, fill, prefix, pairs):
+    return [ColumnSpec(prefix + raw, name, dtype, fill, page)
+            for raw, name in pairs]
+
+
+COLUMNS = [
+    ColumnSpec('Gender of the patient', 'Gender', 'category', None, 'shared'),
+    ColumnSpec('Age of patient at day of operation', 'Age', 'category', None, 'shared'),
+    ColumnSpec('Date of Operation', 'Date of Operation', 'date', None, 'shared'),
+    ColumnSpec('Please choose the indication for the abdominal wall repair',
+               'Operation_Type', 'category', None, 'shared'),
+
+    # Preoperative
+    ColumnSpec('BMI', 'BMI', 'float', None, 'preop'),
+    *_group('preop', 'flag', 0, "Please specify the patient's comorbidities::", [
+        ('No Comorbidities', 'No_Comorbidities'),
+        ('Diabetes mellitus', 'Diabetes'),
+        ('COPD', 'COPD'),
+        ('Hepatic disease', 'Hepatic_Disease'),
+        ('Renal disease', 'Renal_Disease'),
+        ('Abdominal aortic aneurysm', 'Aortic_Aneurysm'),
+        ('Smoker', 'Smoker'),
+    ]),
+    *_group('preop', 'score', None, 'Pain at the site of the hernia\n', [
+        ('In rest (laying down)', 'Pain_rest'),
+        ('During activities (walking, biking, sports)', 'Pain_activity'),
+        ('Pain felt during the last week', 'Pain_last_week'),
+    ]),
+    *_group('preop', 'score', None, 'Restrictions of activities\n', [
+        ('Daily activities (inside the house)', 'Restrict_inside'),
+        ('Outside the house (walking, biking; driving)', 'Restrict_outside'),
+        ('During sports', 'Restrict_sports'),
+        ('During heavy labour', 'Restrict_heavy'),
+    ]),
+    *_group('preop', 'score', None, 'Esthetical discomfort\n', [
+        ('The shape of your abdomen', 'Esthetic_abdomen'),
+        ('The hernia itself', 'Esthetic_hernia'),
+    ]),
+
+    # Operative
+    ColumnSpec('Indication for the surgery?', 'Indication', 'category', None, 'oper'),
+    *_group('oper', 'flag', 0, 'Side of the groin hernia? Bilateral?::', [
+        ('Right', 'GHR_Side_Right'),
+        ('Left', 'GHR_Side_Left'),
+    ]),
+    *_group('oper', 'float', None, 'Number of previous repairs - ', [
+        ('right side', 'GHR_Prev_Repairs_Right'),
+        ('left side', 'GHR_Prev_Repairs_Left'),
+    ]),
+    *_group('oper', 'flag', 0, 'Type of the groin hernia - right side::', [
+        ('Lateral (indirect)', 'GHR_Type_Right_Lateral'),
+        ('Medial (direct)', 'GHR_Type_Right_Medial'),
+        ('Femoral', 'GHR_Type_Right_Femoral'),
+        ('Obturator', 'GHR_Type_Right_Obturator'),
+    ]),
+    *_group('oper', 'flag', 0, 'Type of the groin hernia - left side::', [
+        ('Lateral (indirect)', 'GHR_Type_Left_Lateral'),
+        ('Medial (direct)', 'GHR_Type_Left_Medial'),
+        ('Femoral', 'GHR_Type_Left_Femoral'),
+        ('Obturator', 'GHR_Type_Left_Obturator'),
+    ]),
+    ColumnSpec('Type of stoma', 'PHR_Stoma_Type', 'category', None, 'oper'),
+    ColumnSpec('Number of previous parastomal hernia repairs',
+               'PHR_Prev_Repairs', 'float', None, 'oper'),
+    ColumnSpec('Please specify type of primary ventral hernia',
+               'PVHR_Subtype', 'category', None, 'oper'),
+    ColumnSpec('Number of previous hernia repairs',
+               'IVHR_Prev_Repairs', 'float', None, 'oper'),
+
+    # Discharge
+    ColumnSpec('Where there intrahospital  complications ?',
+               'Intra_Complications', 'bool', None, 'discharge'),
+    *_group('discharge', 'flag', 0,
+            'Please enter the type of intrahospital complications::', [
+                ('Bleeding complications', 'Comp_Bleeding'),
+                ('Surgical site infection (SSI)', 'Comp_SSI'),
+                ('Mesh infection', 'Comp_Mesh_Infection'),
+                ('Hematoma', 'Comp_Hematoma'),
+                ('Prolonged ileus or obstruction', 'Comp_Prolonged_Ileus'),
+                ('Urinary retention', 'Comp_Urinary_Retention'),
+                ('General complications', 'Comp_General'),
+            ]),
+
+    # Follow-up
+    ColumnSpec('Where there  complications at Follow Up ?',
+               'Followup_Complications', 'bool', None, 'followup'),
+    *_group('followup', 'flag', 0,
+            'Please enter the type of complications at Follow Up::', [
+                ('Seroma', 'FU_Seroma'),
+                ('Hematoma', 'FU_Hematoma'),
+                ('Pain', 'FU_Pain'),
+                ('Surgical site infection (SSI)', 'FU_SSI'),
+                ('Mesh infection', 'FU_Mesh_Infection'),
+                ('Other', 'FU_Other'),
+            ]),
+]
+
+BY_RAW = {spec.raw: spec for spec in COLUMNS}
+BY_NAME = {spec.name: spec for spec in COLUMNS}
+
+
+def raw_headers():
+    """Registered Excel headers, in registry order."""
+    return [spec.raw for spec in COLUMNS]
+
+
+def page_columns(page):
+    """Specs of one page together with the shared columns."""
+    return [spec for spec in COLUMNS if spec.page in ('shared', page)]
+
+
+def rename_map(page=None):
+    """Raw header -> canonical name, for one page or for the whole registry."""
+    specs = COLUMNS if page is None else page_columns(page)
+    return {spec.raw: spec.name for spec in specs}
+
+
+def missing_headers(columns):
+    """Registered raw headers that are not present in `columns`."""
+    present = set(columns)
+    return [raw for raw in raw_headers() if raw not in present]
+
+
+def schema_key():
+    """Short hash of the registry, used to invalidate caches when it changes."""
+    text = "\x1f".join(
+        f"{s.raw}\x1e{s.name}\x1e{s.dtype}\x1e{s.fill}" for s in COLUMNS)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+def coerce_column(series, spec):
+    """Apply the value map, dtype and fill rule of `spec` to one column."""
+    if spec.name in VALUE_MAPS:
+        series = series.map(VALUE_MAPS[spec.name])
+
+    if spec.dtype in ('flag', 'score', 'float'):
+        series = pd.to_numeric(series, errors='coerce')
+    elif spec.dtype == 'date':
+        series = pd.to_datetime(series, errors='coerce')
+
+    if spec.fill is not None:
+        series = series.fillna(spec.fill)
+
+    if spec.dtype == 'category':
+        known = CATEGORIES.get(spec.name, [])
+        extra = sorted(set(series.dropna().unique()) - set(known))
+        return series.astype(pd.CategoricalDtype(known + extra, ordered=True))
+    if spec.dtype == 'flag':
+        return series.astype(bool)
+    if spec.dtype == 'score':
+        return series.round().astype('Int8')
+    if spec.dtype == 'bool':
+        return series.astype('boolean')
+    return series
@@ -1,7 +1,9 @@
 # splash_screen.py
 import os
 import sys
-from PyQt5.QtWidgets import QSplashScreen, QLabel, QWidget, QVBoxLayout
+from PyQt5.QtWidgets import (
+    QApplication, QSplashScreen, QLabel, QWidget, QVBoxLayout
+)
 from PyQt5.QtGui import QMovie
 from PyQt5.QtCore import Qt
 
@@ -34,7 +36,9 @@ class SplashScreen(QSplashScreen):
 
         self.text = QLabel("Loading data...")
         self.text.setAlignment(Qt.AlignCenter)
+        self.text.setWordWrap(True)
         self.text.setStyleSheet("font-size: 16px;")
+        self.failed = False
 
         layout.addWidget(self.label)
         layout.addWidget(self.text)
@@ -45,3 +49,21 @@ class SplashScreen(QSplashScreen):
             (screen.width() - self.width()) // 2,
             (screen.height() - self.height()) // 2
         )
+
+    def set_stage(self, stage: str):
+        self.text.setText(stage)
+
+    def show_error(self, message: str):
+        """Keep the splash open with the error; a click closes the app."""
+        self.failed = True
+        self.movie.stop()
+        self.label.hide()
+        self.text.setStyleSheet("font-size: 13px; color: #B00020;")
+        self.text.setText(
+            f"Could not load data:\n{message}\n\nClick to close.")
+
+    def mousePressEvent(self, event):
+        if self.failed:
+            QApplication.quit()
+        else:
+            super().mousePressEvent(event)
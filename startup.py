@@ -0,0 +1,195 @@
+# startup.py
+"""
+Startup timeline of the app, for `python main.py --profile-startup`:
+wall time and RSS of every phase of a cold start (imports, QApplication,
+splash, loading the data, building the pages) up to the first painted
+frame of the main window. The breakdown is printed, `--profile-startup
+FILE.json` also saves it, and `--cprofile FILE.pstats` dumps a cProfile
+of the same span for pstats / snakeviz: the main thread, plus the worker
+threads that run under `profiled()` (the dataset loader).
+
+Phases are started with `phase(name)`; each one lasts until the next.
+Nothing is recorded unless begin() was given one of the flags.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+_phases = None      # [(name, perf_counter, rss MiB)] while recording
+_profile = None
+_thread_profiles = []   # of profiled() worker threads, merged into the dump
+_options = None
+_lock = threading.Lock()
+
+
+def add_arguments(parser):
+    parser.add_argument("--profile-startup", nargs="?", const="-", metavar="FILE.json",
+                        help="print the time and memory of every startup phase up to "
+                             "the first frame, then quit; FILE.json also saves them")
+    parser.add_argument("--cprofile", metavar="FILE.pstats",
+                        help="with --profile-startup: cProfile the startup into FILE "
+                             "(the main thread and the dataset loader thread)")
+
+
+def rss_mb():
+    """Current RSS in MiB; the peak where /proc is missing, None on Windows."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # bytes on macOS, KiB elsewhere
+    scale = 2**20 if sys.platform == "darwin" else 2**10
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def process_age():
+    """Seconds since the process started (Linux), else None."""
+    try:
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def begin(argv):
+    """Start recording if `argv` asks for it; call before the heavy imports."""
+    global _phases, _profile, _options
+    parser = argparse.ArgumentParser(add_help=False)
+    add_arguments(parser)
+    _options, _ = parser.parse_known_args(argv)
+    if not _options.profile_startup:
+        return False
+    _phases = []
+    age = process_age()
+    if age is not None:
+        _phases.append(("interpreter start", time.perf_counter() - age, None))
+    if _options.cprofile:
+        import cProfile
+        _profile = cProfile.Profile()
+        _profile.enable()
+    phase("import PyQt5")
+    return True
+
+
+def enabled():
+    return _phases is not None
+
+
+def phase(name):
+    """The phase `name` starts now (and the previous one ends)."""
+    if _phases is not None:
+        with _lock:
+            # progress callbacks repeat their stage, e.g. per chunk read
+            if not _phases or _phases[-1][0] != name:
+                _phases.append((name, time.perf_counter(), rss_mb()))
+
+
+@contextmanager
+def profiled():
+    """
+    cProfile the calling worker thread for the --cprofile dump; cProfile
+    only sees the thread that enabled it. A no-op unless profiling.
+    """
+    if _profile is None:
+        yield
+        return
+    import cProfile
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        # Python 3.12+: the main thread's profiler already sees every thread
+        yield
+        return
+    with _lock:
+        _thread_profiles.append(profile)
+    try:
+        yield
+    finally:
+        profile.disable()
+
+
+def breakdown(phases):
+    """[(phase, ms, RSS MiB at its end, RSS growth MiB)] of the finished phases."""
+    rows = []
+    rss_before = None
+    for (name, start, _), (_, end, rss) in zip(phases, phases[1:]):
+        grown = None if rss is None or rss_before is None else rss - rss_before
+        rows.append((name, (end - start) * 1000, rss, grown))
+        rss_before = rss
+    return rows
+
+
+def report(rows):
+    lines = [f"{'startup phase':<36} {'ms':>9} {'RSS MiB':>9} {'+MiB':>7}"]
+    for name, ms, rss, grown in rows:
+        rss_text = "" if rss is None else f"{rss:.1f}"
+        grown_text = "" if grown is None else f"{grown:+.1f}"
+        lines.append(f"{name[:36]:<36} {ms:>9.1f} {rss_text:>9} {grown_text:>7}")
+    total = sum(ms for name, ms, _, _ in rows if name != "interpreter start")
+    lines.append(f"{'imports to first frame':<36} {total:>9.1f}")
+    return "\n".join(lines)
+
+
+def finish():
+    """Close the last phase; print and save the breakdown, dump the profile."""
+    global _phases, _profile
+    if _phases is None:
+        return None
+    phase("end")
+    if _profile is not None:
+        _profile.disable()
+    rows = breakdown(_phases)
+    _phases = None
+    print(report(rows), file=sys.stderr)
+
+    if _options.profile_startup != "-":
+        with open(_options.profile_startup, "w", encoding="utf-8") as f:
+            json.dump({"phases": [dict(phase=name, ms=round(ms, 2),
+                                       rss_mb=None if rss is None else round(rss, 1))
+                                  for name, ms, rss, _ in rows]}, f, indent=1)
+    if _profile is not None:
+        import pstats
+        stats = pstats.Stats(_profile, stream=sys.stderr)
+        with _lock:
+            for profile in _thread_profiles:
+                stats.add(profile)
+            _thread_profiles.clear()
+        stats.dump_stats(_options.cprofile)
+        stats.sort_stats("cumulative").print_stats(25)
+        _profile = None
+    return rows
+
+
+def finish_on_first_paint(widget, then=None):
+    """finish() once `widget` has painted for the first time, then call `then()`."""
+    from PyQt5.QtCore import QEvent, QObject, QTimer
+
+    class FirstPaint(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Paint:
+                widget.removeEventFilter(self)
+                # after this paint event has been handled
+                QTimer.singleShot(0, done)
+            return False
+
+    def done():
+        finish()
+        if then is not None:
+            then()
+
+    widget._first_paint = FirstPaint(widget)
+    widget.installEventFilter(widget._first_paint)
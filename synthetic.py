@@ -0,0 +1,331 @@
+# synthetic.py
+"""
+Deterministic synthetic registry in the layout of ExportedData.xlsx, for
+benchmarks from 1k to 1M rows:
+
+    python -m synthetic --rows 100000 --seed 1 --out synthetic_100k.csv --cache
+
+The frame has the registered export headers (schema.raw_headers(), the
+only ones data_loader reads) and raw export values: age bucket and sex
+strings, operation type names, "YYYY-MM-DD" dates, 0/1 flags with gaps,
+0-10 scores and the "X  -  If the patient does not perform this activity"
+answers. Frequencies follow the bundled export. The same rows and seed
+always give the same frame.
+
+Written .xlsx files are padded to all ~830 headers of the real export
+(pad_to_export), since readers still walk every cell of every row;
+--no-full-export writes the registered columns only.
+"""
+import argparse
+import itertools
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+import schema
+from data_loader import read_workbook
+
+FORMATS = ("xlsx", "csv")
+EXPORT_HEADERS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                   "resources", "export_headers.json")
+NOT_PERFORMED = "X  -  If the patient does not perform this activity"
+
+AGE_P = dict(zip(schema.AGE_GROUPS,
+                 [0.015, 0.058, 0.121, 0.199, 0.231, 0.240, 0.136]))
+GENDER_P = {"male": 0.78, "female": 0.22}
+OP_TYPE_P = {
+    "Groin Hernia Repair": 0.675,
+    "Incisional Ventral Hernia Repair": 0.184,
+    "Primary Ventral Hernia Repair": 0.13,
+    "Parastomal Hernia Repair": 0.011,
+}
+# share of operations per year; 2025 only has its first two months
+YEAR_P = {2021: 0.215, 2022: 0.29, 2023: 0.25, 2024: 0.23, 2025: 0.015}
+
+COMORBIDITY_P = {
+    "Diabetes mellitus": 0.115, "COPD": 0.062, "Hepatic disease": 0.024,
+    "Renal disease": 0.026, "Abdominal aortic aneurysm": 0.011, "Smoker": 0.175,
+}
+# P(score 0..10) among answered questionnaires
+SCORE_P = {
+    "In rest (laying down)":
+        [.45, .12, .13, .12, .07, .04, .025, .017, .014, .002, .004],
+    "During activities (walking, biking, sports)":
+        [.17, .06, .12, .16, .14, .11, .08, .08, .06, .01, .01],
+    "Pain felt during the last week":
+        [.22, .08, .13, .16, .11, .10, .06, .06, .05, .015, .015],
+    "The shape of your abdomen":
+        [.29, .10, .13, .09, .07, .09, .04, .04, .05, .03, .07],
+    "The hernia itself":
+        [.19, .09, .13, .10, .09, .12, .05, .06, .07, .03, .07],
+}
+# restriction questions: (P(score 0..10), P("not performed"))
+RESTRICTION_P = {
+    "Daily activities (inside the house)":
+        ([.35, .12, .15, .11, .08, .08, .04, .03, .03, .01, .01], 0.0),
+    "Outside the house (walking, biking; driving)":
+        ([.26, .07, .11, .12, .11, .12, .08, .05, .05, .01, .02], 0.017),
+    "During sports":
+        ([.18, .05, .08, .13, .09, .12, .09, .06, .08, .03, .09], 0.32),
+    "During heavy labour":
+        ([.15, .04, .06, .10, .10, .14, .09, .08, .10, .03, .11], 0.24),
+}
+GROIN_TYPE_P = {"Lateral (indirect)": 0.66, "Medial (direct)": 0.44,
+                "Femoral": 0.045, "Obturator": 0.012}
+STOMA_P = {"Colostomy": 0.67, "Ilestomy": 0.22, "Ileal conduit": 0.11}
+PVHR_P = {"Umbilical hernia": 0.77, "Epigastric hernia": 0.2,
+          "Spighelian hernia": 0.028, "Lumbar hernia": 0.002}
+INTRA_TYPE_P = {
+    "Bleeding complications": 0.1, "Surgical site infection (SSI)": 0.09,
+    "Mesh infection": 0.006, "Hematoma": 0.17,
+    "Prolonged ileus or obstruction": 0.15, "Urinary retention": 0.2,
+    "General complications": 0.39,
+}
+FOLLOWUP_TYPE_P = {
+    "Seroma": 0.44, "Hematoma": 0.15, "Pain": 0.27,
+    "Surgical site infection (SSI)": 0.08, "Mesh infection": 0.01, "Other": 0.14,
+}
+# the only unregistered export columns with answers: (values, share of rows)
+FILLER_P = {
+    "Technique of previous hernia repair":
+        (["Raphy + IPOM", "ipom", "clasic - tisular", "hernioplastia pre-peritoneal"],
+         0.017),
+    "Has there been a previous mesh repair?": ([True, False], 0.017),
+    "Check patients Quality of Life (EuraHS QoL) at Follow Up ?.9": ([False], 0.0003),
+}
+
+
+class _Columns:
+    """Raw columns of one synthetic export, drawn from one seeded generator."""
+
+    def __init__(self, rows, seed):
+        self.rng = np.random.default_rng(seed)
+        self.n = rows
+        self.data = {}
+
+    def choice(self, probs, missing=0.0):
+        values = np.array(list(probs), dtype=object)
+        p = np.fromiter(probs.values(), float)
+        out = values[self.rng.choice(len(values), self.n, p=p / p.sum())]
+        return self.blank(out, missing)
+
+    def blank(self, values, missing):
+        if missing:
+            values = values.astype(object) if values.dtype != object else values
+            values[self.rng.random(self.n) < missing] = np.nan
+        return values
+
+    def flags(self, p, rows):
+        """0/1 with probability `p` on `rows`, missing elsewhere."""
+        out = np.where(self.rng.random(self.n) < p, 1.0, 0.0)
+        out[~rows] = np.nan
+        return out
+
+    def counts(self, p, rows, high=3):
+        """Previous repairs: 1..high (mostly 1) for share `p` of `rows`, else missing."""
+        out = np.full(self.n, np.nan)
+        hit = rows & (self.rng.random(self.n) < p)
+        out[hit] = np.minimum(self.rng.geometric(0.75, hit.sum()), high)
+        return out
+
+    def scores(self, p, rows):
+        out = self.rng.choice(11, self.n, p=np.asarray(p) / sum(p)).astype(float)
+        out[~rows] = np.nan
+        return out
+
+
+def generate(rows=10_000, seed=0):
+    """Synthetic export frame with the registered raw headers and values."""
+    c = _Columns(rows, seed)
+    n, rng, data = rows, c.rng, c.data
+
+    data["Gender of the patient"] = c.choice(GENDER_P)
+    data["Age of patient at day of operation"] = c.choice(AGE_P)
+
+    years = np.array(list(YEAR_P))[rng.choice(len(YEAR_P), n, p=list(YEAR_P.values()))]
+    days = rng.integers(0, np.where(years == 2025, 59, 365))
+    dates = (years - 1970).astype("datetime64[Y]").astype("datetime64[D]") + days
+    data["Date of Operation"] = c.blank(np.datetime_as_string(dates, unit="D")
+                                        .astype(object), 0.018)
+
+    op_type = c.choice(OP_TYPE_P)
+    data["Please choose the indication for the abdominal wall repair"] = \
+        c.blank(op_type.copy(), 0.054)
+
+    bmi = np.clip(rng.normal(26.9, 4.6, n), 14, 60)
+    data["BMI"] = np.where(rng.random(n) < 0.27, bmi.round(), bmi.round(2))
+
+    # comorbidities: all or none of the ticks missing for a patient
+    answered = rng.random(n) >= 0.055
+    prefix = "Please specify the patient's comorbidities::"
+    ticks = {name: c.flags(p, answered) for name, p in COMORBIDITY_P.items()}
+    any_tick = np.nansum(np.vstack(list(ticks.values())), axis=0) > 0
+    data[prefix + "No Comorbidities"] = np.where(answered, (~any_tick).astype(float), np.nan)
+    for name, values in ticks.items():
+        data[prefix + name] = values
+
+    # the questionnaire is filled in for a bit less than half the patients
+    filled = rng.random(n) >= 0.56
+    for name in ("In rest (laying down)",
+                 "During activities (walking, biking, sports)",
+                 "Pain felt during the last week"):
+        data["Pain at the site of the hernia\n" + name] = c.scores(SCORE_P[name], filled)
+    for name, (p, not_performed) in RESTRICTION_P.items():
+        score = c.scores(p, filled)
+        values = np.full(n, np.nan, dtype=object)
+        values[filled] = score[filled].astype(int).astype(str)
+        values[filled & (rng.random(n) < not_performed)] = NOT_PERFORMED
+        data["Restrictions of activities\n" + name] = values
+    for name in ("The shape of your abdomen", "The hernia itself"):
+        data["Esthetical discomfort\n" + name] = c.scores(SCORE_P[name], filled)
+
+    data["Indication for the surgery?"] = c.choice(
+        {"Elective": 0.981, "Emergency": 0.019}, missing=0.017)
+
+    ghr = op_type == "Groin Hernia Repair"
+    right = ghr & (rng.random(n) < 0.69)
+    left = ghr & ((rng.random(n) < 0.59) | ~right)
+    prefix = "Side of the groin hernia? Bilateral?::"
+    data[prefix + "Right"] = np.where(ghr, right.astype(float), np.nan)
+    data[prefix + "Left"] = np.where(ghr, left.astype(float), np.nan)
+    data["Number of previous repairs - right side"] = c.counts(0.08, right)
+    data["Number of previous repairs - left side"] = c.counts(0.07, left)
+    for side, rows_ in (("right", right), ("left", left)):
+        for name, p in GROIN_TYPE_P.items():
+            data[f"Type of the groin hernia - {side} side::{name}"] = c.flags(p, rows_)
+
+    phr = op_type == "Parastomal Hernia Repair"
+    stoma = c.choice(STOMA_P)
+    stoma[~phr] = np.nan
+    data["Type of stoma"] = stoma
+    data["Number of previous parastomal hernia repairs"] = c.counts(0.4, phr)
+    pvhr = c.choice(PVHR_P)
+    pvhr[op_type != "Primary Ventral Hernia Repair"] = np.nan
+    data["Please specify type of primary ventral hernia"] = pvhr
+    data["Number of previous hernia repairs"] = c.counts(
+        0.33, op_type == "Incisional Ventral Hernia Repair", high=7)
+
+    for question, prefix, p_true, missing, types in (
+            ("Where there intrahospital  complications ?",
+             "Please enter the type of intrahospital complications::",
+             0.045, 0.076, INTRA_TYPE_P),
+            ("Where there  complications at Follow Up ?",
+             "Please enter the type of complications at Follow Up::",
+             0.17, 0.445, FOLLOWUP_TYPE_P)):
+        asked = rng.random(n) >= missing
+        had = asked & (rng.random(n) < p_true)
+        answer = np.where(had, True, False).astype(object)
+        answer[~asked] = np.nan
+        data[question] = answer
+        for name, p in types.items():
+            data[prefix + name] = c.flags(p, had)
+
+    return pd.DataFrame({raw: data[raw] for raw in schema.raw_headers()})
+
+
+def export_headers():
+    """All headers of the real export, as read_excel names them, in order."""
+    with open(EXPORT_HEADERS_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def pad_to_export(df, seed=0):
+    """
+    `df` with every header of the real export, in the export's order.
+    The unregistered columns are sparse like in the export: empty, except
+    the few in FILLER_P. Registered headers the export lacks come last.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(df)
+    empty = pd.arrays.SparseArray(np.full(n, np.nan))
+    columns = {}
+    for name in export_headers() + list(df.columns):
+        if name in columns:
+            continue
+        if name in df.columns:
+            columns[name] = df[name].to_numpy()
+        elif name in FILLER_P:
+            values, share = FILLER_P[name]
+            out = np.full(n, np.nan, dtype=object)
+            hit = rng.random(n) < share
+            out[hit] = np.array(values, dtype=object)[rng.integers(0, len(values), hit.sum())]
+            columns[name] = pd.arrays.SparseArray(out, fill_value=np.nan)
+        else:
+            columns[name] = empty
+    return pd.DataFrame(columns, index=df.index)
+
+
+def _cells(series):
+    """Cell values of one column, None where empty (not written)."""
+    if isinstance(series.dtype, pd.SparseDtype) and series.sparse.npoints == 0:
+        return itertools.repeat(None, len(series))
+    values = series.to_numpy(dtype=object, copy=True)
+    values[pd.isna(values)] = None
+    return values
+
+
+def write_xlsx(df, path):
+    """Stream `df` into a one-sheet workbook (openpyxl write-only mode)."""
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(list(df.columns))
+    for row in zip(*(_cells(df[col]) for col in df.columns)):
+        ws.append(list(row))
+    wb.save(path)
+
+
+def write(df, path, fmt=None, cache=False, full_export=None, seed=0):
+    """
+    Write the frame as .xlsx or .csv (`fmt`, else the file extension).
+    `full_export` pads it to every header of the real export first
+    (default: for .xlsx only); `seed` draws the filler answers.
+    `cache=True` also parses the written file into the columnar data
+    cache next to it, so Dataset(path) loads without parsing.
+    """
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}, expected one of {FORMATS}")
+    if full_export is None:
+        full_export = fmt == "xlsx"
+    if full_export:
+        df = pad_to_export(df, seed)
+    if fmt == "xlsx":
+        write_xlsx(df, path)
+    else:
+        df.to_csv(path, index=False)
+    if cache:
+        read_workbook(path, rebuild=True)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m synthetic",
+        description="Write a synthetic registry export for benchmarks.")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="output file (default synthetic_<rows>.<format>)")
+    parser.add_argument("--format", choices=FORMATS,
+                        help="file format (default: from --out, else csv)")
+    parser.add_argument("--full-export", action=argparse.BooleanOptionalAction,
+                        help="pad to all headers of the real export with its sparse "
+                             "filler columns (default: for xlsx only)")
+    parser.add_argument("--cache", action="store_true",
+                        help="also write the columnar data cache next to the file")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or (os.path.splitext(args.out)[1].lstrip(".") if args.out else "csv")
+    out = args.out or f"synthetic_{args.rows}.{fmt}"
+    write(generate(args.rows, args.seed), out, fmt, args.cache, args.full_export,
+          args.seed)
+    print(f"{args.rows:,} rows -> {out}" + (" (+ cache)" if args.cache else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
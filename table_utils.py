@@ -5,8 +5,11 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtGui import QFont
 from PyQt5 import QtCore
+from chart_utils import new_figure
+from tracing import traced
 
 
+@traced
 def make_stats_table(stats: dict):
     table = QTableWidget(len(stats), 2)
     table.setHorizontalHeaderLabels(["Metric", "Value"])
@@ -56,3 +59,28 @@ def make_stats_table(stats: dict):
     table.setMinimumHeight(hdr_h + table.rowCount()*row_h + 2)
 
     return table
+
+
+@traced
+def stats_table_figure(stats: dict, title="", figsize=(8.27, 11.69), dpi=100):
+    """The make_stats_table rows as a matplotlib table, e.g. for a PDF page."""
+    fig = new_figure(figsize=figsize, dpi=dpi, facecolor='white')
+    ax = fig.add_subplot(111)
+    ax.axis("off")
+    if title:
+        ax.set_title(title, color="#0D1B2A", fontsize=14, loc="left")
+    rows = [[k, str(v)] for k, v in stats.items()] or [["No data", ""]]
+    table = ax.table(cellText=rows, colLabels=["Metric", "Value"],
+                     colWidths=[0.65, 0.35], loc="upper center", cellLoc="left")
+    table.auto_set_font_size(False)
+    table.set_fontsize(10)
+    table.scale(1, 1.4)
+    for (row, col), cell in table.get_celld().items():
+        cell.set_edgecolor("#CCCCCC")
+        if row == 0:
+            cell.set_facecolor("black")
+            cell.get_text().set_color("#E0E1DD")
+            cell.get_text().set_weight("bold")
+        elif col == 1:
+            cell.get_text().set_horizontalalignment("right")
+    return fig
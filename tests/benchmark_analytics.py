@@ -0,0 +1,39 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import itertools
+import timeit
+from analytics import (
+    summarize_discharge,
+    summarize_followup,
+    summarize_operative,
+    summarize_preop
+)
+from data_loader import dataset
+from filters import FilterSpec
+
+# Compute cost per page without Qt: one summary per filter combination.
+SPECS = [
+    FilterSpec(year=year, gender=gender, age_group=age)
+    for year, gender, age in itertools.product(
+        ["2021-2025", "2023"], ["All", "Male", "Female"], ["All", "55 - 64"])
+]
+
+PAGES = {
+    "Preoperative": summarize_preop,
+    "Operative (GHR)": lambda ds, spec: summarize_operative(ds, spec, op_type="GHR"),
+    "Operative (PHR)": lambda ds, spec: summarize_operative(ds, spec, op_type="PHR"),
+    "Discharge": summarize_discharge,
+    "Follow-up": summarize_followup,
+}
+
+def benchmark(func, name, number=20):
+    duration = timeit.timeit(func, number=number)
+    per_call = duration / number / len(SPECS)
+    print(f"{name:<25}: {per_call*1000:.3f} ms per summary "
+          f"(avg over {number} x {len(SPECS)} filters)")
+
+if __name__ == "__main__":
+    dataset.load()
+    for name, summarize in PAGES.items():
+        benchmark(lambda: [summarize(dataset, spec) for spec in SPECS], name)
@@ -1,8 +1,16 @@
 import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+import resource
 import timeit
+import tracemalloc
 from data_loader import (
+    build_canonical,
+    dataset,
+    excel_path,
+    filter_positions,
+    parse_workbook,
+    read_workbook,
     load_preop_data,
     load_oper_data,
     load_discharge_data,
@@ -13,8 +21,63 @@ def benchmark(func, name, number=10):
     duration = timeit.timeit(func, number=number)
     print(f"{name:<25}: {duration/number:.4f} sec (avg over {number} runs)")
 
+def peak_memory(func, name):
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<25}: {peak/1024**2:.2f} MiB peak allocation")
+
+def filter_with_copies(df, year, gender, age_group):
+    """The per-page filtering used before the shared dataset: copy, then mask."""
+    df = df.copy()
+    start, end = map(int, year.split('-'))
+    df = df[df['Year'].between(start, end)]
+    df = df[df['Gender'] == gender]
+    return df[df['Age'] == age_group]
+
+def filter_with_positions(df, year, gender, age_group):
+    return df.take(filter_positions(df, year, gender, age_group))
+
 if __name__ == "__main__":
+    benchmark(lambda: parse_workbook(excel_path), "Parse workbook (Excel)", number=1)
+    benchmark(lambda: parse_workbook(excel_path, engine="stream"),
+              "Parse workbook (stream)", number=1)
+    peak_memory(lambda: parse_workbook(excel_path), "Parse workbook (Excel)")
+    peak_memory(lambda: parse_workbook(excel_path, engine="stream"),
+                "Parse workbook (stream)")
+    benchmark(read_workbook, "Read workbook (cache)")
+    raw = read_workbook()
+    benchmark(lambda: build_canonical(raw), "Build canonical frame")
+
+    dataset.load()
     benchmark(load_preop_data, "Preoperative Data")
     benchmark(load_oper_data, "Operative Data")
     benchmark(load_discharge_data, "Discharge Data")
     benchmark(load_followup_data, "Follow-up Data")
+
+    args = ("2021-2025", "male", "55 - 64")
+    preop = load_preop_data()
+    benchmark(lambda: filter_with_copies(dataset.frame, *args),
+              "Filter (copy, before)", number=100)
+    benchmark(lambda: filter_with_positions(preop, *args),
+              "Filter (positions, after)", number=100)
+    benchmark(lambda: preop.take(dataset.rows(None, *args)),
+              "Filter (partition index)", number=100)
+    benchmark(lambda: dataset.index.rows(None, *args),
+              "Index lookup only", number=1000)
+    benchmark(lambda: dataset.aggregate(None, *args).value_counts("Gender"),
+              "Cube query + counts", number=1000)
+    benchmark(lambda: preop.take(dataset.rows(None, *args))["Gender"].value_counts(),
+              "Rows + value_counts", number=1000)
+
+    peak_memory(lambda: [load_preop_data(), load_oper_data(),
+                         load_discharge_data(), load_followup_data()],
+                "All loaders")
+    peak_memory(lambda: filter_with_copies(dataset.frame, *args),
+                "Filter (copy, before)")
+    peak_memory(lambda: filter_with_positions(preop, *args),
+                "Filter (positions, after)")
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"{'Process peak RSS':<25}: {max_rss/1024:.1f} MiB")
@@ -0,0 +1,87 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+import gc
+import itertools
+import resource
+import time
+from PyQt5.QtCore import QCoreApplication, QEvent
+from PyQt5.QtWidgets import QApplication
+from chart_utils import live_figure_count
+from data_loader import dataset
+from ui_helpers import CollapsibleSection
+
+# Regression check for figure/canvas leaks: flip the filters of every data
+# page TOGGLES times with all sections expanded; RSS and the number of live
+# figures must stay flat once the pages have warmed up.
+TOGGLES = 500
+WARMUP = 50
+MAX_RSS_GROWTH_MB = 40
+
+FILTERS = list(itertools.product(["All", "Male", "Female"], ["All", "55 - 64", "65 - 74"]))
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() / 2**20
+    except OSError:
+        # peak rather than current RSS, still catches steady growth
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def expand_all(page):
+    for i in range(page.vlay.count()):
+        section = page.vlay.itemAt(i).widget()
+        if isinstance(section, CollapsibleSection) and not section.toggle_button.isChecked():
+            section.toggle_button.click()
+
+
+def settle(page):
+    page.renderer.wait()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    gc.collect()
+
+
+def toggle(page, i):
+    gender, age = FILTERS[i % len(FILTERS)]
+    page.gender_combo.setCurrentText(gender)
+    page.age_combo.setCurrentText(age)
+    page.scheduler.flush()
+    settle(page)
+
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    from pages.main_window import MainWindow
+
+    dataset.load()
+    window = MainWindow(dataset)
+    window.current_op_type, window.selected_year = "GHR", "2021-2025"
+    pages = [window.preop_page, window.oper_page,
+             window.discharge_page, window.followup_page]
+
+    for page in pages:
+        page.update_view()
+        settle(page)
+        expand_all(page)
+
+    start = time.perf_counter()
+    for i in range(TOGGLES):
+        page = pages[i % len(pages)]
+        toggle(page, i // len(pages))
+        if i + 1 == WARMUP:
+            base_rss, base_figures = rss_mb(), live_figure_count()
+        if (i + 1) % 100 == 0:
+            print(f"{i + 1:>4} toggles: RSS {rss_mb():7.1f} MB, "
+                  f"live figures {live_figure_count():3d}, canvases "
+                  f"{sum(p.charts.live_canvases for p in pages)}")
+    elapsed = time.perf_counter() - start
+
+    growth = rss_mb() - base_rss
+    print(f"{TOGGLES} toggles in {elapsed:.1f} s; RSS growth after warm-up "
+          f"{growth:.1f} MB, live figures {base_figures} -> {live_figure_count()}")
+    assert live_figure_count() <= base_figures, "figures leak"
+    assert growth < MAX_RSS_GROWTH_MB, "memory grows with filter changes"
@@ -0,0 +1,312 @@
+"""
+Benchmark suite over synthetic registries of several sizes: the workbook
+parse, the loaders, the filter step, every page's aggregation, every
+chart_utils builder and a full update_view() of every page (Qt offscreen).
+
+    python tests/benchmark_suite.py run --sizes 1000 10000 100000 --out bench.json
+    python tests/benchmark_suite.py compare baseline.json bench.json
+
+Each case reports the median and p95 of its run times, the tracemalloc
+peak of one run and the memory blocks one run leaves allocated. `compare`
+prints the cases that got slower (or bigger) than the baseline by more
+than --tolerance and exits with 1 if there are any.
+"""
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+import argparse
+import gc
+import json
+import platform
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PyQt5.QtCore import QCoreApplication, QEvent
+from PyQt5.QtWidgets import QApplication
+
+import synthetic
+from analytics import (
+    summarize_discharge,
+    summarize_followup,
+    summarize_operative,
+    summarize_preop
+)
+from chart_utils import (
+    bar_chart_figure,
+    grouped_bar_figure,
+    histogram_figure,
+    make_bar_chart,
+    make_bmi_scatter,
+    make_grouped_bar_chart,
+    make_histogram,
+    score_count_matrix
+)
+from data_loader import Dataset, build_canonical, filter_positions, normalize_workbook, parse_workbook
+from filters import FilterSpec
+from ui_helpers import CollapsibleSection
+
+SIZES = [1_000, 10_000, 100_000]
+GROUPS = ["parse", "load", "filter", "aggregate", "chart", "update_view"]
+FILTER = ("2021-2025", "male", "55 - 64")
+SPEC = FilterSpec(year="2021-2025", gender="male")
+PAIN = ["Pain at the site of the hernia\nIn rest (laying down)",
+        "Pain at the site of the hernia\nDuring activities (walking, biking, sports)",
+        "Pain at the site of the hernia\nPain felt during the last week"]
+LOADER_PAGES = ["preop", "oper", "discharge", "followup"]
+
+SUMMARIES = {
+    "preop": summarize_preop,
+    "operative_ghr": lambda ds, spec: summarize_operative(ds, spec, op_type="GHR"),
+    "operative_phr": lambda ds, spec: summarize_operative(ds, spec, op_type="PHR"),
+    "discharge": summarize_discharge,
+    "followup": summarize_followup,
+}
+
+
+def settle():
+    """Run deleteLater() and the collector, so runs don't pay for each other."""
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    gc.collect()
+
+
+def drawn(fig):
+    FigureCanvasAgg(fig).draw()
+
+
+def painted(widget):
+    widget.resize(600, 400)
+    widget.grab()
+    widget.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+
+class Workload:
+    """
+    The synthetic data of one size, with its files written on first use;
+    the .xlsx is padded to the full export header list, like the real one.
+    """
+
+    def __init__(self, rows, seed, folder):
+        self.rows = rows
+        self.folder = folder
+        self.raw = synthetic.generate(rows, seed)
+        self.dataset = Dataset.from_frame(self.raw)
+        self.dataset.load()
+        self.preop = summarize_preop(self.dataset, SPEC)
+        self._files = {}
+        self._window = None
+
+    def file(self, fmt):
+        if fmt not in self._files:
+            path = os.path.join(self.folder, f"synthetic_{self.rows}.{fmt}")
+            self._files[fmt] = synthetic.write(self.raw, path, fmt)
+        return self._files[fmt]
+
+    def window(self):
+        """MainWindow over the dataset with every section of the data pages open."""
+        if self._window is None:
+            from pages.main_window import MainWindow
+
+            window = MainWindow(self.dataset)
+            window.current_op_type, window.selected_year = "GHR", "2021-2025"
+            for page in self.pages(window).values():
+                self.render(window, page)
+                for i in range(page.vlay.count()):
+                    section = page.vlay.itemAt(i).widget()
+                    if isinstance(section, CollapsibleSection) and not section.toggle_button.isChecked():
+                        section.toggle_button.click()
+            self._window = window
+        return self._window
+
+    @staticmethod
+    def pages(window):
+        return {"preop": window.preop_page, "operative": window.oper_page,
+                "discharge": window.discharge_page, "followup": window.followup_page}
+
+    @staticmethod
+    def render(window, page):
+        # a full render every time: no "same filter" skip, no cached images
+        page.scheduler.invalidate()
+        window.chart_cache.clear()
+        page.update_view()
+        page.renderer.wait()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+    def close(self):
+        if self._window is not None:
+            self._window.close()
+            self._window.deleteLater()
+            self._window = None
+            settle()
+
+
+def cases(work):
+    """(group, name, func) of every benchmark case over one workload."""
+    ds, preop = work.dataset, work.preop
+    raw = normalize_workbook(work.raw)
+    bins = np.arange(14, 62, 2)
+
+    yield "parse", "xlsx", lambda: parse_workbook(work.file("xlsx"))
+    yield "parse", "xlsx_stream", lambda: parse_workbook(work.file("xlsx"), engine="stream")
+    yield "parse", "csv", lambda: parse_workbook(work.file("csv"))
+
+    yield "load", "canonical", lambda: build_canonical(raw)
+    yield "load", "dataset", lambda: Dataset.from_frame(work.raw).load()
+    for page in LOADER_PAGES:
+        yield "load", page, lambda page=page: ds.view(page)
+
+    yield "filter", "positions", lambda: filter_positions(ds.frame, *FILTER)
+    yield "filter", "index", lambda: ds.rows(None, *FILTER)
+    yield "filter", "take", lambda: ds.view("preop").take(ds.rows(None, *FILTER))
+
+    for name, summarize in SUMMARIES.items():
+        yield "aggregate", name, lambda summarize=summarize: summarize(ds, SPEC)
+
+    labels = dict(title="Age", xlabel="", ylabel="Number")
+    yield "chart", "bar_chart_figure", lambda: drawn(bar_chart_figure(preop.age, **labels))
+    yield "chart", "make_bar_chart", lambda: painted(make_bar_chart(preop.age, **labels))
+    yield "chart", "make_bar_chart_mpl", lambda: painted(
+        make_bar_chart(preop.age, **labels, backend="matplotlib"))
+    yield "chart", "histogram_figure", lambda: drawn(histogram_figure(preop.bmi, bins, "BMI", "BMI", "N"))
+    yield "chart", "make_histogram", lambda: painted(make_histogram(preop.bmi, bins, "BMI", "BMI", "N"))
+    yield "chart", "make_bmi_scatter", lambda: painted(make_bmi_scatter(preop.bmi, "BMI", "Patient", "BMI"))
+    yield "chart", "score_count_matrix", lambda: score_count_matrix(work.raw[PAIN])
+    yield "chart", "grouped_bar_figure", lambda: drawn(grouped_bar_figure(preop.pain, "Pain", "Score", "N"))
+    yield "chart", "make_grouped_bar_chart", lambda: painted(
+        make_grouped_bar_chart(work.raw[PAIN], "Pain", "Score", "N"))
+
+    for name in ("preop", "operative", "discharge", "followup"):
+        def update_view(name=name):
+            window = work.window()
+            work.render(window, work.pages(window)[name])
+        yield "update_view", name, update_view
+
+
+def traced(func):
+    """tracemalloc peak of one run and the memory blocks it leaves allocated."""
+    blocks = sys.getallocatedblocks()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    settle()
+    return peak, sys.getallocatedblocks() - blocks
+
+
+def measure(func, repeat, budget):
+    """Timings of up to `repeat` runs (at least 3, fewer once `budget` s are spent)."""
+    func()  # warm-up
+    settle()
+    times = []
+    start = time.perf_counter()
+    while len(times) < repeat and (len(times) < 3 or time.perf_counter() - start < budget):
+        t0 = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t0)
+    settle()
+
+    peak, blocks = traced(func)
+    # what measuring a no-op leaves behind is not the case's
+    blocks -= traced(lambda: None)[1]
+
+    times_ms = np.array(times) * 1000
+    return {
+        "runs": len(times),
+        "median_ms": round(float(np.median(times_ms)), 4),
+        "p95_ms": round(float(np.percentile(times_ms, 95)), 4),
+        "min_ms": round(float(times_ms.min()), 4),
+        "peak_kib": round(peak / 1024, 1),
+        "blocks": blocks,
+    }
+
+
+def run(sizes=SIZES, groups=GROUPS, repeat=20, budget=10.0, seed=0, log=print):
+    """Measure every case of `groups` at every size; returns the JSON document."""
+    app = QApplication.instance() or QApplication(sys.argv)
+    results = []
+    with tempfile.TemporaryDirectory() as folder:
+        for rows in sizes:
+            work = Workload(rows, seed, folder)
+            for group, name, func in cases(work):
+                if group not in groups:
+                    continue
+                result = {"case": f"{group}/{name}", "rows": rows,
+                          **measure(func, repeat, budget)}
+                results.append(result)
+                log(f"{result['case']:<32} {rows:>9,}  median {result['median_ms']:10.3f} ms"
+                    f"  p95 {result['p95_ms']:10.3f} ms  peak {result['peak_kib']:10.1f} KiB"
+                    f"  blocks {result['blocks']:+d}")
+            work.close()
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "qt_platform": app.platformName(),
+        "seed": seed,
+        "results": results,
+    }
+
+
+def compare(baseline, current, tolerance=0.25, min_ms=0.05, min_kib=64):
+    """
+    Regressions of `current` against `baseline` (both run() documents):
+    (case, rows, metric, before, after) where the median time or the
+    peak allocation grew by more than `tolerance` and by more than
+    `min_ms` / `min_kib`, so noise on tiny cases doesn't count.
+    """
+    before = {(r["case"], r["rows"]): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        old = before.get((result["case"], result["rows"]))
+        if old is None:
+            continue
+        for metric, floor in (("median_ms", min_ms), ("peak_kib", min_kib)):
+            a, b = old[metric], result[metric]
+            if b > a * (1 + tolerance) and b - a > floor:
+                regressions.append((result["case"], result["rows"], metric, a, b))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python tests/benchmark_suite.py")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_cmd = commands.add_parser("run", help="run the benchmarks, write JSON")
+    run_cmd.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    run_cmd.add_argument("--groups", nargs="+", default=GROUPS, choices=GROUPS)
+    run_cmd.add_argument("--repeat", type=int, default=20, help="runs per case")
+    run_cmd.add_argument("--budget", type=float, default=10.0,
+                         help="seconds per case after which fewer runs are taken")
+    run_cmd.add_argument("--seed", type=int, default=0)
+    run_cmd.add_argument("--out", default="bench.json")
+    cmp_cmd = commands.add_parser("compare", help="flag regressions against a baseline")
+    cmp_cmd.add_argument("baseline")
+    cmp_cmd.add_argument("current")
+    cmp_cmd.add_argument("--tolerance", type=float, default=0.25,
+                         help="allowed relative growth (0.25 = 25 %%)")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        doc = run(args.sizes, args.groups, args.repeat, args.budget, args.seed)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(doc, f, indent=1)
+        print(f"{len(doc['results'])} results -> {args.out}")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, args.tolerance)
+    for case, rows, metric, a, b in regressions:
+        change = f"{b / a - 1:+.0%}" if a else "new"
+        print(f"REGRESSION {case:<32} {rows:>9,}  {metric:<9} {a:10.3f} -> {b:10.3f}  ({change})")
+    print(f"{len(regressions)} regression(s) against {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+import os
+import sys
+import subprocess
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+from analytics import (
+    summarize_discharge,
+    summarize_followup,
+    summarize_operative,
+    summarize_preop
+)
+from data_loader import dataset
+from filters import FilterSpec
+
+SPEC = FilterSpec(year="2021-2025", gender="Female", age_group="55 - 64")
+
+
+def test_analytics_runs_without_qt():
+    code = (
+        "import sys, analytics, data_loader\n"
+        "analytics.summarize_preop(data_loader.dataset)\n"
+        "assert not any(m.startswith('PyQt5') for m in sys.modules), 'Qt imported'\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+
+
+def test_preop_summary_matches_rows():
+    df = dataset.frame.take(dataset.rows(SPEC))
+    summary = summarize_preop(dataset, SPEC)
+
+    assert summary.n == len(df)
+    assert summary.gender.to_dict() == {"Female": len(df)}
+    assert summary.stats["Total patients"] == len(df)
+    assert summary.stats["Mean BMI"] == f"{df['BMI'].mean():.1f}"
+    assert summary.stats["Mean Pain (rest)"] == f"{df['Pain_rest'].mean():.1f}"
+    pd.testing.assert_series_equal(summary.bmi, df["BMI"].dropna())
+
+    rest = df["Pain_rest"].value_counts()
+    assert summary.pain["Pain_rest"][summary.pain["Pain_rest"] > 0].to_dict() == rest.to_dict()
+    assert summary.comorbidities["Smoker"] == df["Smoker"].sum()
+
+
+def test_operative_summary_by_type():
+    df = dataset.frame.take(dataset.rows(SPEC))
+
+    ghr = summarize_operative(dataset, SPEC, op_type="GHR")
+    assert ghr.phr_stoma is None and ghr.pvhr_subtypes is None
+    assert ghr.ghr_sides.sum() == (df["GHR_Side_Right"] | df["GHR_Side_Left"]).sum()
+    assert "Bilateral %" in ghr.stats
+
+    pvhr = summarize_operative(dataset, SPEC, op_type="PVHR")
+    assert pvhr.ghr_sides is None
+    assert pvhr.stats["Common Subtype"] == df["PVHR_Subtype"].value_counts().idxmax()
+
+
+def test_complication_summaries():
+    df = dataset.frame.take(dataset.rows(SPEC))
+
+    discharge = summarize_discharge(dataset, SPEC)
+    assert discharge.missing_columns == []
+    assert discharge.stats["With complications"] == df["Intra_Complications"].sum()
+    assert (discharge.complication_types > 0).all()
+
+    followup = summarize_followup(dataset, SPEC)
+    assert followup.occurrences.sum() == df["Followup_Complications"].notna().sum()
+    assert followup.stats["Total patients"] == len(df)
+
+
+def test_empty_filter():
+    spec = FilterSpec(year="1999")
+    summary = summarize_preop(dataset, spec)
+    assert summary.n == 0
+    assert summary.gender is None and summary.pain is None
+    assert summary.stats["Mean Comorbidities"] == "N/A"
+    assert np.isnan(dataset.aggregate(spec).mean("Pain_rest"))
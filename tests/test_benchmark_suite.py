@@ -0,0 +1,33 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import benchmark_suite
+
+
+def result(case, median_ms, peak_kib=100.0, rows=1000):
+    return {"case": case, "rows": rows, "median_ms": median_ms, "peak_kib": peak_kib}
+
+
+def test_compare_flags_slower_and_bigger_cases_only():
+    baseline = {"results": [result("filter/index", 10.0), result("chart/x", 1.0, 1000.0),
+                            result("aggregate/preop", 0.01)]}
+    current = {"results": [result("filter/index", 14.0), result("chart/x", 1.0, 2000.0),
+                           result("aggregate/preop", 0.03), result("load/new", 50.0)]}
+    regressions = benchmark_suite.compare(baseline, current, tolerance=0.25)
+    # 0.01 -> 0.03 ms is under the noise floor, new cases have no baseline
+    assert regressions == [("filter/index", 1000, "median_ms", 10.0, 14.0),
+                           ("chart/x", 1000, "peak_kib", 1000.0, 2000.0)]
+    assert benchmark_suite.compare(baseline, baseline) == []
+
+
+def test_run_reports_every_case_of_the_groups(qapp):
+    doc = benchmark_suite.run(sizes=[200], groups=["filter", "aggregate"],
+                              repeat=3, log=lambda line: None)
+    cases = {r["case"] for r in doc["results"]}
+    assert {"filter/index", "aggregate/preop", "aggregate/followup"} <= cases
+    assert not any(case.startswith(("parse/", "chart/")) for case in cases)
+    for r in doc["results"]:
+        assert r["rows"] == 200 and r["runs"] == 3
+        assert 0 <= r["median_ms"] <= r["p95_ms"]
@@ -0,0 +1,143 @@
+import sys
+import os
+import pandas as pd
+from PyQt5.QtCore import QSize
+from PyQt5.QtGui import QImage, QColor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from chart_cache import ChartCache, ChartImage, cached_chart
+from chart_utils import BarChart
+from data_loader import Dataset
+from filters import FilterSpec
+from pages.preop_page import SECTION_FIGURES, build_preop
+import synthetic
+
+
+def _image(width=10, height=10, color="red"):
+    image = QImage(width, height, QImage.Format_RGBA8888)
+    image.fill(QColor(color))
+    return image
+
+
+def test_memory_tier_evicts_least_recently_used(qtbot):
+    size = _image().sizeInBytes()
+    cache = ChartCache(max_bytes=2 * size)
+    cache.put("a", (1,), _image())
+    cache.put("b", (1,), _image())
+    assert cache.get("a", (1,)) is not None    # a is now the newest
+    cache.put("c", (1,), _image())
+
+    assert len(cache) == 2 and cache.bytes == 2 * size
+    assert cache.get("b", (1,)) is None
+    assert cache.get("a", (1,)) is not None
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_disk_tier_survives_a_new_cache(qtbot, tmp_path):
+    first = ChartCache(directory=str(tmp_path), fingerprint="abc")
+    first.put("preop/age", ("All", 2024), _image(color="blue"))
+
+    second = ChartCache(directory=str(tmp_path), fingerprint="abc")
+    image = second.get("preop/age", ("All", 2024))
+    assert image is not None and second.disk_hits == 1
+    assert QColor(image.pixel(0, 0)) == QColor("blue")
+    # promoted to memory
+    assert second.get("preop/age", ("All", 2024)) is not None
+    assert second.disk_hits == 1 and second.hits == 1
+
+    # another workbook never sees these files
+    other = ChartCache(directory=str(tmp_path), fingerprint="def")
+    assert other.get("preop/age", ("All", 2024)) is None
+
+
+def test_no_disk_tier_without_fingerprint(qtbot, tmp_path):
+    cache = ChartCache(directory=str(tmp_path), fingerprint=None)
+    cache.put("a", (), _image())
+    assert cache.directory is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_cached_chart_stores_first_draw_and_shows_image(qtbot):
+    cache = ChartCache()
+    chart = BarChart("Counts", "", "Number")
+    data = pd.Series([3, 1], index=["A", "B"])
+    make_canvas = lambda: chart.update(data).widget()
+    make_figure = lambda: chart.update(data).figure
+
+    canvas = cached_chart(cache, "counts", ("All",), make_canvas, make_figure)
+    assert canvas is chart.canvas
+    canvas.draw()
+    assert len(cache) == 1
+
+    shown = cached_chart(cache, "counts", ("All",), make_canvas, make_figure)
+    qtbot.addWidget(shown)
+    assert isinstance(shown, ChartImage)
+    assert not shown.pixmap().isNull()
+    # downloads still get the real figure
+    assert shown.figure is chart.figure
+
+
+def test_contains_checks_both_tiers_without_loading(qtbot, tmp_path):
+    cache = ChartCache(directory=str(tmp_path), fingerprint="abc")
+    assert ("a", (1,)) not in cache
+    cache.put("a", (1,), _image())
+    assert ("a", (1,)) in cache
+
+    fresh = ChartCache(directory=str(tmp_path), fingerprint="abc")
+    assert ("a", (1,)) in fresh
+    assert len(fresh) == 0 and (fresh.hits, fresh.disk_hits, fresh.misses) == (0, 0, 0)
+
+
+def test_chart_image_scales_with_its_size(qtbot):
+    shown = ChartImage(_image(60, 40), lambda: None, min_h=10)
+    qtbot.addWidget(shown)
+    assert shown.sizeHint() == QSize(60, 40)
+
+    shown.resize(300, 100)
+    shown.show()
+    qtbot.waitExposed(shown)
+    assert shown.pixmap().size() == QSize(150, 100)
+    shown.resize(30, 100)
+    qtbot.waitUntil(lambda: shown.pixmap().size() == QSize(30, 20))
+
+
+def test_build_preop_skips_cached_figures(qtbot):
+    ds = Dataset.from_frame(synthetic.generate(300, 0))
+    ds.load()
+    expanded = frozenset(SECTION_FIGURES)
+
+    _, figures = build_preop(ds, FilterSpec(), expanded)
+    assert set(figures) == {key for keys in SECTION_FIGURES.values() for key in keys}
+
+    _, figures = build_preop(ds, FilterSpec(), expanded, cached={"pain", "bmi_scatter"})
+    assert set(figures) == {"restrictions", "esthetic"}
+    # still built when a cached image went missing after all
+    assert figures["pain"] is not None
+
+
+def test_preop_charts_are_cached_once_for_every_operation_type(qtbot):
+    from pages.main_window import MainWindow
+    from ui_helpers import CollapsibleSection
+
+    window = MainWindow(Dataset.from_frame(synthetic.generate(300, 0)))
+    qtbot.addWidget(window)
+    page = window.preop_page
+    window.current_op_type = "GHR"
+    window.show()
+    window.show_preop_page()
+    page.renderer.wait()
+    for i in range(page.vlay.count()):
+        section = page.vlay.itemAt(i).widget()
+        if isinstance(section, CollapsibleSection):
+            section.toggle_button.click()
+    qtbot.waitUntil(lambda: len(window.chart_cache) > 0)
+    qtbot.wait(50)
+    stored = len(window.chart_cache)
+
+    window.current_op_type = "PHR"
+    window.show_preop_page()
+    page.renderer.wait()
+    assert page.findChildren(ChartImage)
+    qtbot.wait(50)
+    assert len(window.chart_cache) == stored
@@ -7,7 +7,18 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from chart_utils import (
+    BarChart,
+    FigureManager,
+    HistogramChart,
+    LazyFigures,
+    NativeBarChart,
+    live_figure_count,
+    new_figure,
+    count_chart,
+    grouped_bar_figure,
     make_bar_chart,
+    make_grouped_bar_chart,
+    score_count_matrix,
     make_histogram,
     make_bmi_scatter
 )
@@ -17,7 +28,8 @@ def sample_data():
     return pd.Series([10, 15, 7, 12, 8], index=["A", "B", "C", "D", "E"])
 
 def test_make_bar_chart(sample_data):
-    canvas = make_bar_chart(sample_data, "Test Chart", "X-Axis", "Y-Axis")
+    canvas = make_bar_chart(sample_data, "Test Chart", "X-Axis", "Y-Axis",
+                            backend="matplotlib")
     assert isinstance(canvas, FigureCanvas)
     assert canvas.minimumHeight() >= 600
 
@@ -29,3 +41,137 @@ def test_make_histogram(sample_data):
 def test_make_bmi_scatter(sample_data):
     canvas = make_bmi_scatter(sample_data, "BMI Scatter", "Index", "BMI")
     assert isinstance(canvas, FigureCanvas)
+
+
+def test_lazy_figures_build_once():
+    calls = []
+
+    def build(summary):
+        calls.append(summary)
+        return f"fig of {summary}"
+
+    figures = LazyFigures({"a": build, "b": build}, "s").prebuild(["a"])
+    assert calls == ["s"]
+    assert figures["a"] == "fig of s" and figures["b"] == "fig of s"
+    figures["b"]
+    assert calls == ["s", "s"]
+
+
+def _png(fig):
+    import io
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png")
+    return buf.getvalue()
+
+
+def test_bar_chart_updates_in_place():
+    chart = BarChart("Counts", "", "Number")
+    fig = chart.figure
+    chart.update(pd.Series([3, 9, 4], index=["a", "b", "c"]))
+    bars = chart.bars
+
+    chart.update(pd.Series([5, 1, 2], index=["a", "b", "c"]))
+    assert chart.figure is fig and chart.bars is bars
+    assert [rect.get_height() for rect in bars] == [5, 1, 2]
+    assert [t.get_text() for t in chart.texts] == ["5", "1", "2"]
+    assert chart.ax.get_ylim()[1] == pytest.approx(7)
+
+    # a different number of categories replaces the bars only
+    chart.update(pd.Series([7, 8], index=["x", "y"]))
+    assert len(chart.bars) == 2 and len(chart.texts) == 2
+    assert [t.get_text() for t in chart.ax.get_xticklabels()] == ["x", "y"]
+
+    fresh = BarChart("Counts", "", "Number").update(pd.Series([7, 8], index=["x", "y"]))
+    assert _png(chart.figure) == _png(fresh.figure)
+
+
+def test_histogram_chart_rebins_on_update():
+    chart = HistogramChart("BMI", "BMI", "Number")
+    chart.update(pd.Series([20.0, 21.5, 30.0]), bins=[18, 22, 26, 30, 34])
+    assert len(chart.patches) == 4 and len(chart.texts) == 4
+
+    chart.update(pd.Series([25.0, 26.0]), bins=[24, 26, 28])
+    assert len(chart.patches) == 2
+    assert len(chart.ax.patches) == 2
+    assert [t.get_text() for t in chart.texts] == ["1", "1"]
+
+
+def test_figure_manager_releases_render_canvases(qtbot):
+    import gc
+    from PyQt5.QtCore import QCoreApplication, QEvent
+
+    manager = FigureManager()
+    bars = manager.chart("counts", lambda: BarChart("Counts", "", "Number"))
+    assert manager.chart("counts", lambda: None) is bars
+    bars.update(pd.Series([1, 2])).widget()
+
+    gc.collect()
+    before = live_figure_count()
+    for _ in range(5):
+        manager.canvas(new_figure())
+    assert manager.live_canvases == 6
+
+    manager.release()
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+    gc.collect()
+
+    assert manager.live_canvases == 1
+    assert live_figure_count() == before
+    # the page's own chart survives the teardown
+    assert bars.canvas.parent() is None and bars.canvas.figure is bars.figure
+
+
+def test_make_bar_chart_paints_natively_on_gui_thread(qtbot, sample_data):
+    widget = make_bar_chart(sample_data, "Test Chart", "X-Axis", "Y-Axis")
+    qtbot.addWidget(widget)
+    assert isinstance(widget.chart, NativeBarChart)
+    assert widget.chart.categories == ["A", "B", "C", "D", "E"]
+    widget.resize(600, 400)
+    assert not widget.grab().isNull()
+
+    # export goes through matplotlib and matches the BarChart output
+    expected = BarChart("Test Chart", "X-Axis", "Y-Axis").update(sample_data)
+    assert _png(widget.figure) == _png(expected.figure)
+
+
+def test_count_chart_falls_back_to_matplotlib_off_gui_thread(qtbot):
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(1) as pool:
+        chart = pool.submit(count_chart, "Counts", "", "Number").result()
+    assert isinstance(chart, BarChart)
+    assert isinstance(count_chart("Counts", "", "Number"), NativeBarChart)
+
+
+def test_score_count_matrix_matches_value_counts():
+    import numpy as np
+
+    scores = pd.DataFrame({
+        "rest": [0, 2, 2, np.nan, 5, 0],
+        "activity": [2, 2, 5, 5, np.nan, np.nan],
+    })
+    matrix = score_count_matrix(scores)
+    expected = pd.DataFrame({col: scores[col].value_counts() for col in scores})
+    expected = expected.fillna(0).astype(int).sort_index()
+    assert list(matrix.index) == [0, 2, 5]   # 1, 3, 4 nobody gave
+    assert (matrix.to_numpy() == expected.to_numpy()).all()
+    assert score_count_matrix(scores.iloc[:0]).empty
+
+
+def test_grouped_bar_figure_labels_every_bar():
+    counts = pd.DataFrame({"a": [3, 0, 4], "b": [1, 2, 6]}, index=[0, 1, 2])
+    fig = grouped_bar_figure(counts, "Scores", "Score", "Count",
+                             labels=["First", "Second"], width=0.35)
+    ax = fig.axes[0]
+    assert [round(p.get_x() + p.get_width() / 2, 3) for p in ax.patches] == \
+        [-0.175, 0.825, 1.825, 0.175, 1.175, 2.175]
+    assert [t.get_text() for t in ax.texts] == ["3", "0", "4", "1", "2", "6"]
+    assert [t.get_text() for t in ax.get_legend().get_texts()] == ["First", "Second"]
+    assert ax.get_ylim()[1] == pytest.approx(6 * 1.4)
+
+
+def test_make_grouped_bar_chart_counts_raw_scores(qtbot):
+    scores = pd.DataFrame({"x": [1, 1, 3], "y": [3, 3, 3]})
+    canvas = make_grouped_bar_chart(scores, "Scores", "", "Count")
+    heights = [p.get_height() for p in canvas.figure.axes[0].patches]
+    assert heights == [2, 1, 0, 3]
@@ -0,0 +1,57 @@
+import os
+import sys
+import itertools
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from data_loader import dataset
+
+
+def check_slice(frame, agg):
+    assert agg.n == len(frame)
+
+    for name in ['Gender', 'Age', 'Indication', 'PHR_Stoma_Type',
+                 'PVHR_Subtype', 'Intra_Complications']:
+        expected = frame[name].value_counts()
+        got = agg.counts(name)
+        got = got[got > 0]
+        expected = expected[expected > 0]
+        assert got.to_dict() == expected.to_dict(), name
+
+    for name in ['Pain_rest', 'Restrict_heavy', 'Esthetic_hernia',
+                 'GHR_Prev_Repairs_Right', 'IVHR_Prev_Repairs']:
+        values = frame[name].dropna()
+        expected = values.astype(int).value_counts()
+        got = agg.counts(name)
+        assert got[got > 0].to_dict() == expected.to_dict(), name
+        if values.empty:
+            assert np.isnan(agg.mean(name))
+        else:
+            assert np.isclose(agg.mean(name), values.mean())
+
+    flags = ['Diabetes', 'Smoker', 'GHR_Type_Left_Femoral', 'Comp_SSI', 'FU_Pain']
+    assert agg.flag_sums(flags).to_dict() == frame[flags].sum().to_dict()
+
+    right, left = frame['GHR_Side_Right'], frame['GHR_Side_Left']
+    sides = agg.counts('GHR_Side')
+    assert sides['Bilateral'] == (right & left).sum()
+    assert sides['Right'] == (right & ~left).sum()
+    assert sides['Left'] == (left & ~right).sum()
+
+
+def test_cube_matches_value_counts_on_exported_data():
+    frame = dataset.frame
+    for op, year, gender, age in itertools.product(
+            [None, "GHR", "IVHR"], ["2021-2025", "2023"],
+            ["All", "Male"], ["All", "55 - 64"]):
+        rows = dataset.rows(op, year, gender, age)
+        check_slice(frame.take(rows), dataset.aggregate(op, year, gender, age))
+
+
+def test_empty_selection():
+    agg = dataset.aggregate(year="1999")
+    assert agg.n == 0
+    assert agg.counts('Gender').sum() == 0
+    assert np.isnan(agg.mean('Pain_rest'))
+    assert 'Gender' in agg and 'Smoker' in agg and 'BMI' not in agg
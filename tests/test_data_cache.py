@@ -0,0 +1,107 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from data_cache import (
+    cache_dir_for,
+    invalidate_cache,
+    load_cached,
+    read_cache
+)
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / "export.xlsx"
+    pd.DataFrame({
+        "Gender of the patient": ["male", "female", None],
+        "BMI": [24.5, None, 31.0],
+        "Flag": [True, None, False],
+        "Date of Operation": ["2021-01-08", "2022-03-01", "bad"],
+    }).to_excel(path, index=False)
+    return str(path)
+
+
+def counting_parse(calls):
+    def parse(path):
+        calls.append(path)
+        df = pd.read_excel(path)
+        if "Date of Operation" in df.columns:
+            df["Date of Operation"] = pd.to_datetime(
+                df["Date of Operation"], errors="coerce")
+        return df
+    return parse
+
+
+def test_second_load_is_served_from_cache(workbook):
+    calls = []
+    first = load_cached(workbook, counting_parse(calls))
+    second = load_cached(workbook, counting_parse(calls))
+
+    assert len(calls) == 1
+    assert os.path.isdir(cache_dir_for(workbook))
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_modified_workbook_invalidates_cache(workbook):
+    calls = []
+    load_cached(workbook, counting_parse(calls))
+
+    pd.DataFrame({"BMI": [20.0]}).to_excel(workbook, index=False)
+    df = load_cached(workbook, counting_parse(calls))
+
+    assert len(calls) == 2
+    assert list(df.columns) == ["BMI"]
+
+
+def test_corrupt_cache_falls_back_to_parse(workbook):
+    calls = []
+    load_cached(workbook, counting_parse(calls))
+    with open(os.path.join(cache_dir_for(workbook), "c0.npy"), "wb") as f:
+        f.write(b"garbage")
+
+    with pytest.warns(UserWarning):
+        assert read_cache(workbook) is None
+    df = load_cached(workbook, counting_parse(calls))
+
+    assert len(calls) == 2
+    assert len(df) == 3
+
+
+def test_invalidate_and_rebuild(workbook):
+    calls = []
+    load_cached(workbook, counting_parse(calls))
+
+    load_cached(workbook, counting_parse(calls), rebuild=True)
+    assert len(calls) == 2
+
+    invalidate_cache(workbook)
+    assert read_cache(workbook) is None
+
+
+def test_cache_never_stores_or_loads_pickles(workbook):
+    df = load_cached(workbook, counting_parse([]))
+    cache_dir = cache_dir_for(workbook)
+    for name in os.listdir(cache_dir):
+        if name.endswith(".npy"):
+            np.load(os.path.join(cache_dir, name), allow_pickle=False)
+    assert any(name.endswith(".uniques.json") for name in os.listdir(cache_dir))
+    pd.testing.assert_frame_equal(read_cache(workbook), df)
+
+    # a pickled object array planted in the cache is refused, not loaded
+    np.save(os.path.join(cache_dir, "c0.npy"),
+            np.array([object(), None, None], dtype=object), allow_pickle=True)
+    with pytest.warns(UserWarning, match="corrupt data cache"):
+        assert read_cache(workbook) is None
+
+
+def test_uncacheable_values_leave_no_cache(workbook):
+    df = pd.DataFrame({"When": [pd.Timestamp("2021-01-01"), "x", None]})
+    with pytest.warns(UserWarning, match="Could not write data cache"):
+        load_cached(workbook, lambda path: df)
+    assert not os.path.exists(cache_dir_for(workbook))
+    assert not os.path.exists(cache_dir_for(workbook) + ".tmp")
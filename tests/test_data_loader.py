@@ -5,6 +5,7 @@ import pandas as pd
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from data_loader import (
+    Dataset,
     load_preop_data,
     load_oper_data,
     load_discharge_data,
@@ -35,3 +36,25 @@ def test_load_followup_data():
     assert isinstance(df, pd.DataFrame)
     assert not df.empty
     assert 'Followup_Complications' in df.columns
+
+def test_compact_dtypes():
+    df = load_preop_data()
+    assert df['Age'].cat.ordered
+    assert list(df['Age'].cat.categories[:2]) == ["<  25", "25 - 34"]
+    assert df['Diabetes'].dtype == bool
+    assert str(df['Pain_rest'].dtype) == 'Int8'
+    assert df['Pain_rest'].isna().any()
+
+def test_dataset_is_lazy_and_accepts_frames():
+    ds = Dataset(path="does-not-exist.xlsx")
+    assert not ds.loaded
+
+    ds = Dataset.from_frame(pd.DataFrame({
+        'Gender of the patient': ['male', 'female'],
+        'Date of Operation': ['2021-01-08', '2023-05-01'],
+        'BMI': [24.0, 30.5],
+    }))
+    view = ds.view('preop')
+    assert ds.loaded
+    assert list(view['Year']) == [2021, 2023]
+    assert 'BMI' in view.columns
@@ -0,0 +1,50 @@
+import os
+import sys
+import itertools
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from data_loader import dataset, filter_positions
+from filters import FilterEngine, FilterSpec, LRUCache
+
+
+def test_engine_matches_scanning_filter():
+    frame = dataset.frame
+    engine = FilterEngine(frame)
+    for year, gender, age in itertools.product(
+            [None, "2021-2025", "2022"], ["All", "Male", "Female"],
+            ["All", "<  25", "65 - 74"]):
+        spec = FilterSpec(year=year, gender=gender, age_group=age)
+        np.testing.assert_array_equal(
+            engine.positions(spec), filter_positions(frame, year, gender, age))
+
+
+def test_changing_age_reuses_year_and_sex_masks():
+    engine = FilterEngine(dataset.frame)
+    engine.mask(FilterSpec(year="2021-2025", gender="Male", age_group="<  25"))
+    scans = engine.scans
+
+    engine.mask(FilterSpec(year="2021-2025", gender="Male", age_group="65 - 74"))
+    assert engine.scans == scans + 1
+
+    mask = engine.mask(FilterSpec(year="2021-2025", gender="Male", age_group="<  25"))
+    assert engine.scans == scans + 1
+    assert not mask.flags.writeable
+
+
+def test_composed_masks_are_evicted_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert list(cache) == ["a", "c"]
+
+
+def test_spec_helpers():
+    spec = FilterSpec(year="2023", gender="Female", age_group="All")
+    assert FilterSpec.of(spec) is spec
+    assert FilterSpec.of(None, "2023", "Female") == spec
+    assert spec.unavailable_columns(["Year", "Age"]) == ["Gender"]
+    assert FilterSpec().unavailable_columns([]) == ["Year"]
@@ -0,0 +1,63 @@
+import os
+import sys
+import itertools
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from data_loader import Dataset, filter_positions
+from filters import parse_year_selection
+from partition_index import PartitionIndex
+
+
+def small_dataset():
+    return Dataset.from_frame(pd.DataFrame({
+        'Gender of the patient': ['male', 'female', 'male', None, 'female', 'male'],
+        'Age of patient at day of operation': [
+            '<  25', '55 - 64', '55 - 64', '>  75', None, '<  25'],
+        'Date of Operation': [
+            '2021-01-08', '2022-03-01', 'bad', '2025-12-31', '2021-06-06', '2023-02-02'],
+        'Please choose the indication for the abdominal wall repair': [
+            'Groin Hernia Repair', 'Parastomal Hernia Repair', None,
+            'Groin Hernia Repair', 'Primary Ventral Hernia Repair',
+            'Incisional Ventral Hernia Repair'],
+    }))
+
+
+def test_parse_year_selection():
+    assert parse_year_selection("2021-2023") == (2021, 2022, 2023)
+    assert parse_year_selection("2024") == (2024,)
+    assert parse_year_selection("All years") is None
+    assert parse_year_selection(None) is None
+
+
+def test_rows_match_scanning_filter():
+    frame = small_dataset().frame
+    index = PartitionIndex(frame)
+    years = [None, "2021-2025", "2021", "2022", "2025", "All years"]
+    genders = ["All", "Male", "Female"]
+    ages = ["All", "<  25", "55 - 64", ">  75", "35 - 44"]
+
+    for year, gender, age in itertools.product(years, genders, ages):
+        expected = filter_positions(frame, year, gender, age)
+        np.testing.assert_array_equal(index.rows(None, year, gender, age), expected)
+
+
+def test_rows_by_operation_type_and_cache():
+    ds = small_dataset()
+
+    ghr = ds.rows(op_type="GHR")
+    np.testing.assert_array_equal(ghr, [0, 3])
+    assert ds.rows(op_type="GHR") is ghr
+    assert len(ds.rows(op_type="PHR", year="2021")) == 0
+
+
+def test_rows_match_scanning_filter_on_exported_data():
+    from data_loader import dataset
+    frame = dataset.frame
+    for year in ["2021-2025", "2021", "2024"]:
+        for gender, age in itertools.product(["All", "Female"], ["All", "45 - 54"]):
+            np.testing.assert_array_equal(
+                dataset.rows(year=year, gender=gender, age_group=age),
+                filter_positions(frame, year, gender, age))
@@ -0,0 +1,53 @@
+import os
+import sys
+import json
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(ROOT)
+
+import render
+from analytics import summarize_operative
+from data_loader import dataset
+from filters import FilterSpec
+from pages import operative_page
+
+
+def test_jobs_render_op_type_independent_pages_once():
+    items = list(render.jobs(years=["2023"]))
+    assert ("operative", "GHR", "2023") in items
+    assert ("preop", None, "2023") in items
+    assert len(items) == len(render.OP_TYPES) + 3
+
+
+def test_slug_names_every_age_group_distinctly():
+    names = {render.slug(age) for age in render.AGE_OPTIONS}
+    assert len(names) == len(render.AGE_OPTIONS)
+    assert render.slug("<  25") == "lt-25" and render.slug("2021-2025") == "2021-2025"
+
+
+def test_render_all_writes_files_and_manifest(tmp_path):
+    manifest = render.render_all(str(tmp_path), workers=1, pages=["discharge"],
+                                 years=["2023"])
+    charts = manifest["charts"]
+    assert charts
+    assert {c["chart"] for c in charts} <= {"occurrences", "complication_types"}
+    for chart in charts:
+        assert (tmp_path / chart["file"]).stat().st_size > 0
+    with open(tmp_path / "manifest.json", encoding="utf-8") as f:
+        assert json.load(f)["charts"] == charts
+
+
+def test_render_all_in_process_pool_matches_serial(tmp_path):
+    kwargs = dict(pages=["followup"], years=["2022"], fmt="svg")
+    serial = render.render_all(str(tmp_path / "serial"), workers=1, **kwargs)
+    pooled = render.render_all(str(tmp_path / "pool"), workers=2, **kwargs)
+    files = lambda m: sorted(c["file"] for c in m["charts"])
+    assert files(serial) == files(pooled)
+    assert all(f.endswith(".svg") for f in files(pooled))
+
+
+def test_operative_export_follows_op_type_sections():
+    spec = FilterSpec(year="2021-2025")
+    summary = summarize_operative(dataset, spec, op_type="GHR")
+    keys = [key for key, _ in operative_page.export_figures(summary, "GHR")]
+    assert keys == [c.field for c in operative_page.charts_for("GHR")]
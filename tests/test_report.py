@@ -0,0 +1,64 @@
+import gc
+import os
+import sys
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from chart_utils import live_figure_count, new_figure
+from data_loader import dataset
+from report import Report, report_figures, write_report
+from workers import ReportWriter
+
+
+def test_write_report_streams_and_releases_figures(tmp_path):
+    path = tmp_path / "GHR_2023.pdf"
+    gc.collect()
+    before = live_figure_count()
+    written = []
+    pages = write_report(str(path), dataset, "GHR", "2023",
+                         progress=lambda n, name: written.append(name))
+
+    assert pages == len(written)
+    assert written[0] == "cover"
+    assert {"preop/stats", "operative/ghr_sides", "followup/occurrences"} <= set(written)
+    with open(path, "rb") as f:
+        assert f.read(5) == b"%PDF-"
+    gc.collect()
+    assert live_figure_count() == before
+
+
+def test_failed_report_leaves_no_file(tmp_path):
+    path = tmp_path / "broken.pdf"
+
+    def figures():
+        yield "first", new_figure()
+        raise RuntimeError("boom")
+
+    report = Report(str(path), figures())
+    assert report.step()
+    with pytest.raises(RuntimeError):
+        report.step()
+    report.abort()
+    assert not path.exists()
+
+
+def test_report_writer_runs_on_render_pool(qtbot, tmp_path):
+    path = tmp_path / "PHR_2022.pdf"
+    writer = ReportWriter(Report(str(path), report_figures(dataset, "PHR", "2022")))
+    progress = []
+    writer.progress.connect(lambda n, name: progress.append(n))
+    with qtbot.waitSignal(writer.finished, timeout=120000) as blocker:
+        writer.start()
+    assert blocker.args == [str(path)]
+    assert progress == list(range(1, writer.report.pages + 1))
+    assert path.stat().st_size > 0
+
+
+def test_cancelled_report_is_removed(qtbot, tmp_path):
+    path = tmp_path / "cancelled.pdf"
+    writer = ReportWriter(Report(str(path), report_figures(dataset, "GHR", "2023")))
+    writer.progress.connect(lambda n, name: writer.cancel())
+    with qtbot.waitSignal(writer.cancelled, timeout=60000):
+        writer.start()
+    assert writer.report.pages == 2 and not path.exists()
@@ -0,0 +1,74 @@
+import os
+import sys
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import schema
+from data_loader import (
+    DERIVED_COLUMNS,
+    build_canonical,
+    load_discharge_data,
+    load_followup_data,
+    load_oper_data,
+    load_preop_data,
+    parse_workbook
+)
+
+GENDER, AGE, BMI = ('Gender of the patient', 'Age of patient at day of operation', 'BMI')
+DIABETES = "Please specify the patient's comorbidities::Diabetes mellitus"
+PAIN_REST = 'Pain at the site of the hernia\nIn rest (laying down)'
+
+
+def test_missing_headers_lists_gaps_in_registry_order():
+    present = [h for h in schema.raw_headers() if h not in (AGE, BMI)]
+    assert schema.missing_headers(present + ["Unregistered"]) == [AGE, BMI]
+    assert schema.missing_headers(schema.raw_headers()) == []
+
+
+def test_parse_workbook_reads_registered_headers_and_warns_about_gaps(tmp_path):
+    path = tmp_path / "export.xlsx"
+    pd.DataFrame({
+        "Patient ID": [1, 2],
+        BMI: [24.5, 31.0],
+        GENDER: ["male", "female"],
+        'Date of Operation': ["2023-05-01", "2024-01-10"],
+    }).to_excel(path, index=False)
+
+    n_missing = len(schema.raw_headers()) - 3
+    with pytest.warns(UserWarning, match=f"is missing {n_missing} registered column"):
+        df = parse_workbook(str(path))
+
+    # projected to the registry, in registry order, plus the derived Year
+    assert list(df.columns) == [GENDER, 'Date of Operation', BMI, 'Year']
+    assert list(df['Year']) == [2023, 2024]
+
+
+def test_coercions_apply_fills_and_dtypes():
+    raw = pd.DataFrame({
+        GENDER: ["female", None, "male"],
+        DIABETES: [1.0, None, 0.0],
+        PAIN_REST: [3.0, None, "X  -  If the patient does not perform this activity"],
+        'Year': [2023, 2023, 2024],
+    })
+    df = build_canonical(raw)
+    assert list(df['Gender'].cat.categories[:2]) == ['male', 'female']
+    # flags: missing means not ticked
+    assert df['Diabetes'].tolist() == [True, False, False]
+    # scores: unanswered and "X" stay missing
+    assert df['Pain_rest'].dtype == 'Int8'
+    assert df['Pain_rest'].isna().tolist() == [False, True, True]
+
+
+@pytest.mark.parametrize("page, load", [
+    ("preop", load_preop_data),
+    ("oper", load_oper_data),
+    ("discharge", load_discharge_data),
+    ("followup", load_followup_data),
+])
+def test_loaders_return_the_registered_page_columns(page, load):
+    names = list(schema.rename_map(page).values())
+    assert names == [spec.name for spec in schema.page_columns(page)]
+    derived = DERIVED_COLUMNS['shared'] + DERIVED_COLUMNS.get(page, [])
+    assert list(load().columns) == names + derived
@@ -0,0 +1,64 @@
+import json
+import os
+import pstats
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from PyQt5.QtWidgets import QLabel
+
+import startup
+from workers import DatasetLoader
+
+
+class _Dataset:
+    def load(self, progress):
+        progress("Reading workbook")
+        return _parse_on_the_loader_thread()
+
+
+def _parse_on_the_loader_thread():
+    return sum(range(1000))
+
+
+def test_nothing_is_recorded_without_the_flag():
+    assert not startup.begin(["--trace", "x.json"])
+    startup.phase("import PyQt5")
+    assert not startup.enabled() and startup.finish() is None
+
+
+def test_breakdown_times_each_phase_until_the_next():
+    phases = [("imports", 1.0, 10.0), ("splash", 1.5, 40.0),
+              ("load: Reading workbook", 1.75, 45.0), ("end", 2.0, 44.0)]
+    assert startup.breakdown(phases) == [
+        ("imports", 500.0, 40.0, None),
+        ("splash", 250.0, 45.0, 5.0),
+        ("load: Reading workbook", 250.0, 44.0, -1.0),
+    ]
+    text = startup.report(startup.breakdown(phases))
+    assert text.splitlines()[-1].split() == ["imports", "to", "first", "frame", "1000.0"]
+
+
+def test_profile_ends_at_the_first_paint(qtbot, tmp_path):
+    out, stats = tmp_path / "startup.json", tmp_path / "startup.pstats"
+    assert startup.begin(["--profile-startup", str(out), "--cprofile", str(stats)])
+    loader = DatasetLoader(_Dataset())
+    with qtbot.waitSignal(loader.loaded):
+        loader.start()
+    loader.wait()
+    startup.phase("MainWindow")
+    startup.phase("MainWindow")  # repeated stages are one phase
+    window = QLabel("registry")
+    qtbot.addWidget(window)
+    startup.phase("show, first paint")
+    done = []
+    startup.finish_on_first_paint(window, then=lambda: done.append(True))
+    window.show()
+    qtbot.waitUntil(lambda: bool(done), timeout=5000)
+
+    assert not startup.enabled()
+    phases = [p["phase"] for p in json.loads(out.read_text())["phases"]]
+    assert phases[-3:] == ["import PyQt5", "MainWindow", "show, first paint"]
+    # the loader thread is in the dump too
+    functions = {name for _, _, name in pstats.Stats(str(stats)).stats}
+    assert "_parse_on_the_loader_thread" in functions
@@ -0,0 +1,61 @@
+import os
+import sys
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import schema
+import synthetic
+from analytics import summarize_preop
+from data_cache import read_cache
+from data_loader import Dataset, parse_workbook
+from filters import FilterSpec
+
+
+def test_generate_is_deterministic_per_seed():
+    a = synthetic.generate(500, seed=7)
+    pd.testing.assert_frame_equal(a, synthetic.generate(500, seed=7))
+    assert not a.equals(synthetic.generate(500, seed=8))
+
+
+def test_generate_has_export_headers_and_values():
+    df = synthetic.generate(2000, seed=1)
+    assert list(df.columns) == schema.raw_headers()
+    assert set(df["Age of patient at day of operation"].dropna()) <= set(schema.AGE_GROUPS)
+    assert synthetic.NOT_PERFORMED in set(df["Restrictions of activities\nDuring sports"])
+    op_type = df["Please choose the indication for the abdominal wall repair"]
+    other = op_type.notna() & (op_type != "Groin Hernia Repair")
+    assert df.loc[other, "Side of the groin hernia? Bilateral?::Right"].isna().all()
+
+
+def test_csv_and_xlsx_load_like_the_frame(tmp_path):
+    df = synthetic.generate(300, seed=2)
+    for name in ("s.csv", "s.xlsx"):
+        path = str(tmp_path / name)
+        synthetic.write(df, path)
+        pd.testing.assert_frame_equal(Dataset(path).load(), Dataset.from_frame(df).load())
+
+
+def test_xlsx_is_padded_to_the_full_export(tmp_path):
+    df = synthetic.generate(300, seed=3)
+    padded = synthetic.pad_to_export(df)
+    headers = synthetic.export_headers()
+    assert len(headers) > 800 and list(padded.columns) == headers
+    pd.testing.assert_frame_equal(padded[df.columns].astype(object), df.astype(object))
+    filler = padded.drop(columns=df.columns)
+    assert filler.notna().to_numpy().mean() < 0.001
+
+    path = synthetic.write(df, str(tmp_path / "s.xlsx"))
+    assert list(pd.read_excel(path, nrows=0).columns) == headers
+    assert list(pd.read_csv(synthetic.write(df, str(tmp_path / "s.csv")))) == schema.raw_headers()
+
+
+def test_cache_is_primed_and_summaries_run(tmp_path):
+    path = str(tmp_path / "c.csv")
+    synthetic.main(["--rows", "1000", "--out", path, "--cache"])
+    assert os.path.isdir(path + ".cache")
+    # the cache holds exactly what parsing the file gives
+    cached = read_cache(path, extra_key=schema.schema_key())
+    pd.testing.assert_frame_equal(cached, parse_workbook(path))
+    summary = summarize_preop(Dataset(path), FilterSpec(year="2021-2025"))
+    assert summary.n > 0
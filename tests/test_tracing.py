@@ -0,0 +1,59 @@
+import json
+import os
+import sys
+import threading
+import time
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import tracing
+from data_loader import filter_positions
+
+
+def test_spans_cost_nothing_and_record_nothing_when_off():
+    assert not tracing.enabled()
+    assert tracing.span("x") is tracing.span("y")
+    with tracing.span("x"):
+        pass
+    assert tracing.stop() is None
+
+
+def test_spans_nest_and_write_chrome_trace(tmp_path):
+    path = tmp_path / "trace.json"
+    tracing.start(str(path))
+    with tracing.span("outer", rows=3):
+        time.sleep(0.01)
+        with tracing.span("inner"):
+            time.sleep(0.02)
+    def work():
+        with tracing.span("other thread"):
+            pass
+    worker = threading.Thread(target=work)
+    worker.start()
+    worker.join()
+    events = tracing.stop(summary=False)
+
+    stats = tracing.span_stats(events)
+    calls, total, own, _ = stats["outer"]
+    assert calls == 1 and own >= 0.01e9 and total - own >= stats["inner"][1]
+    # sorted by own time: inner (20 ms) before outer (10 ms)
+    assert [line.split()[0] for line in tracing.summary_table(events).splitlines()[1:3]] == \
+        ["inner", "outer"]
+
+    with open(path, encoding="utf-8") as f:
+        trace = json.load(f)["traceEvents"]
+    complete = {e["name"]: e for e in trace if e["ph"] == "X"}
+    assert complete["outer"]["args"] == {"rows": "3"}
+    assert complete["outer"]["dur"] >= complete["inner"]["dur"] > 0
+    assert complete["other thread"]["tid"] != complete["outer"]["tid"]
+    assert any(e["ph"] == "M" and e["args"]["name"] == "MainThread" for e in trace)
+
+
+def test_traced_functions_are_named_after_the_function():
+    df = pd.DataFrame({"Year": [2021, 2023], "Gender": ["male", "female"]})
+    tracing.start()
+    rows = filter_positions(df, "2023")
+    events = tracing.stop(summary=False)
+    assert list(rows) == [1]
+    assert [(e[0], e[1]) for e in events] == [("filter_positions", "data_loader")]
@@ -54,3 +54,39 @@ def test_add_download_button(qtbot):
     assert widget.layout().count() == 2
     assert isinstance(widget.layout().itemAt(0).widget(), FigureCanvas)
     assert isinstance(widget.layout().itemAt(1).widget(), QPushButton)
+
+
+def test_collapsible_section_builds_content_on_first_expand(qtbot):
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return [QLabel("a"), QLabel("b")]
+
+    section = CollapsibleSection("Lazy", factory=factory)
+    qtbot.addWidget(section)
+    assert not calls and not section.built
+
+    section.toggle_button.click()
+    section.toggle_button.click()
+    section.toggle_button.click()
+
+    assert calls == [1] and section.built
+    assert section.content_layout.count() == 2
+    assert section.content_area.maximumHeight() > 0
+
+
+def test_collapsible_section_remembers_expanded_titles(qtbot):
+    expanded = set()
+    first = CollapsibleSection("Ages", factory=lambda: QLabel("x"), expanded=expanded)
+    qtbot.addWidget(first)
+    first.toggle_button.click()
+    assert expanded == {"Ages"}
+
+    # the page rebuilds its sections for a new filter
+    second = CollapsibleSection("Ages", factory=lambda: QLabel("y"), expanded=expanded)
+    qtbot.addWidget(second)
+    assert second.toggle_button.isChecked() and second.built
+
+    second.toggle_button.click()
+    assert expanded == set()
@@ -0,0 +1,103 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import threading
+import pandas as pd
+from PyQt5.QtWidgets import QWidget
+from data_loader import Dataset
+from ui_helpers import BusyOverlay
+from workers import DatasetLoader, FilterScheduler, PageRenderer
+
+
+def test_dataset_loader_reports_stages(qtbot):
+    ds = Dataset.from_frame(pd.DataFrame({
+        'Gender of the patient': ['male'],
+        'Date of Operation': ['2022-02-02'],
+    }))
+    loader = DatasetLoader(ds)
+    stages = []
+    loader.progress.connect(stages.append)
+
+    with qtbot.waitSignal(loader.loaded, timeout=5000):
+        loader.start()
+    loader.wait()
+
+    assert ds.loaded
+    assert stages == ["Reading workbook...", "Normalizing columns...",
+                      "Building indexes..."]
+
+
+def test_dataset_loader_reports_errors(qtbot):
+    loader = DatasetLoader(Dataset(path="missing.xlsx"))
+
+    with qtbot.waitSignal(loader.failed, timeout=5000) as blocker:
+        loader.start()
+    loader.wait()
+
+    assert "FileNotFoundError" in blocker.args[0]
+
+
+def test_page_renderer_applies_only_newest(qtbot):
+    page = QWidget()
+    qtbot.addWidget(page)
+    overlay = BusyOverlay(page)
+    renderer = PageRenderer(page, overlay)
+    gate = threading.Event()
+    computed, applied = [], []
+
+    def compute(i):
+        gate.wait(5)
+        computed.append(i)
+        return i
+
+    for i in range(5):
+        renderer.request(lambda i=i: compute(i), applied.append)
+    assert renderer.busy and not overlay.isHidden()
+    gate.set()
+    renderer.wait()
+
+    assert applied == [4]
+    assert renderer.dropped == 4
+    # requests superseded before they started are never computed
+    assert computed[-1] == 4 and len(computed) < 5
+    assert overlay.isHidden() and not renderer.busy
+
+
+def test_page_renderer_reports_failures(qtbot):
+    page = QWidget()
+    qtbot.addWidget(page)
+    renderer = PageRenderer(page)
+    errors = []
+
+    renderer.request(lambda: 1 / 0, lambda result: None, errors.append)
+    renderer.wait()
+
+    assert errors and errors[0].startswith("ZeroDivisionError")
+
+
+def test_filter_scheduler_coalesces_and_dedupes(qtbot):
+    state = {"age": "All"}
+    renders = []
+    scheduler = FilterScheduler(lambda: ("GHR", "2023", "All", state["age"]),
+                                lambda: renders.append(state["age"]), delay=20)
+
+    assert scheduler.request()
+    for age in ["18 - 24", "25 - 34", "35 - 44"]:
+        state["age"] = age
+        scheduler.schedule()
+    qtbot.waitUntil(lambda: len(renders) == 2, timeout=2000)
+
+    # same filter again, e.g. navigating back to the page
+    assert not scheduler.request()
+    state["age"] = "All"
+    scheduler.schedule()
+    state["age"] = "35 - 44"
+    scheduler.schedule()
+    qtbot.wait(60)
+
+    assert renders == ["All", "35 - 44"]
+    assert (scheduler.requested, scheduler.performed, scheduler.skipped) == (7, 2, 5)
+
+    scheduler.invalidate()
+    assert scheduler.request()
@@ -0,0 +1,51 @@
+import os
+import sys
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from data_loader import excel_path, parse_workbook, read_workbook
+from xlsx_stream import read_columns
+
+
+@pytest.fixture
+def tricky_workbook(tmp_path):
+    wb = Workbook()
+    ws = wb.active
+    ws.append(["Score", "Score", "Flag", "Text", "Mixed", "Ints", None])
+    ws.append([1, 2.5, "true", "a", "5", 3, "x"])
+    ws.append([None, 3, "false", "NA", "X  -  If the patient does not", 4])
+    ws.append([None] * 7)
+    ws.append([4.0, None, None, "#N/A", 7, 5, None])
+    ws.append([5, 1, "true", "b", None, 6])
+    ws.append([None] * 7)
+    path = tmp_path / "tricky.xlsx"
+    wb.save(path)
+    return str(path)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 100])
+def test_stream_matches_read_excel(tricky_workbook, chunk_size):
+    expected = pd.read_excel(tricky_workbook)
+    columns = list(expected.columns)
+
+    df = read_columns(tricky_workbook, columns, chunk_size=chunk_size)
+
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def test_stream_keeps_only_requested_columns(tricky_workbook):
+    progress = []
+    df = read_columns(tricky_workbook, ["Text", "Score.1", "Nope"],
+                      chunk_size=2, progress=lambda *args: progress.append(args))
+
+    assert list(df.columns) == ["Text", "Score.1"]
+    assert progress[-1][0] == len(df)
+
+
+def test_stream_engine_matches_exported_data():
+    expected = read_workbook()
+    df = parse_workbook(excel_path, engine="stream")
+    pd.testing.assert_frame_equal(df, expected)
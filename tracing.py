@@ -0,0 +1,175 @@
+# tracing.py
+"""
+Timing spans of the hot paths (loading, filtering, summaries, chart
+building, page renders), written as a Chrome trace-event file that
+chrome://tracing and https://ui.perfetto.dev open:
+
+    BIOMED_TRACE=trace.json python main.py      (or python main.py --trace trace.json)
+
+    with span("preop.bmi"):
+        ...
+
+    @traced
+    def build_canonical(raw): ...
+
+While tracing is off, span() returns a shared no-op context manager and a
+traced function costs one extra call and a global check.
+"""
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+
+ENV_VAR = "BIOMED_TRACE"
+
+_NO_SPAN = nullcontext()
+_events = None      # [(name, cat, start_ns, end_ns, thread id, args)] while on
+_threads = {}
+_path = None
+_origin = 0
+
+
+def start(path=None):
+    """Record spans from now on; `stop()` (or exit) writes them to `path`."""
+    global _events, _path, _origin
+    if _events is None:
+        _origin = time.perf_counter_ns()
+        _events = []
+        atexit.register(stop)
+    _path = path or _path
+
+
+def enabled():
+    return _events is not None
+
+
+def stop(summary=True):
+    """Stop recording; write the trace file and print the slowest spans."""
+    global _events
+    events, _events = _events, None
+    if events is None:
+        return None
+    atexit.unregister(stop)
+    if _path:
+        write(_path, events)
+    if summary and events:
+        print(summary_table(events), file=sys.stderr)
+        if _path:
+            print(f"trace -> {_path}", file=sys.stderr)
+    return events
+
+
+class _Span:
+    __slots__ = ("name", "cat", "args", "start")
+
+    def __init__(self, name, cat, args):
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        events = _events
+        if events is not None:
+            tid = threading.get_ident()
+            if tid not in _threads:
+                _threads[tid] = threading.current_thread().name
+            events.append((self.name, self.cat, self.start, end, tid, self.args))
+        return False
+
+
+def span(name, cat="app", **args):
+    """Context manager timing its block as `name`; `args` show in the trace viewer."""
+    if _events is None:
+        return _NO_SPAN
+    return _Span(name, cat, args or None)
+
+
+def traced(func=None, *, name=None):
+    """Decorator timing every call as a span named after the function."""
+    if func is None:
+        return functools.partial(traced, name=name)
+    label = name or func.__qualname__
+    cat = func.__module__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _events is None:
+            return func(*args, **kwargs)
+        with _Span(label, cat, None):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def trace_events(events):
+    """Chrome "complete" events (µs since start()) plus thread names."""
+    out = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid,
+            "args": {"name": name}} for tid, name in _threads.items()]
+    for name, cat, start_ns, end_ns, tid, args in events:
+        event = {"name": name, "cat": cat, "ph": "X", "pid": os.getpid(), "tid": tid,
+                 "ts": (start_ns - _origin) / 1000, "dur": (end_ns - start_ns) / 1000}
+        if args:
+            event["args"] = {k: str(v) for k, v in args.items()}
+        out.append(event)
+    return out
+
+
+def write(path, events=None):
+    events = _events if events is None else events
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": trace_events(events or []),
+                   "displayTimeUnit": "ms"}, f)
+
+
+def span_stats(events):
+    """{name: [calls, total ns, self ns, max ns]}; self excludes nested spans."""
+    stats = defaultdict(lambda: [0, 0, 0, 0])
+    by_thread = defaultdict(list)
+    for event in events:
+        by_thread[event[4]].append(event)
+    for thread_events in by_thread.values():
+        # parents start first, and before their children when they tie
+        thread_events.sort(key=lambda e: (e[2], -e[3]))
+        stack = []  # [end_ns, name, children ns]
+        for name, _, start_ns, end_ns, _, _ in thread_events:
+            while stack and stack[-1][0] <= start_ns:
+                _close(stats, stack.pop())
+            dur = end_ns - start_ns
+            if stack:
+                stack[-1][2] += dur
+            row = stats[name]
+            row[0] += 1
+            row[1] += dur
+            row[3] = max(row[3], dur)
+            stack.append([end_ns, name, 0, dur])
+        while stack:
+            _close(stats, stack.pop())
+    return dict(stats)
+
+
+def _close(stats, frame):
+    _, name, children, dur = frame
+    stats[name][2] += dur - children
+
+
+def summary_table(events, limit=20):
+    """The `limit` spans with the most time of their own, as text."""
+    stats = sorted(span_stats(events).items(), key=lambda kv: kv[1][2], reverse=True)
+    lines = [f"{'span':<40} {'calls':>7} {'total ms':>10} {'self ms':>10} {'max ms':>9}"]
+    for name, (calls, total, own, longest) in stats[:limit]:
+        lines.append(f"{name[:40]:<40} {calls:>7} {total / 1e6:>10.1f} "
+                     f"{own / 1e6:>10.1f} {longest / 1e6:>9.1f}")
+    return "\n".join(lines)
+
+
+if os.environ.get(ENV_VAR):
+    start(os.environ[ENV_VAR])
@@ -1,12 +1,27 @@
 # ui_helpers.py
+from PyQt5 import QtCore
 from PyQt5.QtWidgets import (
-    QWidget, QPushButton, QVBoxLayout, QSizePolicy, QFileDialog
+    QWidget, QPushButton, QVBoxLayout, QSizePolicy, QFileDialog, QLabel
 )
+from tracing import span
 
 
 class CollapsibleSection(QWidget):
-    def __init__(self, title: str, parent=None):
+    """
+    Titled section that starts collapsed.
+
+    With a `factory` the content is built by `factory()` (a widget or a
+    list of widgets) on the first expand only. `expanded` is a set of
+    titles shared by a page: sections whose title is in it start
+    expanded, and toggling a section updates it, so the page keeps its
+    layout when it rebuilds the sections for a new filter.
+    """
+
+    def __init__(self, title: str, parent=None, factory=None, expanded=None):
         super().__init__(parent)
+        self.title = title
+        self.factory = factory
+        self.expanded = expanded
 
         self.toggle_button = QPushButton(f"▶  {title}")
         self.toggle_button.setCheckable(True)
@@ -45,13 +60,34 @@ class CollapsibleSection(QWidget):
         self.content_layout.setSpacing(5)
 
         self.toggle_button.toggled.connect(self._on_toggled)
+        if expanded is not None and title in expanded:
+            self.toggle_button.setChecked(True)
+
+    @property
+    def built(self):
+        return self.factory is None
+
+    def _build(self):
+        with span(f"section: {self.title}", cat="ui"):
+            content = self.factory()
+            self.factory = None
+            for widget in content if isinstance(content, (list, tuple)) else [content]:
+                self.add_widget(widget)
 
     def _on_toggled(self, checked: bool):
         arrow = "▼" if checked else "▶"
         text = self.toggle_button.text().split("  ", 1)[-1]
         self.toggle_button.setText(f"{arrow}  {text}")
 
+        if self.expanded is not None:
+            if checked:
+                self.expanded.add(self.title)
+            else:
+                self.expanded.discard(self.title)
+
         if checked:
+            if self.factory is not None:
+                self._build()
             self.content_area.setVisible(True)
             full_h = self.content_area.sizeHint().height()
             self.content_area.setMaximumHeight(full_h)
@@ -85,3 +121,48 @@ def add_download_button(canvas, label="Download graph"):
 
     btn.clicked.connect(save_graph)
     return container
+
+
+def add_filter_notes(layout, spec, columns):
+    """Note every active filter whose column the data does not have."""
+    for col in spec.unavailable_columns(columns):
+        lbl = QLabel(f"Note: The '{col}' column is not available")
+        lbl.setAlignment(QtCore.Qt.AlignCenter)
+        layout.addWidget(lbl)
+
+
+class BusyOverlay(QWidget):
+    """Translucent "Updating..." cover over its parent while a page recomputes."""
+
+    def __init__(self, parent, text="Updating..."):
+        super().__init__(parent)
+        self.setAttribute(QtCore.Qt.WA_StyledBackground, True)
+        self.setStyleSheet("""
+            BusyOverlay { background-color: rgba(255, 255, 255, 160); }
+            QLabel {
+                background: #FFFFFF;
+                color: #333333;
+                font-size: 14px;
+                border: 1px solid #CCCCCC;
+                border-radius: 6px;
+                padding: 8px 16px;
+            }
+        """)
+        # clicks still reach the combos underneath
+        self.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents, True)
+        layout = QVBoxLayout(self)
+        label = QLabel(text)
+        label.setAlignment(QtCore.Qt.AlignCenter)
+        layout.addWidget(label, 0, QtCore.Qt.AlignCenter)
+        parent.installEventFilter(self)
+        self.hide()
+
+    def eventFilter(self, obj, event):
+        if obj is self.parent() and event.type() == QtCore.QEvent.Resize:
+            self.setGeometry(obj.rect())
+        return False
+
+    def showEvent(self, event):
+        self.setGeometry(self.parent().rect())
+        self.raise_()
+        super().showEvent(event)
@@ -0,0 +1,278 @@
+# workers.py
+import logging
+from PyQt5.QtCore import (
+    QObject, QRunnable, QThread, QThreadPool, QCoreApplication, QTimer,
+    pyqtSignal
+)
+import startup
+from tracing import span
+
+FILTER_DEBOUNCE_MS = 150
+
+log = logging.getLogger(__name__)
+
+
+class DatasetLoader(QThread):
+    """Loads a data_loader.Dataset off the GUI thread and reports its stages."""
+
+    progress = pyqtSignal(str)
+    loaded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, dataset, parent=None):
+        super().__init__(parent)
+        self.dataset = dataset
+
+    def run(self):
+        try:
+            with startup.profiled():
+                self.dataset.load(progress=self.progress.emit)
+        except Exception as exc:
+            log.exception("Loading the dataset failed")
+            self.failed.emit(f"{type(exc).__name__}: {exc}")
+            return
+        self.loaded.emit(self.dataset)
+
+
+_render_pool = None
+
+
+def render_pool():
+    """
+    Pool for page computations. One thread: the dataset caches and
+    matplotlib are not shared between concurrent tasks, and a newer
+    request never waits behind more than the task already running.
+    """
+    global _render_pool
+    if _render_pool is None:
+        _render_pool = QThreadPool()
+        _render_pool.setMaxThreadCount(1)
+        app = QCoreApplication.instance()
+        if app is not None:
+            # queued results are useless once the window is gone
+            app.aboutToQuit.connect(_render_pool.clear)
+            app.aboutToQuit.connect(_render_pool.waitForDone)
+    return _render_pool
+
+
+class _TaskSignals(QObject):
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+
+class RenderTask(QRunnable):
+    """Runs `compute()` on the pool; skipped if superseded before it starts."""
+
+    def __init__(self, generation, compute, is_current, name="compute"):
+        super().__init__()
+        self.generation = generation
+        self.compute = compute
+        self.is_current = is_current
+        self.name = name
+        self.signals = _TaskSignals()
+
+    def run(self):
+        if not self.is_current(self.generation):
+            self.signals.finished.emit(self.generation, None)
+            return
+        try:
+            with span(self.name, cat="render"):
+                result = self.compute()
+        except Exception as exc:
+            log.exception("Render task %s failed", self.name)
+            self.signals.failed.emit(self.generation, f"{type(exc).__name__}: {exc}")
+            return
+        self.signals.finished.emit(self.generation, result)
+
+
+class PageRenderer(QObject):
+    """
+    Runs a page's aggregation and figure building on the render pool and
+    hands the result back to the GUI thread.
+
+    Every request gets the next generation number; only the result of the
+    newest one is applied, older ones are dropped (or never started). The
+    page's busy overlay is shown until the newest result arrives.
+    """
+
+    def __init__(self, page, overlay=None, pool=None):
+        super().__init__(page)
+        self.page = page
+        self.overlay = overlay
+        self.pool = pool or render_pool()
+        self.generation = 0
+        self.dropped = 0
+        self._pending = {}
+
+    def is_current(self, generation):
+        return generation == self.generation
+
+    def request(self, compute, apply, fail=None):
+        """Run `compute()` off the GUI thread, then `apply(result)` on it."""
+        self.generation += 1
+        task = RenderTask(self.generation, compute, self.is_current,
+                          f"{type(self.page).__name__}.compute")
+        self._pending[self.generation] = (task.signals, apply, fail)
+        task.signals.finished.connect(self._finished)
+        task.signals.failed.connect(self._failed)
+        if self.overlay is not None:
+            self.overlay.show()
+        self.pool.start(task)
+        return self.generation
+
+    def _take(self, generation):
+        _, apply, fail = self._pending.pop(generation)
+        if not self.is_current(generation):
+            self.dropped += 1
+            return None
+        if self.overlay is not None:
+            self.overlay.hide()
+        return apply, fail
+
+    def _finished(self, generation, result):
+        callbacks = self._take(generation)
+        if callbacks:
+            with span(f"{type(self.page).__name__}.render", cat="render"):
+                callbacks[0](result)
+
+    def _failed(self, generation, message):
+        callbacks = self._take(generation)
+        if callbacks and callbacks[1]:
+            callbacks[1](message)
+
+    @property
+    def busy(self):
+        return bool(self._pending)
+
+    def wait(self):
+        """Block until every request has been applied (tests, batch scripts)."""
+        while self._pending:
+            self.pool.waitForDone()
+            QCoreApplication.processEvents()
+
+
+class FilterScheduler(QObject):
+    """
+    Coalesces a page's filter changes into one render.
+
+    `schedule()` (combo signals) restarts a short single-shot timer, so a
+    burst of changes - e.g. arrowing through the age combo - renders once
+    when it settles. `request()` (navigation, explicit refresh) renders
+    right away. Either way `render()` is only called when `key()` differs
+    from the key of the last render.
+    """
+
+    def __init__(self, key, render, delay=FILTER_DEBOUNCE_MS, parent=None):
+        super().__init__(parent)
+        self.key = key
+        self.render = render
+        self.last_key = None
+        self.requested = 0
+        self.performed = 0
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay)
+        self.timer.timeout.connect(self.flush)
+
+    def schedule(self):
+        self.requested += 1
+        self.timer.start()
+
+    def request(self):
+        self.requested += 1
+        return self.flush()
+
+    def flush(self):
+        """Render now if the filter changed since the last render."""
+        self.timer.stop()
+        key = self.key()
+        if key == self.last_key:
+            return False
+        self.last_key = key
+        self.performed += 1
+        self.render()
+        return True
+
+    def invalidate(self):
+        """Forget the last key, so the next request renders again."""
+        self.last_key = None
+
+    @property
+    def skipped(self):
+        return self.requested - self.performed
+
+
+class _ReportSignals(QObject):
+    stepped = pyqtSignal(bool)
+    failed = pyqtSignal(str)
+
+
+class _ReportStep(QRunnable):
+    def __init__(self, report, signals):
+        super().__init__()
+        self.report = report
+        self.signals = signals
+
+    def run(self):
+        try:
+            more = self.report.step()
+        except Exception as exc:
+            log.exception("Writing report page %s failed", self.report.pages + 1)
+            self.signals.failed.emit(f"{type(exc).__name__}: {exc}")
+            return
+        self.signals.stepped.emit(more)
+
+
+class ReportWriter(QObject):
+    """
+    Writes a report.Report on the render pool, one page per task. Page
+    renders requested meanwhile queue between two pages instead of behind
+    the whole report, and the dataset is still only used by one thread.
+    """
+
+    progress = pyqtSignal(int, str)
+    finished = pyqtSignal(str)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, report, parent=None, pool=None):
+        super().__init__(parent)
+        self.report = report
+        self.pool = pool or render_pool()
+        self._cancel = False
+        self.running = False
+        self._signals = _ReportSignals()
+        self._signals.stepped.connect(self._stepped)
+        self._signals.failed.connect(self._failed)
+
+    def start(self):
+        self.running = True
+        self.pool.start(_ReportStep(self.report, self._signals))
+
+    def cancel(self):
+        """Stop after the page being written; the partial file is removed."""
+        self._cancel = True
+
+    def _stepped(self, more):
+        if self._cancel:
+            self.running = False
+            self.report.abort()
+            self.cancelled.emit()
+            return
+        if more:
+            self.progress.emit(self.report.pages, self.report.current)
+            self.start()
+            return
+        self.running = False
+        self.finished.emit(self.report.path)
+
+    def _failed(self, message):
+        self.running = False
+        self.report.abort()
+        self.failed.emit(message)
+
+    def wait(self):
+        """Block until the report is done (tests, scripts)."""
+        while self.running:
+            self.pool.waitForDone()
+            QCoreApplication.processEvents()
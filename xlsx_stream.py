@@ -0,0 +1,155 @@
+# xlsx_stream.py
+import time
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.cell.cell import ERROR_CODES
+
+# pandas' default NA strings for read_excel
+NA_STRINGS = frozenset([
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+    '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a',
+    'nan', 'null',
+])
+
+# strings read_excel turns into booleans
+BOOL_STRINGS = {
+    'True': True, 'TRUE': True, 'true': True,
+    'False': False, 'FALSE': False, 'false': False,
+}
+
+
+def header_names(row):
+    """Column names as read_excel builds them: Unnamed: i, dedupe with .N."""
+    names, seen = [], {}
+    for i, value in enumerate(row):
+        name = f"Unnamed: {i}" if value is None or value == "" else str(value)
+        base = name
+        while name in seen:
+            seen[base] += 1
+            name = f"{base}.{seen[base]}"
+        seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _convert(value):
+    """One cell value as read_excel sees it; missing values become NaN."""
+    if value is None:
+        return np.nan
+    if isinstance(value, str):
+        if value in NA_STRINGS or value in ERROR_CODES:
+            return np.nan
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+class _ColumnBuffer:
+    """
+    Typed storage of one column: float64 chunks while every value is a
+    number, object chunks once a string, bool or date appears.
+    """
+
+    def __init__(self):
+        self.chunks = []
+
+    def append(self, values):
+        if all(type(v) in (int, float) for v in values):
+            self.chunks.append(np.asarray(values, dtype=np.float64))
+        else:
+            self.chunks.append(np.asarray(values, dtype=object))
+
+    def finish(self):
+        if not self.chunks:
+            return pd.Series([], dtype=np.float64)
+        if all(chunk.dtype == np.float64 for chunk in self.chunks):
+            values = np.concatenate(self.chunks)
+            if not np.isnan(values).any() and np.all(values == np.round(values)):
+                return pd.Series(values.astype(np.int64))
+            return pd.Series(values)
+
+        values = np.concatenate([
+            chunk if chunk.dtype == object
+            else np.array([_convert(float(v)) for v in chunk], dtype=object)
+            for chunk in self.chunks
+        ])
+        missing = pd.isna(values)
+        present = values[~missing]
+        if len(present) and all(
+                isinstance(v, (bool, np.bool_))
+                or (isinstance(v, str) and v in BOOL_STRINGS)
+                for v in present):
+            values[~missing] = [BOOL_STRINGS.get(v, v) if isinstance(v, str)
+                                else bool(v) for v in present]
+            return pd.Series(values if missing.any() else values.astype(bool))
+        try:
+            return pd.Series(pd.to_numeric(values))
+        except (TypeError, ValueError):
+            return pd.Series(values)
+
+
+def read_columns(path, columns, chunk_size=2000, progress=None):
+    """
+    Stream the first sheet of `path` with openpyxl's read_only mode and
+    return only `columns` (read_excel header names) as a DataFrame equal
+    to `pd.read_excel(path)[columns]`.
+
+    Rows are converted `chunk_size` at a time into per-column buffers, so
+    memory beyond the result stays bounded by one chunk. `progress(rows,
+    total_rows, rows_per_second)` is called after every chunk.
+    """
+    book = load_workbook(path, read_only=True, data_only=True, keep_links=False)
+    try:
+        sheet = book.worksheets[0]
+        # the stored dimension is only a hint (used for progress), as in pandas
+        total = max((sheet.max_row or 1) - 1, 0)
+        sheet.reset_dimensions()
+        rows = sheet.iter_rows(values_only=True)
+
+        names = header_names(next(rows, ()))
+        keep = set(columns)
+        wanted = [(i, name) for i, name in enumerate(names) if name in keep]
+        # header cells past the last written one are padded, as in read_excel
+        for name in columns:
+            index = name[len("Unnamed: "):]
+            if (name.startswith("Unnamed: ") and index.isdigit()
+                    and int(index) >= len(names)):
+                wanted.append((int(index), name))
+        buffers = {name: _ColumnBuffer() for _, name in wanted}
+
+        chunk, blank_run, done = [], [], 0
+        started = time.perf_counter()
+
+        def flush():
+            nonlocal chunk, done
+            for i, name in wanted:
+                buffers[name].append([
+                    _convert(row[i]) if i < len(row) else np.nan for row in chunk
+                ])
+            done += len(chunk)
+            chunk = []
+            if progress:
+                elapsed = time.perf_counter() - started
+                progress(done, total, done / elapsed if elapsed else 0.0)
+
+        for row in rows:
+            if all(v is None or v == "" for v in row):
+                # read_excel drops trailing empty rows but keeps inner ones
+                blank_run.append(row)
+                continue
+            chunk.extend(blank_run)
+            blank_run = []
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                flush()
+        if chunk:
+            flush()
+    finally:
+        book.close()
+
+    return pd.DataFrame({
+        name: buffers[name].finish() for name in columns if name in buffers
+    })